@@ -0,0 +1,152 @@
+"""
+Non-blocking, structured logging for UAS.
+
+QueuedRotatingFileHandler only enqueues records on the calling thread; a
+QueueListener thread formats them (JSONFormatter) and writes them to a
+RotatingFileHandler. Service modules log with lazy %-style arguments, so
+the message string is only built for records that pass the level and
+sampling filters; it is built on the calling thread, so arguments are
+rendered as they were when logged and never evaluated off-thread.
+"""
+import atexit
+import contextvars
+import copy
+import itertools
+import json
+import logging
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+request_id_var = contextvars.ContextVar('request_id', default='-')
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Stamps each record with the id of the request being served (see UAS.middleware.RequestIdMiddleware).
+    """
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a fraction of named high-volume INFO messages.
+
+    `rates` maps logger names to {message format string: fraction to keep}, e.g.
+    {"programms.services.programms_service": {"Fetched program offered: %s": 0.1}}
+    keeps every tenth of those lines. Other messages, levels and loggers pass through,
+    so audit lines such as creations and deletions are never sampled.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        rates = {
+            (name, message): rate for name, messages in (rates or {}).items() for message, rate in messages.items()
+        }
+        self.every = {key: max(1, round(1 / rate)) for key, rate in rates.items() if rate > 0}
+        self.dropped = {key for key, rate in rates.items() if rate <= 0}
+        self.counters = {key: itertools.count() for key in self.every}
+
+    def filter(self, record):
+        if record.levelno != logging.INFO:
+            return True
+        key = (record.name, record.msg)
+        if key in self.dropped:
+            return False
+        every = self.every.get(key)
+        if every is None:
+            return True
+        return next(self.counters[key]) % every == 0
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per line with timestamp, level, logger, request id and message.
+    """
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'request_id': getattr(record, 'request_id', '-'),
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _BlockingStopListener(QueueListener):
+    """
+    QueueListener whose stop sentinel waits (briefly) for room, so stopping with a full queue does not raise.
+    """
+    stop_timeout = 5
+
+    def enqueue_sentinel(self):
+        try:
+            self.queue.put(self._sentinel, timeout=self.stop_timeout)
+        except queue.Full:
+            # Only a dead writer thread leaves the queue full this long; join() then returns at once.
+            pass
+
+
+class QueuedHandler(QueueHandler):
+    """
+    QueueHandler that owns its QueueListener and writes through `target` on a background thread.
+
+    The message is rendered before queueing, so %-style arguments (model
+    instances, mutable dicts) are logged as they are at call time and never
+    queried from the listener thread; the JSON line itself is formatted there.
+    When the queue is full, records are dropped instead of blocking the request.
+    """
+
+    def __init__(self, target, queue_size=10000):
+        super().__init__(queue.Queue(queue_size))
+        self.target = target
+        self.dropped_records = 0
+        self.listener = _BlockingStopListener(self.queue, target, respect_handler_level=True)
+        self.listener.start()
+        self._stopped = False
+        atexit.register(self.stop)
+
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped_records += 1
+
+    def stop(self):
+        """
+        Flush queued records and stop the writer thread; safe to call more than once.
+        """
+        if not self._stopped:
+            self._stopped = True
+            self.listener.stop()
+
+    def close(self):
+        self.stop()
+        self.target.close()
+        super().close()
+
+
+class QueuedRotatingFileHandler(QueuedHandler):
+
+    def __init__(self, filename, maxBytes=0, backupCount=0, encoding='utf-8', queue_size=10000):
+        super().__init__(
+            RotatingFileHandler(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding),
+            queue_size=queue_size,
+        )
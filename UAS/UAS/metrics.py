@@ -0,0 +1,144 @@
+"""
+Per-request performance metrics.
+
+PerformanceMiddleware (UAS.middleware) samples requests at PERF_SAMPLE_RATE and
+records wall time, CPU time, SQL query count, SQL time and duplicated queries
+per resolved URL name. Aggregates are kept per process and rendered in the
+Prometheus text exposition format by UAS.views.MetricsView.
+"""
+import bisect
+import threading
+import time
+from collections import Counter
+
+# Upper bounds of the histogram buckets; +Inf is implicit
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+UNRESOLVED = 'unresolved'
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed bucket bounds. Not thread safe on its own; the registry locks.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield bound, total
+
+
+class QueryRecorder:
+    """
+    `connection.execute_wrapper` hook counting queries, their time and repeated SQL.
+
+    Parameters are passed separately from the SQL, so identical SQL strings are the
+    same statement executed again - the usual signature of an N+1 loop.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+
+class MetricsRegistry:
+    """
+    Per-process aggregates keyed by URL name.
+    """
+
+    histograms = (
+        ('uas_request_duration_seconds', 'Wall time spent handling the request.', SECONDS_BUCKETS),
+        ('uas_request_cpu_seconds', 'CPU time of the handling thread.', SECONDS_BUCKETS),
+        ('uas_request_queries', 'SQL queries executed per request.', QUERY_COUNT_BUCKETS),
+        ('uas_request_query_duration_seconds', 'Time spent in SQL per request.', SECONDS_BUCKETS),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {name: {} for name, _, _ in self.histograms}
+        self._requests = Counter()
+        self._duplicates = Counter()
+
+    def observe(self, view, status, wall, cpu, queries):
+        values = (wall, cpu, queries.count, queries.duration)
+        with self._lock:
+            for (name, _, buckets), value in zip(self.histograms, values):
+                per_view = self._histograms[name]
+                if view not in per_view:
+                    per_view[view] = Histogram(buckets)
+                per_view[view].observe(value)
+            self._requests[(view, status)] += 1
+            self._duplicates[view] += queries.duplicates
+
+    def reset(self):
+        with self._lock:
+            for per_view in self._histograms.values():
+                per_view.clear()
+            self._requests.clear()
+            self._duplicates.clear()
+
+    def render(self):
+        """
+        Return all metrics in the Prometheus text exposition format (version 0.0.4).
+        """
+        lines = []
+        with self._lock:
+            lines.append('# HELP uas_requests_total Sampled requests by URL name and status code.')
+            lines.append('# TYPE uas_requests_total counter')
+            for (view, status), count in sorted(self._requests.items()):
+                lines.append(f'uas_requests_total{{view="{_escape(view)}",status="{status}"}} {count}')
+
+            lines.append('# HELP uas_request_duplicate_queries_total SQL statements repeated within a request.')
+            lines.append('# TYPE uas_request_duplicate_queries_total counter')
+            for view, count in sorted(self._duplicates.items()):
+                lines.append(f'uas_request_duplicate_queries_total{{view="{_escape(view)}"}} {count}')
+
+            for name, help_text, _ in self.histograms:
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for view, histogram in sorted(self._histograms[name].items()):
+                    label = f'view="{_escape(view)}"'
+                    for bound, total in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{label},le="{_format_bound(bound)}"}} {total}')
+                    lines.append(f'{name}_sum{{{label}}} {histogram.sum!r}')
+                    lines.append(f'{name}_count{{{label}}} {histogram.count}')
+        lines.append('')
+        return '\n'.join(lines)
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+registry = MetricsRegistry()
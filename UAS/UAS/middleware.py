@@ -0,0 +1,97 @@
+import logging
+import random
+import re
+import time
+import uuid
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from .log import request_id_var
+from .metrics import QueryRecorder, UNRESOLVED, registry
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+_valid_request_id = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+class RequestIdMiddleware:
+    """
+    Tags the request with an id (the incoming X-Request-ID when valid, a new one otherwise),
+    exposes it to log records and echoes it in the response.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        incoming = request.META.get('HTTP_X_REQUEST_ID', '')
+        request.request_id = incoming if _valid_request_id.match(incoming) else uuid.uuid4().hex
+        token = request_id_var.set(request.request_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response[REQUEST_ID_HEADER] = request.request_id
+        return response
+
+
+class PerformanceMiddleware:
+    """
+    Records wall time, CPU time and SQL accounting of a sample of requests into UAS.metrics.
+
+    With PERF_SAMPLE_RATE = 0 the middleware removes itself at startup, so unsampled
+    deployments pay nothing.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PERF_SAMPLE_RATE', 0.0)
+        self.duplicate_warning = getattr(settings, 'PERF_DUPLICATE_QUERY_WARNING', 10)
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        with self._recording(recorder):
+            response = self.get_response(request)
+
+        def finish():
+            self._observe(request, response, recorder, time.perf_counter() - wall_start,
+                          time.thread_time() - cpu_start)
+
+        if response.streaming:
+            # Streamed bodies (exports) run their queries while the server iterates them
+            response.streaming_content = self._stream(response.streaming_content, recorder, finish)
+        else:
+            finish()
+        return response
+
+    @staticmethod
+    def _recording(recorder):
+        stack = ExitStack()
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(recorder))
+        return stack
+
+    def _stream(self, content, recorder, finish):
+        try:
+            with self._recording(recorder):
+                yield from content
+        finally:
+            finish()
+
+    def _observe(self, request, response, recorder, wall, cpu):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match and match.view_name else UNRESOLVED
+        registry.observe(view, response.status_code, wall, cpu, recorder)
+        if recorder.duplicates >= self.duplicate_warning:
+            statement, count = recorder.statements.most_common(1)[0]
+            logger.warning("%s repeated SQL statements %d times in %d queries; most repeated (x%d): %s",
+                           view, recorder.duplicates, recorder.count, count, statement[:200])
@@ -0,0 +1,129 @@
+"""
+Schema-driven JSON serialization of model instances for API responses.
+
+A ModelSerializer subclass declares which fields of its model may leave the
+server. Extractors are compiled once per field selection (one
+operator.attrgetter over the column attnames), so serializing a row is a
+single C-level call plus dict(zip(...)) instead of copying __dict__.
+
+Encoding uses orjson when it is installed and falls back to the stdlib
+encoder with DjangoJSONEncoder otherwise. orjson hands dates, times and
+datetimes back to DjangoJSONEncoder.default (OPT_PASSTHROUGH_DATETIME), so
+both backends render them identically: ISO 8601 truncated to milliseconds,
+with 'Z' for UTC. Decimals become strings and UUIDs their canonical form.
+"""
+import json
+import operator
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+JSON_BACKEND = 'orjson' if orjson else 'json'
+
+_django_default = DjangoJSONEncoder().default
+
+
+def dumps(data):
+    """
+    Encode `data` to JSON bytes with the fastest available backend.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_django_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+def fields_from_request(request):
+    """
+    Parse ?fields=a,b,c into a list of names, or None when absent.
+    """
+    fields = request.GET.get('fields')
+    return [field.strip() for field in fields.split(',') if field.strip()] if fields else None
+
+
+class FastJsonResponse(HttpResponse):
+    """
+    JsonResponse counterpart encoded through `dumps`.
+    """
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
+
+
+class ModelSerializer:
+    """
+    Base class: set `model` and the public `fields` (field names, foreign keys serialize as their id).
+
+    Use the class directly, e.g. ProgramsOfferedSerializer.to_dict(program, fields=['ProgramName']).
+    """
+
+    model = None
+    fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.model is None:
+            return
+        attnames = {field.name: field.attname for field in cls.model._meta.concrete_fields}
+        unknown = [name for name in cls.fields if name not in attnames]
+        if unknown:
+            raise ImproperlyConfigured(f"{cls.__name__}: {cls.model.__name__} has no fields {unknown}")
+        cls.fields = tuple(cls.fields)
+        cls._attnames = {name: attnames[name] for name in cls.fields}
+        cls._extractors = {}
+
+    @classmethod
+    def select(cls, fields=None):
+        """
+        Validate a requested field subset and return it as a tuple (all public fields when empty).
+
+        The subset is deduplicated and put in `fields` order, so every selection maps to one
+        canonical tuple and the extractor cache holds at most one entry per subset.
+        """
+        if not fields:
+            return cls.fields
+        unknown = [field for field in fields if field not in cls._attnames]
+        if unknown:
+            raise ValidationError(f"Unknown fields: {', '.join(unknown)}")
+        requested = set(fields)
+        return tuple(field for field in cls.fields if field in requested)
+
+    @classmethod
+    def extractor(cls, fields=None):
+        """
+        Return the compiled instance -> dict function for a field selection.
+        """
+        fields = cls.select(fields)
+        extract = cls._extractors.get(fields)
+        if extract is None:
+            getter = operator.attrgetter(*(cls._attnames[field] for field in fields))
+            if len(fields) == 1:
+                name = fields[0]
+                extract = lambda instance: {name: getter(instance)}  # noqa: E731
+            else:
+                extract = lambda instance: dict(zip(fields, getter(instance)))  # noqa: E731
+            cls._extractors[fields] = extract
+        return extract
+
+    @classmethod
+    def to_dict(cls, instance, fields=None):
+        return cls.extractor(fields)(instance)
+
+    @classmethod
+    def to_list(cls, instances, fields=None):
+        extract = cls.extractor(fields)
+        return [extract(instance) for instance in instances]
+
+    @classmethod
+    def values(cls, queryset, fields=None):
+        """
+        Serialize a queryset straight from values_list(), skipping model instantiation.
+        """
+        fields = cls.select(fields)
+        rows = queryset.values_list(*(cls._attnames[field] for field in fields))
+        return [dict(zip(fields, row)) for row in rows]
@@ -12,7 +12,6 @@ https://docs.djangoproject.com/en/4.1/ref/settings/
 
 from pathlib import Path
 import os
-from logging.handlers import RotatingFileHandler
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -47,11 +46,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "UAS.middleware.RequestIdMiddleware",
+    "UAS.middleware.PerformanceMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "users.middleware.TokenAuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -62,7 +64,6 @@ TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [TEMPLATES_DIR],
-        "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.debug",
@@ -70,10 +71,28 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
             ],
+            # Templates are parsed once per process and reused; listing loaders replaces APP_DIRS.
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
         },
     },
 ]
 
+# Compiled into the cached loader when the programms app starts, so no request pays the parse cost
+PRECOMPILED_TEMPLATES = [
+    "base.html",
+    "programs_offered.html",
+    "scheduled_programs.html",
+    "program_detail.html",
+]
+
 WSGI_APPLICATION = "UAS.wsgi.application"
 
 
@@ -92,6 +111,11 @@ DATABASES = {
     }
 }
 
+# Full-text and trigram search (programms.services.search) need django.contrib.postgres;
+# other databases use the in-process index and must not load it.
+if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    INSTALLED_APPS.append("django.contrib.postgres")
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -112,6 +136,67 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# request.user is served from a per-process LRU + shared cache (users.backends).
+# CachedModelBackend also authenticates; listing ModelBackend too would check failed logins twice.
+AUTHENTICATION_BACKENDS = [
+    "users.backends.CachedModelBackend",
+]
+# USERS_CACHE_ALIAS also holds the version stamps that invalidate cached users, so it must be
+# shared between workers; check users.E001 refuses local memory when WEB_CONCURRENCY > 1.
+USERS_CACHE_ALIAS = "default"
+USERS_CACHE_TIMEOUT = 300  # seconds, in both the shared cache and the per-process LRU
+USERS_LRU_SIZE = 1024
+# Worker processes serving the project (gunicorn reads the same variable)
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", "1"))
+
+
+# Login throttling (users.ratelimit). Limits apply per submitted login ID and per client IP, in a
+# separate scope for each credential-checking view; a successful attempt clears its login ID's count.
+# Use "users.ratelimit.CacheRateLimitBackend" to share counters between workers.
+RATELIMIT_BACKEND = "users.ratelimit.LocalRateLimitBackend"
+RATELIMIT_CACHE_ALIAS = "default"
+RATELIMIT_RULES = {
+    "login": {"login_id": "5/m", "ip": "50/m"},
+    "api_token": {"login_id": "5/m", "ip": "50/m"},
+    "forgot_login_id": {"login_id": "5/h", "ip": "20/h"},
+}
+# Behind a reverse proxy, the META key of the header it appends the client address to (e.g.
+# "HTTP_X_FORWARDED_FOR") and how many trusted proxies append to it; None uses REMOTE_ADDR.
+RATELIMIT_IP_HEADER = None
+RATELIMIT_TRUSTED_PROXIES = 1
+
+
+# Per-request performance metrics (UAS.metrics), exposed at /metrics/ in Prometheus text format.
+# Fraction of requests timed and SQL-accounted; 0 removes the middleware from the stack entirely.
+# Keep it small in production (every sampled request wraps its queries) and raise it while profiling.
+PERF_SAMPLE_RATE = 0.01
+PERF_DUPLICATE_QUERY_WARNING = 10  # log a warning when a request repeats this many statements
+METRICS_ALLOWED_IPS = ["127.0.0.1", "::1"]  # staff users may read the endpoint from anywhere
+
+
+# Password hashing policy (users.hashers)
+# The preferred algorithm hashes new passwords; the others stay listed so existing hashes
+# verify and are upgraded on the next login. Tune the parameters with
+# `manage.py calibrate_password_hasher --target-ms <budget>`. Argon2 needs argon2-cffi.
+PASSWORD_HASHER_ALGORITHM = "pbkdf2"  # "pbkdf2", "argon2" or "scrypt"
+PASSWORD_HASHER_PARAMS = {
+    "pbkdf2": {"iterations": 600000},
+    "argon2": {"time_cost": 2, "memory_cost": 102400, "parallelism": 8},
+    "scrypt": {"work_factor": 2 ** 14, "block_size": 8, "parallelism": 1},
+}
+_POLICY_HASHERS = {
+    "pbkdf2": "users.hashers.PolicyPBKDF2PasswordHasher",
+    "argon2": "users.hashers.PolicyArgon2PasswordHasher",
+    "scrypt": "users.hashers.PolicyScryptPasswordHasher",
+}
+PASSWORD_HASHERS = [_POLICY_HASHERS[PASSWORD_HASHER_ALGORITHM]] + [
+    hasher for algorithm, hasher in _POLICY_HASHERS.items() if algorithm != PASSWORD_HASHER_ALGORITHM
+] + [
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.1/topics/i18n/
 
@@ -138,6 +223,63 @@ LOGOUT_REDIRECT_URL = "thanks"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Keyset pagination for the programs JSON listing (?after=, ?before=, ?limit=, ?fields=)
+PROGRAMS_PAGE_SIZE = 50
+PROGRAMS_MAX_PAGE_SIZE = 200
+
+# Program search (programms.services.search): "postgresql" uses full-text + trigram indexes,
+# "python" an in-process inverted index (SQLite/tests); "auto" picks by database vendor.
+PROGRAMS_SEARCH_BACKEND = "auto"
+PROGRAMS_SEARCH_MIN_SIMILARITY = 0.3  # trigram similarity needed for a fuzzy match
+
+# Timetable conflicts (programms.services.conflicts): sessions at the same Location may not overlap.
+# "postgresql" queries the daterange GiST index, "python" in-process interval trees; "auto" picks by vendor.
+PROGRAMS_CONFLICT_BACKEND = "auto"
+PROGRAMS_REJECT_SCHEDULE_CONFLICTS = True
+
+# Session occurrence feeds (programms/scheduled/occurrences/), expanded per month and cached per schedule version
+PROGRAMS_OCCURRENCES_DEFAULT_DAYS = 90  # window when no ?end= is given
+PROGRAMS_OCCURRENCES_MAX_DAYS = 3660
+PROGRAMS_ICAL_UID_DOMAIN = "uas.local"  # right-hand side of the iCalendar event UIDs
+
+# Bulk program endpoints (programms/programs/bulk/, programms/scheduled/bulk/)
+PROGRAMS_BULK_MAX_ITEMS = 20000
+PROGRAMS_BULK_BATCH_SIZE = 1000
+
+# Caches
+# Local memory by default; point "default" at Redis/Memcached to share the program
+# catalogue cache (programms.services.cache) between workers.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "uas-default",
+    },
+    # Used by {% cache %} in the catalogue templates; one entry per program row, keyed by id + updated_at.
+    "template_fragments": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "uas-template-fragments",
+        "OPTIONS": {"MAX_ENTRIES": 20000},
+    },
+}
+PROGRAMS_CACHE_ALIAS = "default"
+PROGRAMS_CACHE_TIMEOUT = 300  # seconds
+
+# Rows per bulk_create batch in the admissions pipeline (participant.services)
+ADMISSIONS_BATCH_SIZE = 1000
+# Seats per scheduled program used by `manage.py rank_applications` when none are given
+ADMISSIONS_DEFAULT_SEATS = 30
+# Interview days shown by participant/dashboard/ (default and upper bound of ?days=)
+ADMISSIONS_DASHBOARD_DAYS = 30
+ADMISSIONS_DASHBOARD_MAX_DAYS = 366
+# Interview scheduling (`manage.py schedule_interviews`): panel seats per interview day,
+# the weekdays panels sit on (Monday = 0) and how many days ahead are planned
+ADMISSIONS_INTERVIEW_DAILY_CAPACITY = 40
+ADMISSIONS_INTERVIEW_WEEKDAYS = (0, 1, 2, 3, 4)
+ADMISSIONS_INTERVIEW_HORIZON_DAYS = 28
+
+# Rows fetched per server-side cursor round trip by the streaming NDJSON/CSV exports
+EXPORT_CHUNK_SIZE = 2000
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -150,15 +292,43 @@ LOGGING = {
             'format': '{levelname} {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'UAS.log.JSONFormatter',
+        },
+    },
+    'filters': {
+        'request_id': {
+            '()': 'UAS.log.RequestIdFilter',
+        },
+        # Fraction kept of named high-volume INFO messages (read paths); audit lines are never sampled
+        'sampling': {
+            '()': 'UAS.log.SamplingFilter',
+            'rates': {
+                'users.services.user_service': {
+                    'User details fetched successfully for user_id: %s': 0.1,
+                },
+                'programms.services.programms_service': {
+                    'Fetched program offered: %s': 0.1,
+                    'Listed all programs offered': 0.1,
+                    'Listed page of %s programs offered (after=%s, before=%s)': 0.1,
+                    'Listed all scheduled programs for program: %s': 0.1,
+                    'Search for %r over %s programs returned %s result(s) on page %s': 0.1,
+                    'Expanding %s %s occurrences from %s to %s': 0.1,
+                },
+            },
+        },
     },
     'handlers': {
+        # Records are only queued on the request thread; a background thread formats and writes them.
         'file': {
             'level': 'DEBUG',
-            'class': 'logging.handlers.RotatingFileHandler',
+            '()': 'UAS.log.QueuedRotatingFileHandler',
             'filename': os.path.join(BASE_DIR, 'uas_debug.log'),
             'maxBytes': 80485760,  # 8 MB
             'backupCount': 5,  # Keep 3 backup files
-            'formatter': 'verbose',
+            'queue_size': 10000,
+            'formatter': 'json',
+            'filters': ['request_id', 'sampling'],
         },
         'console': {
             'level': 'ERROR',
@@ -172,6 +342,22 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': True,
         },
+        'UAS': {
+            'handlers': ['file', 'console'],
+            'level': 'INFO',
+        },
+        'users': {
+            'handlers': ['file', 'console'],
+            'level': 'INFO',
+        },
+        'programms': {
+            'handlers': ['file', 'console'],
+            'level': 'INFO',
+        },
+        'participant': {
+            'handlers': ['file', 'console'],
+            'level': 'INFO',
+        },
     },
 }
 
@@ -184,6 +370,18 @@ EMAIL_HOST_USER = ''
 EMAIL_HOST_PASSWORD = ''
 DEFAULT_FROM_EMAIL = ''
 
+# Outbound mail queue (see users.services.mail_service and `manage.py send_queued_mail`)
+# Services only enqueue; the worker delivers using MAIL_OUTBOX_BACKEND (EMAIL_BACKEND when None).
+# For local runs use 'django.core.mail.backends.console.EmailBackend' or
+# 'django.core.mail.backends.filebased.EmailBackend' together with EMAIL_FILE_PATH.
+MAIL_OUTBOX_BACKEND = None
+MAIL_OUTBOX_BATCH_SIZE = 50
+MAIL_OUTBOX_MAX_ATTEMPTS = 5
+MAIL_OUTBOX_RETRY_BACKOFF = 60  # seconds, doubled after every failed attempt
+# Seconds a worker holds the messages it claimed before another worker may pick them up
+MAIL_OUTBOX_CLAIM_TIMEOUT = 300
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
 
 # # # Email Configuration
 # EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -194,5 +392,8 @@ DEFAULT_FROM_EMAIL = ''
 # EMAIL_HOST_PASSWORD = ''
 # DEFAULT_FROM_EMAIL = ''
 
+# Lifetime in seconds of the signed API tokens issued by users/token/ (users.tokens)
+API_TOKEN_MAX_AGE = 3600
+
 # Define custom user model
 AUTH_USER_MODEL = 'users.Users'  # Replace 'your_app' with your app name
@@ -0,0 +1,171 @@
+import json
+import logging
+import threading
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from unittest import mock, skipUnless
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed, ValidationError
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from programms.models import Programs_Offered
+from programms.serializers import ProgramsOfferedSerializer
+from .log import JSONFormatter, QueuedHandler, RequestIdFilter, SamplingFilter, request_id_var
+from .metrics import registry
+from .middleware import PerformanceMiddleware
+from .serializers import FastJsonResponse, ModelSerializer, dumps, orjson
+
+
+def record(msg, *args, name='programms.services.programms_service', level=logging.INFO):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class BlockingHandler(ListHandler):
+    """
+    Holds the listener thread inside emit() until `proceed` is set.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.proceed = threading.Event()
+
+    def emit(self, record):
+        self.started.set()
+        self.proceed.wait(5)
+        super().emit(record)
+
+
+class LoggingTests(SimpleTestCase):
+
+    def test_sampling_filter(self):
+        sampler = SamplingFilter({'programms.services.programms_service': {
+            'Fetched program offered: %s': 0.25, 'Listed programs': 0,
+        }})
+        kept = [sampler.filter(record('Fetched program offered: %s', n)) for n in range(8)]
+        self.assertEqual(kept, [True, False, False, False, True, False, False, False])
+        self.assertFalse(sampler.filter(record('Listed programs')))
+        self.assertTrue(sampler.filter(record('Listed programs', level=logging.WARNING)))
+        self.assertTrue(sampler.filter(record('Listed programs', name='participant')))
+        self.assertTrue(sampler.filter(record('Program deleted: %s', 1)))
+
+    def test_request_id_and_json_format(self):
+        token = request_id_var.set('abc123')
+        try:
+            line = record('Fetched program offered: %s', 7)
+            RequestIdFilter().filter(line)
+        finally:
+            request_id_var.reset(token)
+        entry = json.loads(JSONFormatter().format(line))
+        self.assertEqual((entry['level'], entry['request_id'], entry['message']),
+                         ('INFO', 'abc123', 'Fetched program offered: 7'))
+        self.assertEqual(RequestIdFilter().filter(line) and line.request_id, '-')
+
+    def test_queued_handler_renders_on_the_calling_thread(self):
+        target = ListHandler()
+        handler = QueuedHandler(target, queue_size=10)
+        try:
+            data = {'name': 'before'}
+            handler.handle(record('Saved %s', data))
+            data['name'] = 'after'
+        finally:
+            handler.stop()
+        self.assertEqual([(line.msg, line.args) for line in target.records], [("Saved {'name': 'before'}", None)])
+
+    def test_queued_handler_drops_when_full(self):
+        target = BlockingHandler()
+        handler = QueuedHandler(target, queue_size=1)
+        handler.handle(record('first'))
+        self.assertTrue(target.started.wait(5))
+        handler.handle(record('second'))
+        handler.handle(record('dropped'))
+        self.assertEqual(handler.dropped_records, 1)
+        threading.Timer(0.05, target.proceed.set).start()
+        handler.stop()
+        self.assertEqual([line.msg for line in target.records], ['first', 'second'])
+
+    def test_request_id_header(self):
+        response = self.client.get('/metrics/', HTTP_X_REQUEST_ID='req-42')
+        self.assertEqual(response['X-Request-ID'], 'req-42')
+        self.assertNotEqual(self.client.get('/metrics/', HTTP_X_REQUEST_ID='bad id!')['X-Request-ID'], 'bad id!')
+
+
+class MetricsTests(TestCase):
+
+    def setUp(self):
+        registry.reset()
+
+    def test_disabled_at_zero(self):
+        with override_settings(PERF_SAMPLE_RATE=0):
+            with self.assertRaises(MiddlewareNotUsed):
+                PerformanceMiddleware(lambda request: None)
+
+    @override_settings(PERF_SAMPLE_RATE=1)
+    def test_sampled_requests_are_exposed(self):
+        client = Client()
+        for _ in range(2):
+            client.get('/programms/scheduled/')
+        body = client.get('/metrics/').content.decode()
+        self.assertIn('uas_requests_total{view="programms:list_scheduled_programs",status="200"} 2', body)
+        self.assertIn('uas_request_queries_count{view="programms:list_scheduled_programs"} 2', body)
+        self.assertEqual(Client(REMOTE_ADDR='192.0.2.1').get('/metrics/').status_code, 404)
+
+    @override_settings(PERF_SAMPLE_RATE=0.01)
+    def test_unsampled_requests_are_not_recorded(self):
+        with mock.patch('UAS.middleware.random.random', return_value=0.5):
+            Client().get('/programms/scheduled/')
+        self.assertNotIn('list_scheduled_programs', registry.render())
+
+
+class SerializerTests(TestCase):
+    values = {
+        'at': datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+        'local': datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+        'naive': datetime(2025, 1, 2, 3, 4, 5, 678901),
+        'day': date(2025, 1, 2),
+        'time': time(3, 4, 5, 678901),
+        'price': Decimal('12.50'),
+        'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    }
+    expected = {
+        'at': '2025-01-02T03:04:05.678Z', 'local': '2025-01-02T03:04:05.678+05:30',
+        'naive': '2025-01-02T03:04:05.678', 'day': '2025-01-02', 'time': '03:04:05.678',
+        'price': '12.50', 'id': '12345678-1234-5678-1234-567812345678',
+    }
+
+    def test_stdlib_encoding(self):
+        with mock.patch('UAS.serializers.orjson', None):
+            self.assertEqual(json.loads(dumps(self.values)), self.expected)
+
+    @skipUnless(orjson, "orjson is not installed")
+    def test_orjson_matches_stdlib(self):
+        self.assertEqual(json.loads(dumps(self.values)), self.expected)
+
+    def test_field_selection(self):
+        self.assertEqual(ProgramsOfferedSerializer.select(['Duration', 'ProgramName', 'Duration']),
+                         ('ProgramName', 'Duration'))
+        with self.assertRaises(ValidationError):
+            ProgramsOfferedSerializer.select(['password'])
+        with self.assertRaises(ImproperlyConfigured):
+            type('Broken', (ModelSerializer,), {'model': Programs_Offered, 'fields': ('secret',)})
+
+    def test_instances_and_values_agree(self):
+        Programs_Offered.objects.create(ProgramName='Data Science', Description='Track', Duration=12,
+                                        Applicant_eligibility='Graduate', Degree_certificate_offered='Diploma')
+        queryset = Programs_Offered.objects.all()
+        fields = ['ProgramName', 'Duration']
+        self.assertEqual(ProgramsOfferedSerializer.to_list(queryset, fields),
+                         ProgramsOfferedSerializer.values(queryset, fields))
+        self.assertEqual(ProgramsOfferedSerializer.to_dict(queryset[0], ['Duration']), {'Duration': 12})
+        response = FastJsonResponse(ProgramsOfferedSerializer.to_list(queryset))
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertTrue(json.loads(response.content)[0]['updated_at'].endswith('Z'))
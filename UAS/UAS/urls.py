@@ -20,7 +20,9 @@ from . import views
 urlpatterns = [
     path("admin/", admin.site.urls),
     path('', views.HomePage.as_view(), name='home'),
+    path('metrics/', views.MetricsView.as_view(), name='metrics'),
     path('users/', include('users.urls', namespace='users')),
     path('users/', include('django.contrib.auth.urls')),
     path('programms/', include('programms.urls', namespace='programms')),
+    path('participant/', include('participant.urls', namespace='participant')),
 ]
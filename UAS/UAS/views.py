@@ -1,4 +1,8 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views import View
 from django.views.generic import TemplateView
+from .metrics import registry
 
 
 class HomePage(TemplateView):
@@ -9,3 +13,19 @@ class TestPage(TemplateView):
 
 class ThanksPage(TemplateView):
     template_name = 'thanks.html'
+
+
+class MetricsView(View):
+    """
+    Prometheus scrape endpoint for the per-request metrics of this process.
+
+    Only served to METRICS_ALLOWED_IPS and staff users; everyone else gets a 404.
+    """
+
+    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def get(self, request, *args, **kwargs):
+        allowed_ips = getattr(settings, 'METRICS_ALLOWED_IPS', [])
+        if request.META.get('REMOTE_ADDR') not in allowed_ips and not request.user.is_staff:
+            raise Http404
+        return HttpResponse(registry.render(), content_type=self.content_type)
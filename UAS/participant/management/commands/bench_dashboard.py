@@ -0,0 +1,84 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Avg, Count
+from participant.models import Application
+from participant.services.dashboard_service import DashboardServiceImpl
+from programms.models import Programs_Scheduled
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed applications inside a transaction that is rolled back afterwards and compare the admissions "
+        "dashboard (summary tables) with the ad-hoc aggregate scans of Application it replaces, "
+        "at growing application volumes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--steps', type=int, nargs='+', default=[10_000, 50_000, 200_000],
+                            help="Application volumes to measure at.")
+        parser.add_argument('--programs', type=int, default=50, help="Scheduled programs the applications go to.")
+        parser.add_argument('--repeat', type=int, default=20, help="Dashboard builds per volume.")
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        rng = random.Random(5)
+        service = DashboardServiceImpl()
+        with transaction.atomic():
+            programs = Programs_Scheduled.objects.bulk_create([
+                Programs_Scheduled(ProgramName=f'Dashboard benchmark {i}', Location=f'Dashboard room {i}',
+                                   Start_Date=date(2027, 1, 4), End_Date=date(2027, 6, 25), sessions_per_week=2)
+                for i in range(options['programs'])
+            ])
+            seeded = 0
+            for volume in sorted(options['steps']):
+                started = time.perf_counter()
+                self.seed(rng, programs, volume - seeded, options['batch_size'])
+                self.stdout.write(f"Seeded {volume - seeded} applications (stats kept incrementally) "
+                                  f"in {time.perf_counter() - started:.1f}s")
+                seeded = volume
+                self.report(f"{volume} applications, ad-hoc scans", [
+                    self.timed(self.ad_hoc) for _ in range(max(1, options['repeat'] // 4))
+                ])
+                self.report(f"{volume} applications, dashboard", [
+                    self.timed(service.admissions_summary) for _ in range(options['repeat'])
+                ])
+            transaction.set_rollback(True)
+
+    def seed(self, rng, programs, count, batch_size):
+        statuses = [Application.STATUS_PENDING, Application.STATUS_INTERVIEW,
+                    Application.STATUS_ACCEPTED, Application.STATUS_REJECTED]
+        today = date.today()
+        for offset in range(0, count, batch_size):
+            Application.objects.bulk_create([
+                Application(
+                    Full_Name=f'Applicant {offset + i}', Date_of_birth=date(2000, 1, 1), Highest_qualification='BSc',
+                    Marks_obtained=rng.randint(0, 100), Goals='Benchmark', Email_id=f'dash{offset + i}@example.com',
+                    Scheduled_program=rng.choice(programs), Status=rng.choice(statuses),
+                    Date_Of_Interview=today + timedelta(days=rng.randrange(60)),
+                )
+                for i in range(min(batch_size, count - offset))
+            ], batch_size=batch_size)
+
+    @staticmethod
+    def ad_hoc():
+        # What the dashboard replaces: grouped scans of Application plus the marks for medians
+        list(Application.objects.values('Scheduled_program_id', 'Status').annotate(n=Count('pk'), mean=Avg('Marks_obtained')))
+        list(Application.objects.filter(Status=Application.STATUS_INTERVIEW)
+             .values('Date_Of_Interview').annotate(n=Count('pk')))
+        marks = sorted(Application.objects.values_list('Marks_obtained', flat=True))
+        return marks[len(marks) // 2] if marks else None
+
+    def report(self, label, timings):
+        self.stdout.write(self.style.SUCCESS(
+            f"{label}: p50 {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms over {len(timings)} runs"
+        ))
+
+    @staticmethod
+    def timed(run):
+        started = time.perf_counter()
+        run()
+        return (time.perf_counter() - started) * 1000
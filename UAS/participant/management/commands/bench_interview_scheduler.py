@@ -0,0 +1,66 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from participant.models import Application
+from participant.services import interview_scheduler
+from participant.services.application_service import ApplicationServiceImpl
+from programms.models import Programs_Scheduled
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the interview day solver (participant.services.interview_scheduler) on synthetic applicants, "
+        "then plan and write the stored INTERVIEW applications inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--steps', type=int, nargs='+', default=[10_000, 100_000, 500_000],
+                            help="Synthetic applicant counts for the solver.")
+        parser.add_argument('--days', type=int, default=60, help="Planning horizon in days.")
+        parser.add_argument('--programs', type=int, default=200, help="Programs (priority classes) in the synthetic runs.")
+        parser.add_argument('--repeat', type=int, default=3, help="Solver runs per step.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(3)
+        days = options['days']
+        for count in options['steps']:
+            # Capacity for ~90% of the applicants, so the solver has to decide who does not fit
+            seats_per_day = -(-count * 9 // 10 // (days * 5 // 7))
+            capacity = interview_scheduler.day_capacity(date(2027, 1, 4), days, seats_per_day)
+            priority = {program: rng.randint(0, 2) for program in range(options['programs'])}
+            applicants = []
+            for application_id in range(count):
+                first = rng.randrange(days)
+                program = rng.randrange(options['programs'])
+                applicants.append((application_id, priority[program], first,
+                                   first + rng.randint(0, days // 2), rng.randint(0, 100)))
+            timings, scheduled = [], 0
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                scheduled = len(interview_scheduler.solve(applicants, capacity))
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(self.style.SUCCESS(
+                f"solve, {count} applicants over {days} days ({sum(capacity)} seats): "
+                f"p50 {statistics.median(timings):.1f} ms, {scheduled} scheduled"
+            ))
+
+        service = ApplicationServiceImpl()
+        stored = Application.objects.filter(Status=Application.STATUS_INTERVIEW).count()
+        capacity = -(-stored // (days * 5 // 7)) or 1
+        with transaction.atomic():
+            # Start every session after the horizon so each stored applicant can be placed
+            opens = date.today() + timedelta(days=days + 1)
+            Programs_Scheduled.objects.update(Start_Date=opens, End_Date=opens + timedelta(days=180))
+            for dry_run in (True, False):
+                started = time.perf_counter()
+                result = service.schedule_interviews(start=date.today() + timedelta(days=1), days=days,
+                                                     capacity=capacity, dry_run=dry_run)
+                self.stdout.write(self.style.SUCCESS(
+                    f"schedule_interviews{' (dry run)' if dry_run else ''}, {result['applicants']} stored applicants: "
+                    f"{time.perf_counter() - started:.2f}s, {result['scheduled']} scheduled, "
+                    f"{result['updated']} written"
+                ))
+            transaction.set_rollback(True)
@@ -0,0 +1,71 @@
+import json
+import random
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from participant.models import Application
+from participant.services.ranking_service import RankingServiceImpl
+from programms.models import Programs_Scheduled
+
+STATUSES = ['PENDING', 'INTERVIEW', 'ACCEPTED', 'REJECTED']
+
+
+class Command(BaseCommand):
+    help = "Rank applications per scheduled program and print cutoffs and mark statistics."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seats', type=int, default=None,
+                            help="Seats per scheduled program (defaults to ADMISSIONS_DEFAULT_SEATS).")
+        parser.add_argument('--program', type=int, default=None, help="Only rank this scheduled program id.")
+        parser.add_argument('--summary', action='store_true',
+                            help="Print only totals and timing instead of per-program statistics.")
+        parser.add_argument('--rows', type=int, default=None,
+                            help="Benchmark: seed this many synthetic applications first, inside a transaction "
+                                 "that is rolled back after ranking.")
+        parser.add_argument('--programs', type=int, default=1000,
+                            help="Scheduled programs the --rows applications are spread over.")
+        parser.add_argument('--batch-size', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        if options['rows'] is None:
+            self.rank(options)
+            return
+        with transaction.atomic():
+            started = time.perf_counter()
+            self.seed(options['rows'], options['programs'], options['batch_size'])
+            self.stdout.write(f"Seeded {options['rows']} applications in {time.perf_counter() - started:.1f}s")
+            self.rank(options)
+            transaction.set_rollback(True)
+
+    def rank(self, options):
+        started = time.perf_counter()
+        statistics = RankingServiceImpl().rank_applications(seats=options['seats'],
+                                                            scheduled_program_id=options['program'])
+        elapsed = time.perf_counter() - started
+
+        if not options['summary']:
+            self.stdout.write(json.dumps(statistics, indent=2))
+        applicants = sum(program['applicants'] for program in statistics.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"Ranked {applicants} application(s) in {len(statistics)} program(s) in {elapsed:.2f}s "
+            f"({applicants / elapsed if elapsed else 0:,.0f} applications/s)."
+        ))
+
+    def seed(self, rows, programs, batch_size):
+        rng = random.Random(9)
+        start = date(2027, 1, 4)
+        program_ids = [program.pk for program in Programs_Scheduled.objects.bulk_create([
+            Programs_Scheduled(ProgramName=f'Ranking benchmark {i}', Location=f'Ranking room {i}',
+                               Start_Date=start, End_Date=start + timedelta(days=90), sessions_per_week=2)
+            for i in range(max(programs, 1))
+        ])]
+        for offset in range(0, rows, batch_size):
+            Application.objects.bulk_create([
+                Application(
+                    Full_Name=f'Ranked applicant {i}', Date_of_birth=date(1990, 1, 1) + timedelta(days=i % 7000),
+                    Highest_qualification='Bachelor', Marks_obtained=rng.randint(0, 100), Goals='Learn',
+                    Email_id=f'ranked{i}@example.com', Scheduled_program_id=program_ids[i % len(program_ids)],
+                    Status=rng.choice(STATUSES), Date_Of_Interview=start - timedelta(days=i % 60),
+                ) for i in range(offset, min(offset + batch_size, rows))
+            ], batch_size=batch_size)
@@ -0,0 +1,27 @@
+import time
+from django.core.management.base import BaseCommand
+from participant.services import admissions_stats
+from participant.services.dashboard_service import DashboardServiceImpl
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the admissions statistics tables (ApplicationStats, ApplicationMarks, InterviewDayLoad) "
+        "from Application, "
+        "e.g. after writes that bypassed the ORM."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help="Only report how many applications the tables are off by.")
+
+    def handle(self, *args, **options):
+        drift = admissions_stats.drift()
+        self.stdout.write(f"Applications not accounted for by the statistics: {drift}")
+        if options['check']:
+            return
+        started = time.perf_counter()
+        rows = DashboardServiceImpl().rebuild_statistics()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {rows} statistics row(s) in {time.perf_counter() - started:.2f}s."
+        ))
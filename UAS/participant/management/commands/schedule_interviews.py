@@ -0,0 +1,77 @@
+import csv
+import json
+import time
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from participant.services.application_service import ApplicationServiceImpl
+
+
+class Command(BaseCommand):
+    help = (
+        "Assign interview days to every application in INTERVIEW status within the daily panel capacity, "
+        "honouring applicant availability and program priority."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=parse_date, default=None,
+                            help="First interview day, YYYY-MM-DD (defaults to tomorrow).")
+        parser.add_argument('--days', type=int, default=None,
+                            help="Days to plan (defaults to ADMISSIONS_INTERVIEW_HORIZON_DAYS).")
+        parser.add_argument('--capacity', type=int, default=None,
+                            help="Interviews per panel day, i.e. per ADMISSIONS_INTERVIEW_WEEKDAYS day "
+                                 "(defaults to ADMISSIONS_INTERVIEW_DAILY_CAPACITY).")
+        parser.add_argument('--program', type=int, default=None, help="Only schedule this scheduled program id.")
+        parser.add_argument('--priority', action='append', default=[], metavar='PROGRAM_ID=PRIORITY',
+                            help="Priority of a scheduled program, higher first (repeatable, default 0).")
+        parser.add_argument('--availability', default=None, metavar='CSV',
+                            help="CSV of Application_id,earliest,latest days applicants can attend.")
+        parser.add_argument('--dry-run', action='store_true', help="Plan and report without writing.")
+        parser.add_argument('--summary', action='store_true', help="Print only totals and timing.")
+
+    def handle(self, *args, **options):
+        try:
+            priorities = {int(program): int(priority) for program, priority in
+                          (item.split('=', 1) for item in options['priority'])}
+        except ValueError:
+            raise CommandError("--priority takes PROGRAM_ID=PRIORITY with integer values.")
+        availability = self.read_availability(options['availability']) if options['availability'] else None
+
+        started = time.perf_counter()
+        try:
+            result = ApplicationServiceImpl().schedule_interviews(
+                start=options['start'], days=options['days'], capacity=options['capacity'],
+                priorities=priorities, availability=availability,
+                scheduled_program_id=options['program'], dry_run=options['dry_run'],
+            )
+        except ValidationError as e:
+            raise CommandError(' '.join(e.messages))
+        elapsed = time.perf_counter() - started
+
+        if not options['summary']:
+            self.stdout.write(json.dumps({
+                'load': result['load'], 'unscheduled': result['unscheduled'], 'overbooked': result['overbooked'],
+            }, indent=2))
+        self.stdout.write(self.style.SUCCESS(
+            f"Scheduled {result['scheduled']} of {result['applicants']} interview(s) over {len(result['load'])} day(s), "
+            f"{result['changed']} date(s) changed, {len(result['unscheduled'])} unscheduled "
+            f"({len(result['overbooked'])} overbooked)"
+            f"{' (dry run)' if options['dry_run'] else ''} in {elapsed:.2f}s."
+        ))
+
+    @staticmethod
+    def read_availability(path):
+        availability = {}
+        with open(path, newline='') as handle:
+            for line, row in enumerate(csv.reader(handle), start=1):
+                if not row or (line == 1 and not row[0].strip().isdigit()):
+                    continue  # blank line or header
+                try:
+                    application_id, earliest, latest = row[:3]
+                    earliest, latest = parse_date(earliest.strip()), parse_date(latest.strip())
+                    if earliest is None or latest is None:
+                        raise ValueError
+                    availability[int(application_id)] = (earliest, latest)
+                except ValueError:
+                    raise CommandError(f"{path}:{line}: expected Application_id,YYYY-MM-DD,YYYY-MM-DD.")
+        return availability
@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from participant.models import Application, Participant
+from participant.services.application_service import ApplicationServiceImpl
+from programms.models import Programs_Scheduled
+
+
+class Command(BaseCommand):
+    help = (
+        "Race many concurrent enrolments for one scheduled program with a small capacity, check that "
+        "it is never overbooked and report reservations/s. The seeded rows are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--capacity', type=int, default=50, help="Seats of the contended session.")
+        parser.add_argument('--applications', type=int, default=500, help="Accepted applications racing for them.")
+        parser.add_argument('--threads', type=int, default=16, help="Concurrent workers, one connection each.")
+        parser.add_argument('--retries', type=int, default=20,
+                            help="Retries of an enrolment that hit a lock timeout (SQLite locks the whole file).")
+        parser.add_argument('--keep', action='store_true', help="Keep the seeded session and applications.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Database: {connection.vendor}, {options['threads']} threads, "
+                          f"{options['applications']} applications for {options['capacity']} seats")
+        program = Programs_Scheduled.objects.create(
+            ProgramName='Enrolment stress test', Location='Benchmark', Start_Date=date.today(),
+            End_Date=date.today() + timedelta(days=90), sessions_per_week=1, capacity=options['capacity'],
+        )
+        try:
+            Application.objects.bulk_create([
+                Application(
+                    Full_Name=f'Stress {i}', Date_of_birth=date(2000, 1, 1), Highest_qualification='BSc',
+                    Marks_obtained=i % 100, Goals='Stress test', Email_id=f'stress{i}@example.com',
+                    Scheduled_program=program, Status=Application.STATUS_ACCEPTED, Date_Of_Interview=date.today(),
+                )
+                for i in range(options['applications'])
+            ])
+            application_ids = list(Application.objects.filter(Scheduled_program=program).values_list('pk', flat=True))
+            outcomes, elapsed = self.race(application_ids, options['threads'], options['retries'])
+            self.verify(program, outcomes, elapsed, options['capacity'])
+        finally:
+            if not options['keep']:
+                Application.objects.filter(Scheduled_program=program).delete()
+                program.delete()
+
+    def race(self, application_ids, threads, retries):
+        service = ApplicationServiceImpl()
+        outcomes = Counter()
+        lock = threading.Lock()
+        start = threading.Barrier(threads)
+
+        def worker(chunk):
+            local = Counter()
+            start.wait()
+            try:
+                for application_id in chunk:
+                    for attempt in range(retries + 1):
+                        try:
+                            service.enrol(application_id)
+                            local['enrolled'] += 1
+                        except ValidationError as e:
+                            local['full' if e.code == 'full' else 'rejected'] += 1
+                        except OperationalError:
+                            local['lock retries'] += 1
+                            if attempt == retries:
+                                local['failed'] += 1
+                            else:
+                                time.sleep(0.001 * (attempt + 1))
+                                continue
+                        break
+            finally:
+                connections.close_all()
+            with lock:
+                outcomes.update(local)
+
+        chunks = [application_ids[i::threads] for i in range(threads)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for future in [pool.submit(worker, chunk) for chunk in chunks]:
+                future.result()
+        return outcomes, time.perf_counter() - started
+
+    def verify(self, program, outcomes, elapsed, capacity):
+        program.refresh_from_db(fields=['enrolled_count'])
+        participants = Participant.objects.filter(Scheduled_program=program)
+        roll_numbers = list(participants.values_list('Roll_no', flat=True))
+        attempts = sum(outcomes[key] for key in ('enrolled', 'full', 'rejected', 'failed'))
+
+        self.stdout.write(', '.join(f"{key}: {count}" for key, count in sorted(outcomes.items())))
+        self.stdout.write(f"enrolled_count: {program.enrolled_count}, participants: {len(roll_numbers)}, "
+                          f"distinct roll numbers: {len(set(roll_numbers))}")
+        self.stdout.write(f"{attempts / elapsed:,.0f} reservation attempts/s, "
+                          f"{outcomes['enrolled'] / elapsed:,.0f} enrolments/s over {elapsed:.2f}s")
+
+        problems = []
+        if program.enrolled_count > capacity or len(roll_numbers) > capacity:
+            problems.append("session overbooked")
+        if not program.enrolled_count == len(roll_numbers) == outcomes['enrolled']:
+            problems.append("enrolled_count does not match the participants created")
+        if len(set(roll_numbers)) != len(roll_numbers):
+            problems.append("duplicate roll numbers")
+        if not outcomes['failed'] and outcomes['enrolled'] != min(capacity, attempts):
+            problems.append("free seats left while enrolments were refused")
+        if problems:
+            raise CommandError('; '.join(problems))
+        self.stdout.write(self.style.SUCCESS("No overbooking."))
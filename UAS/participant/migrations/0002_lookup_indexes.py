@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("participant", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(fields=["Email_id"], name="application_email_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["Scheduled_program_id", "Status"],
+                name="application_program_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(fields=["Status"], name="application_status_idx"),
+        ),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def check_scheduled_program_references(apps, schema_editor):
+    """
+    Fail with a readable message instead of an IntegrityError on dangling program ids.
+    """
+    Programs_Scheduled = apps.get_model("programms", "Programs_Scheduled")
+    scheduled_ids = Programs_Scheduled.objects.values("Scheduled_program_id")
+    for model_name in ("Application", "Participant"):
+        model = apps.get_model("participant", model_name)
+        dangling = sorted(
+            set(
+                model.objects.exclude(Scheduled_program__in=scheduled_ids).values_list(
+                    "Scheduled_program", flat=True
+                )
+            )
+        )
+        if dangling:
+            raise RuntimeError(
+                f"{model_name} rows reference unknown scheduled programs: "
+                + ", ".join(str(pk) for pk in dangling)
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("programms", "0004_programs_scheduled_program_offered"),
+        ("participant", "0002_lookup_indexes"),
+    ]
+
+    operations = [
+        # Pin the existing column name so the rename below is state-only.
+        migrations.AlterField(
+            model_name="application",
+            name="Scheduled_program_id",
+            field=models.IntegerField(
+                db_column="Scheduled_program_id", verbose_name="Scheduled Program Id"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="participant",
+            name="Scheduled_program_id",
+            field=models.IntegerField(
+                db_column="Scheduled_program_id", verbose_name="Scheduled Program Id"
+            ),
+        ),
+        migrations.RenameField(
+            model_name="application",
+            old_name="Scheduled_program_id",
+            new_name="Scheduled_program",
+        ),
+        migrations.RenameField(
+            model_name="participant",
+            old_name="Scheduled_program_id",
+            new_name="Scheduled_program",
+        ),
+        # The index already covers the same column; only its field reference changes.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveIndex(
+                    model_name="application",
+                    name="application_program_status_idx",
+                ),
+                migrations.AddIndex(
+                    model_name="application",
+                    index=models.Index(
+                        fields=["Scheduled_program", "Status"],
+                        name="application_program_status_idx",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(
+            check_scheduled_program_references, migrations.RunPython.noop
+        ),
+        migrations.AlterField(
+            model_name="application",
+            name="Scheduled_program",
+            field=models.ForeignKey(
+                db_column="Scheduled_program_id",
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="applications",
+                to="programms.programs_scheduled",
+                verbose_name="Scheduled Program Id",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="participant",
+            name="Scheduled_program",
+            field=models.ForeignKey(
+                db_column="Scheduled_program_id",
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="participants",
+                to="programms.programs_scheduled",
+                verbose_name="Scheduled Program Id",
+            ),
+        ),
+    ]
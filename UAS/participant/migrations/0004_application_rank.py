@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("participant", "0003_scheduled_program_foreign_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="application",
+            name="Rank",
+            field=models.PositiveIntegerField(
+                blank=True, editable=False, null=True, verbose_name="Rank"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["Scheduled_program", "Rank"],
+                name="application_program_rank_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:52
+
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_enrolled_count(apps, schema_editor):
+    """
+    Start every session's enrolled_count at its current number of participants.
+    """
+    Programs_Scheduled = apps.get_model("programms", "Programs_Scheduled")
+    Participant = apps.get_model("participant", "Participant")
+    enrolled = (
+        Participant.objects.filter(Scheduled_program=OuterRef("pk"))
+        .order_by()
+        .values("Scheduled_program")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Programs_Scheduled.objects.update(enrolled_count=Coalesce(Subquery(enrolled), 0))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("participant", "0004_application_rank"),
+        ("programms", "0007_capacity"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_enrolled_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,209 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:05
+
+from collections import defaultdict
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_stats(apps, schema_editor):
+    """
+    Count the existing applications into the new statistics tables.
+    """
+    Application = apps.get_model("participant", "Application")
+    ApplicationStats = apps.get_model("participant", "ApplicationStats")
+    ApplicationMarks = apps.get_model("participant", "ApplicationMarks")
+    InterviewDayLoad = apps.get_model("participant", "InterviewDayLoad")
+
+    histograms = defaultdict(dict)
+    for program_id, status, marks, n in (
+        Application.objects.order_by()
+        .values_list("Scheduled_program_id", "Status", "Marks_obtained")
+        .annotate(n=Count("pk"))
+    ):
+        histograms[program_id, status][marks] = n
+    ApplicationMarks.objects.bulk_create(
+        [
+            ApplicationMarks(
+                Scheduled_program_id=program_id,
+                Status=status,
+                Marks_obtained=marks,
+                applications=n,
+            )
+            for (program_id, status), histogram in histograms.items()
+            for marks, n in histogram.items()
+        ],
+        batch_size=1000,
+    )
+
+    stats = []
+    for (program_id, status), histogram in histograms.items():
+        total = sum(histogram.values())
+        marks = sorted(histogram)
+        middle, seen = [], 0
+        for mark in marks:
+            seen += histogram[mark]
+            while (
+                len(middle) < 2 and seen > ((total - 1) // 2, total // 2)[len(middle)]
+            ):
+                middle.append(mark)
+        stats.append(
+            ApplicationStats(
+                Scheduled_program_id=program_id,
+                Status=status,
+                applications=total,
+                marks_total=sum(mark * n for mark, n in histogram.items()),
+                marks_min=marks[0],
+                marks_max=marks[-1],
+                marks_median=sum(middle) / 2,
+            )
+        )
+    ApplicationStats.objects.bulk_create(stats, batch_size=1000)
+
+    InterviewDayLoad.objects.bulk_create(
+        [
+            InterviewDayLoad(Date_Of_Interview=day, applications=n)
+            for day, n in Application.objects.filter(Status="INTERVIEW")
+            .order_by()
+            .values_list("Date_Of_Interview")
+            .annotate(n=Count("pk"))
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("programms", "0008_schedule_conflict_indexes"),
+        ("participant", "0005_backfill_enrolled_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InterviewDayLoad",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "Date_Of_Interview",
+                    models.DateField(unique=True, verbose_name="Date Of Interview"),
+                ),
+                (
+                    "applications",
+                    models.IntegerField(default=0, verbose_name="Applications"),
+                ),
+            ],
+            options={
+                "verbose_name": "Interview Day Load",
+                "verbose_name_plural": "Interview Day Load",
+                "db_table": "Interview Day Load",
+            },
+        ),
+        migrations.CreateModel(
+            name="ApplicationStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("Status", models.CharField(max_length=50, verbose_name="Status")),
+                (
+                    "applications",
+                    models.IntegerField(default=0, verbose_name="Applications"),
+                ),
+                (
+                    "marks_total",
+                    models.BigIntegerField(default=0, verbose_name="Marks Total"),
+                ),
+                (
+                    "marks_min",
+                    models.IntegerField(null=True, verbose_name="Lowest Marks"),
+                ),
+                (
+                    "marks_max",
+                    models.IntegerField(null=True, verbose_name="Highest Marks"),
+                ),
+                (
+                    "marks_median",
+                    models.FloatField(null=True, verbose_name="Median Marks"),
+                ),
+                (
+                    "Scheduled_program",
+                    models.ForeignKey(
+                        db_column="Scheduled_program_id",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="programms.programs_scheduled",
+                        verbose_name="Scheduled Program Id",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Application Stats",
+                "verbose_name_plural": "Application Stats",
+                "db_table": "Application Stats",
+            },
+        ),
+        migrations.CreateModel(
+            name="ApplicationMarks",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("Status", models.CharField(max_length=50, verbose_name="Status")),
+                ("Marks_obtained", models.IntegerField(verbose_name="Marks Obtained")),
+                (
+                    "applications",
+                    models.IntegerField(default=0, verbose_name="Applications"),
+                ),
+                (
+                    "Scheduled_program",
+                    models.ForeignKey(
+                        db_column="Scheduled_program_id",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="programms.programs_scheduled",
+                        verbose_name="Scheduled Program Id",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Application Marks",
+                "verbose_name_plural": "Application Marks",
+                "db_table": "Application Marks",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="applicationstats",
+            constraint=models.UniqueConstraint(
+                fields=("Scheduled_program", "Status"), name="application_stats_key"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="applicationmarks",
+            constraint=models.UniqueConstraint(
+                fields=("Scheduled_program", "Status", "Marks_obtained"),
+                name="application_marks_key",
+            ),
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,85 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+# Application fields the admissions statistics are keyed by (participant.services.admissions_stats)
+STATS_FIELDS = frozenset({'Scheduled_program', 'Scheduled_program_id', 'Status', 'Marks_obtained', 'Date_Of_Interview'})
+
+
+class ApplicationQuerySet(models.QuerySet):
+    """
+    Queryset whose bulk writes keep the admissions statistics tables in step; save() and
+    delete() of single rows are covered by the signals in participant.signals.
+    """
+
+    def update(self, **kwargs):
+        # Also reached by bulk_update(), which runs one update() per batch
+        if STATS_FIELDS.isdisjoint(kwargs):
+            return super().update(**kwargs)
+        from .services import admissions_stats
+
+        with transaction.atomic(using=self.db):
+            # Lock the matched rows and update exactly that snapshot: re-evaluating the filter could
+            # match rows changed since, which the before/after counts would then miss.
+            application_ids = list(self.select_for_update().values_list('pk', flat=True))
+            before = admissions_stats.count_keys(application_ids)
+            updated = 0
+            batch_size = getattr(settings, 'ADMISSIONS_BATCH_SIZE', 1000)
+            for offset in range(0, len(application_ids), batch_size):
+                updated += self.model._base_manager.using(self.db).filter(
+                    pk__in=application_ids[offset:offset + batch_size]
+                ).update(**kwargs)
+            admissions_stats.apply(admissions_stats.count_keys(application_ids), before)
+        return updated
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from .services import admissions_stats
+
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            admissions_stats.apply(admissions_stats.count(objs))
+        return objs
+
+    def with_programs(self):
+        """
+        Join each application's scheduled program and its offered program in the same query.
+        """
+        return self.select_related('Scheduled_program__Program_offered')
+
+    def roster(self, scheduled_program_id):
+        """
+        Applicants of one scheduled program with their programs pre-joined, ordered by name.
+        """
+        return self.with_programs().filter(Scheduled_program_id=scheduled_program_id).order_by('Full_Name')
+
+
+class ParticipantQuerySet(models.QuerySet):
+    def with_programs(self):
+        """
+        Join each participant's application, scheduled program and offered program in the same query.
+        """
+        return self.select_related('Application_id', 'Scheduled_program__Program_offered')
+
+    def roster(self, scheduled_program_id):
+        """
+        Participants of one scheduled program with their programs pre-joined, ordered by roll number.
+        """
+        return self.with_programs().filter(Scheduled_program_id=scheduled_program_id).order_by('Roll_no')
+
+
 class Participant(models.Model):
     Roll_no = models.IntegerField(_("Roll No"))
     Email_id = models.EmailField(_("Email Id"), max_length=254)
     Application_id = models.ForeignKey("Application", verbose_name=_("Application Id"), on_delete=models.CASCADE)
-    Scheduled_program_id = models.IntegerField(_("Scheduled Program Id"))
+    Scheduled_program = models.ForeignKey(
+        "programms.Programs_Scheduled",
+        verbose_name=_("Scheduled Program Id"),
+        on_delete=models.PROTECT,
+        db_column='Scheduled_program_id',
+        related_name='participants',
+    )
+
+    objects = ParticipantQuerySet.as_manager()
 
     class Meta:
         db_table = 'Participant'
@@ -17,6 +90,11 @@ class Participant(models.Model):
         return f"{self.Roll_no} {self.Email_id} {self.Application_id} {self.Scheduled_program_id}"
 
 class Application(models.Model):
+    STATUS_PENDING = 'PENDING'
+    STATUS_INTERVIEW = 'INTERVIEW'
+    STATUS_ACCEPTED = 'ACCEPTED'
+    STATUS_REJECTED = 'REJECTED'
+
     Application_id = models.AutoField(_("Application Id"), primary_key=True)
     Full_Name = models.CharField(_("Full Name"), max_length=50)
     Date_of_birth = models.DateField(_("Date Of Birth"))
@@ -24,14 +102,32 @@ class Application(models.Model):
     Marks_obtained = models.IntegerField(_("Marks Obtained"))
     Goals = models.CharField(_("Goals"), max_length=50)
     Email_id = models.EmailField(_("Email Id"), max_length=254)
-    Scheduled_program_id = models.IntegerField(_("Scheduled Program Id"))
+    # Indexed through application_program_status_idx, whose leading column it is.
+    Scheduled_program = models.ForeignKey(
+        "programms.Programs_Scheduled",
+        verbose_name=_("Scheduled Program Id"),
+        on_delete=models.PROTECT,
+        db_column='Scheduled_program_id',
+        db_index=False,
+        related_name='applications',
+    )
     Status = models.CharField(_("Status"), max_length=50)
     Date_Of_Interview = models.DateField(_("Date Of Interview"))
+    # Position within the scheduled program by marks, oldest applicant first on ties.
+    Rank = models.PositiveIntegerField(_("Rank"), null=True, blank=True, editable=False)
+
+    objects = ApplicationQuerySet.as_manager()
 
     class Meta:
         db_table = 'Application'
         verbose_name = 'Application'
         verbose_name_plural = 'Applications'
+        indexes = [
+            models.Index(fields=['Email_id'], name='application_email_idx'),
+            models.Index(fields=['Scheduled_program', 'Status'], name='application_program_status_idx'),
+            models.Index(fields=['Status'], name='application_status_idx'),
+            models.Index(fields=['Scheduled_program', 'Rank'], name='application_program_rank_idx'),
+        ]
 
     def __str__(self):
         return (
@@ -39,3 +135,74 @@ class Application(models.Model):
             f"{self.Marks_obtained} {self.Goals} {self.Email_id} {self.Scheduled_program_id} {self.Status} "
             f"{self.Date_Of_Interview}"
         )
+
+
+class ApplicationStats(models.Model):
+    """
+    Applications per scheduled program and status with their mark summary.
+
+    Kept in step with Application by participant.services.admissions_stats, so
+    the dashboard reads one row per program and status instead of scanning
+    Application. The mean is marks_total / applications.
+    """
+    Scheduled_program = models.ForeignKey(
+        "programms.Programs_Scheduled",
+        verbose_name=_("Scheduled Program Id"),
+        on_delete=models.CASCADE,
+        db_column='Scheduled_program_id',
+        related_name='+',
+    )
+    Status = models.CharField(_("Status"), max_length=50)
+    applications = models.IntegerField(_("Applications"), default=0)
+    marks_total = models.BigIntegerField(_("Marks Total"), default=0)
+    marks_min = models.IntegerField(_("Lowest Marks"), null=True)
+    marks_max = models.IntegerField(_("Highest Marks"), null=True)
+    marks_median = models.FloatField(_("Median Marks"), null=True)
+
+    class Meta:
+        db_table = 'Application Stats'
+        verbose_name = 'Application Stats'
+        verbose_name_plural = 'Application Stats'
+        constraints = [
+            models.UniqueConstraint(fields=['Scheduled_program', 'Status'], name='application_stats_key'),
+        ]
+
+
+class ApplicationMarks(models.Model):
+    """
+    Histogram of Marks_obtained per scheduled program and status, from which the
+    median, lowest and highest marks of ApplicationStats are recomputed.
+    """
+    Scheduled_program = models.ForeignKey(
+        "programms.Programs_Scheduled",
+        verbose_name=_("Scheduled Program Id"),
+        on_delete=models.CASCADE,
+        db_column='Scheduled_program_id',
+        related_name='+',
+    )
+    Status = models.CharField(_("Status"), max_length=50)
+    Marks_obtained = models.IntegerField(_("Marks Obtained"))
+    applications = models.IntegerField(_("Applications"), default=0)
+
+    class Meta:
+        db_table = 'Application Marks'
+        verbose_name = 'Application Marks'
+        verbose_name_plural = 'Application Marks'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['Scheduled_program', 'Status', 'Marks_obtained'], name='application_marks_key',
+            ),
+        ]
+
+
+class InterviewDayLoad(models.Model):
+    """
+    Number of applications in INTERVIEW status per interview day, kept like ApplicationStats.
+    """
+    Date_Of_Interview = models.DateField(_("Date Of Interview"), unique=True)
+    applications = models.IntegerField(_("Applications"), default=0)
+
+    class Meta:
+        db_table = 'Interview Day Load'
+        verbose_name = 'Interview Day Load'
+        verbose_name_plural = 'Interview Day Load'
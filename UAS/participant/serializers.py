@@ -0,0 +1,15 @@
+from UAS.serializers import ModelSerializer
+from .models import Application, Participant
+
+
+class ApplicationSerializer(ModelSerializer):
+    model = Application
+    fields = (
+        'Application_id', 'Full_Name', 'Date_of_birth', 'Highest_qualification', 'Marks_obtained', 'Goals',
+        'Email_id', 'Scheduled_program', 'Status', 'Date_Of_Interview', 'Rank',
+    )
+
+
+class ParticipantSerializer(ModelSerializer):
+    model = Participant
+    fields = ('id', 'Roll_no', 'Email_id', 'Application_id', 'Scheduled_program')
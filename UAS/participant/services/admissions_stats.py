@@ -0,0 +1,238 @@
+"""
+Incremental maintenance of the admissions statistics tables.
+
+Every application is counted under its key (Scheduled_program_id, Status,
+Marks_obtained, Date_Of_Interview): in ApplicationStats and the
+ApplicationMarks histogram and, while in INTERVIEW status, in
+InterviewDayLoad. Writes turn into counter deltas:
+
+- save() and delete() of single applications through participant.signals;
+- queryset update() (and so bulk_update()) and bulk_create() through ApplicationQuerySet.
+
+Deltas are added with F() increments, one CASE UPDATE per batch of keys.
+The ApplicationStats rows are updated first, which locks them until commit,
+so the median / min / max recomputed afterwards from the histogram always
+sees the writes of concurrent transactions on the same program and status.
+
+rebuild() recomputes every table from Application with GROUP BY scans, to
+repair drift after raw SQL writes.
+"""
+import logging
+from collections import Counter, defaultdict
+from typing import Dict
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, IntegerField, Sum, Value, When
+from ..models import Application, ApplicationMarks, ApplicationStats, InterviewDayLoad
+
+logger = logging.getLogger(__name__)
+
+KEY_FIELDS = ('Scheduled_program_id', 'Status', 'Marks_obtained', 'Date_Of_Interview')
+
+
+def key(application):
+    return tuple(getattr(application, field) for field in KEY_FIELDS)
+
+
+def count(applications):
+    """
+    Return a Counter of the keys of in-memory `applications`.
+    """
+    return Counter(map(key, applications))
+
+
+def stored_key(application_id):
+    """
+    Return the key of an application as currently stored, or None when it does not exist.
+    """
+    return Application.objects.filter(pk=application_id).values_list(*KEY_FIELDS).first()
+
+
+def count_keys(application_ids):
+    """
+    Return a Counter of the stored keys of `application_ids`, grouped in the database.
+    """
+    application_ids = list(application_ids)
+    counts = Counter()
+    for batch in _batches(application_ids):
+        rows = (
+            Application.objects.filter(pk__in=batch)
+            .order_by()
+            .values_list(*KEY_FIELDS)
+            .annotate(n=Count('pk'))
+        )
+        for *application_key, n in rows:
+            counts[tuple(application_key)] += n
+    return counts
+
+
+def summarize_marks(histogram: Dict[int, int]) -> dict:
+    """
+    Median (middle two averaged), min and max of a mark -> applications histogram.
+    """
+    total = sum(n for n in histogram.values() if n > 0)
+    if not total:
+        return {'marks_median': None, 'marks_min': None, 'marks_max': None}
+    marks = sorted(mark for mark, n in histogram.items() if n > 0)
+    middle, seen = [], 0
+    for mark in marks:
+        seen += histogram[mark]
+        while len(middle) < 2 and seen > ((total - 1) // 2, total // 2)[len(middle)]:
+            middle.append(mark)
+    return {'marks_median': sum(middle) / 2, 'marks_min': marks[0], 'marks_max': marks[-1]}
+
+
+def _batches(items):
+    batch_size = getattr(settings, 'ADMISSIONS_BATCH_SIZE', 1000)
+    for offset in range(0, len(items), batch_size):
+        yield items[offset:offset + batch_size]
+
+
+def _add(model, key_fields, value_fields, deltas):
+    """
+    Add deltas[key] (one number per value field) to the `model` rows keyed by key_fields, creating missing rows.
+    """
+    keys = sorted(row_key for row_key, values in deltas.items() if any(values))
+    for batch in _batches(keys):
+        wanted = set(batch)
+        candidates = model.objects.filter(**{
+            f'{field}__in': {row_key[index] for row_key in batch} for index, field in enumerate(key_fields)
+        }).values_list(*key_fields, 'pk')
+        existing = {tuple(row[:-1]): row[-1] for row in candidates if tuple(row[:-1]) in wanted}
+        if existing:
+            model.objects.filter(pk__in=existing.values()).update(**{
+                field: F(field) + Case(
+                    *(When(pk=pk, then=Value(deltas[row_key][index])) for row_key, pk in existing.items()),
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+                for index, field in enumerate(value_fields)
+            })
+        missing = [row_key for row_key in batch if row_key not in existing]
+        if not missing:
+            continue
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create([
+                    model(**dict(zip(key_fields, row_key)), **dict(zip(value_fields, deltas[row_key])))
+                    for row_key in missing
+                ])
+        except IntegrityError:
+            # Some were created concurrently; add to those one by one
+            for row_key in missing:
+                lookup = dict(zip(key_fields, row_key))
+                values = dict(zip(value_fields, deltas[row_key]))
+                if not model.objects.filter(**lookup).update(**{
+                    field: F(field) + value for field, value in values.items()
+                }):
+                    model.objects.create(**lookup, **values)
+
+
+def _refresh_marks(pairs):
+    """
+    Recompute median / min / max of the (program, status) pairs from the histogram.
+    """
+    pairs = sorted(pairs)
+    for batch in _batches(pairs):
+        wanted = set(batch)
+        program_ids = {program_id for program_id, _ in batch}
+        histograms = defaultdict(dict)
+        for program_id, status, marks, n in ApplicationMarks.objects.filter(
+            Scheduled_program_id__in=program_ids, applications__gt=0
+        ).values_list('Scheduled_program_id', 'Status', 'Marks_obtained', 'applications'):
+            if (program_id, status) in wanted:
+                histograms[program_id, status][marks] = n
+        rows = [
+            row for row in ApplicationStats.objects.filter(Scheduled_program_id__in=program_ids)
+            if (row.Scheduled_program_id, row.Status) in wanted
+        ]
+        changed = []
+        for row in rows:
+            summary = summarize_marks(histograms[row.Scheduled_program_id, row.Status])
+            if any(getattr(row, field) != value for field, value in summary.items()):
+                for field, value in summary.items():
+                    setattr(row, field, value)
+                changed.append(row)
+        ApplicationStats.objects.bulk_update(changed, ['marks_median', 'marks_min', 'marks_max'])
+
+
+def apply(added, removed=None):
+    """
+    Count the keys in `added` and stop counting the keys in `removed` (Counters of key -> applications).
+    """
+    delta = Counter(added)
+    delta.subtract(removed or {})
+    stats, marks, interviews = defaultdict(lambda: [0, 0]), Counter(), Counter()
+    for (program_id, status, mark, interview_date), n in delta.items():
+        if not n:
+            continue
+        stats[program_id, status][0] += n
+        stats[program_id, status][1] += mark * n
+        marks[program_id, status, mark] += n
+        if status == Application.STATUS_INTERVIEW:
+            interviews[(interview_date,)] += n
+    # Keys differing only in Date_Of_Interview cancel out here (e.g. rescheduled interviews)
+    marks = {row_key: (n,) for row_key, n in marks.items() if n}
+    interviews = {row_key: (n,) for row_key, n in interviews.items() if n}
+    if not marks and not interviews:
+        return
+
+    with transaction.atomic():
+        _add(ApplicationStats, ('Scheduled_program_id', 'Status'), ('applications', 'marks_total'), stats)
+        _add(ApplicationMarks, ('Scheduled_program_id', 'Status', 'Marks_obtained'), ('applications',), marks)
+        _add(InterviewDayLoad, ('Date_Of_Interview',), ('applications',), interviews)
+        _refresh_marks({(program_id, status) for program_id, status, _ in marks})
+
+
+def rebuild():
+    """
+    Recompute every statistics table from Application.
+
+    :return: Number of ApplicationStats rows written.
+    """
+    batch_size = getattr(settings, 'ADMISSIONS_BATCH_SIZE', 1000)
+    with transaction.atomic():
+        for model in (ApplicationStats, ApplicationMarks, InterviewDayLoad):
+            model.objects.all().delete()
+
+        histograms = defaultdict(dict)
+        marks = []
+        for program_id, status, mark, n in (
+            Application.objects.order_by()
+            .values_list('Scheduled_program_id', 'Status', 'Marks_obtained')
+            .annotate(n=Count('pk'))
+            .iterator(chunk_size=batch_size)
+        ):
+            histograms[program_id, status][mark] = n
+            marks.append(ApplicationMarks(
+                Scheduled_program_id=program_id, Status=status, Marks_obtained=mark, applications=n,
+            ))
+        ApplicationMarks.objects.bulk_create(marks, batch_size=batch_size)
+
+        stats = ApplicationStats.objects.bulk_create([
+            ApplicationStats(
+                Scheduled_program_id=program_id, Status=status,
+                applications=sum(histogram.values()),
+                marks_total=sum(mark * n for mark, n in histogram.items()),
+                **summarize_marks(histogram),
+            )
+            for (program_id, status), histogram in histograms.items()
+        ], batch_size=batch_size)
+
+        InterviewDayLoad.objects.bulk_create([
+            InterviewDayLoad(Date_Of_Interview=interview_date, applications=n)
+            for interview_date, n in Application.objects.filter(Status=Application.STATUS_INTERVIEW)
+            .order_by()
+            .values_list('Date_Of_Interview')
+            .annotate(n=Count('pk'))
+        ], batch_size=batch_size)
+    logger.info("Admissions statistics rebuilt: %s program/status rows", len(stats))
+    return len(stats)
+
+
+def drift():
+    """
+    Return the number of applications by which the statistics tables disagree with Application.
+    """
+    counted = ApplicationStats.objects.aggregate(total=Sum('applications'))['total'] or 0
+    return Application.objects.count() - counted
@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple, Union
+from ..models import Participant
+
+class ApplicationService(ABC):
+
+    @abstractmethod
+    def transition_status(self, application_ids: Iterable[int], from_status: str, to_status: str) -> int:
+        pass
+
+    @abstractmethod
+    def assign_interview_dates(self, assignments: Dict[int, date]) -> int:
+        pass
+
+    @abstractmethod
+    def schedule_interviews(self, start: Optional[date] = None, days: Optional[int] = None,
+                            capacity: Union[int, Dict[date, int], None] = None,
+                            priorities: Optional[Dict[int, int]] = None,
+                            availability: Optional[Dict[int, Tuple[date, date]]] = None,
+                            scheduled_program_id: Optional[int] = None, dry_run: bool = False) -> dict:
+        pass
+
+    @abstractmethod
+    def promote_accepted(self, scheduled_program_id: Optional[int] = None) -> int:
+        pass
+
+    @abstractmethod
+    def reserve_seats(self, scheduled_program_id: int, seats: int = 1) -> bool:
+        pass
+
+    @abstractmethod
+    def release_seats(self, scheduled_program_id: int, seats: int = 1) -> bool:
+        pass
+
+    @abstractmethod
+    def enrol(self, application_id: int) -> Participant:
+        pass
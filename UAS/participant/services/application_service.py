@@ -0,0 +1,320 @@
+import logging
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple, Union
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F, Max, Q
+from programms.models import Programs_Scheduled
+from .application import ApplicationService
+from . import interview_scheduler
+from ..models import Application, Participant
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_TRANSITIONS = {
+    Application.STATUS_PENDING: {Application.STATUS_INTERVIEW, Application.STATUS_REJECTED},
+    Application.STATUS_INTERVIEW: {Application.STATUS_ACCEPTED, Application.STATUS_REJECTED},
+    Application.STATUS_ACCEPTED: set(),
+    Application.STATUS_REJECTED: set(),
+}
+
+class ApplicationServiceImpl(ApplicationService):
+
+    """ ==================================
+    Status Transitions
+    ======================================
+    """
+
+    def transition_status(self, application_ids: Iterable[int], from_status: str, to_status: str) -> int:
+        """
+        Move applications from one status to the next with a single UPDATE.
+
+        Only applications currently in `from_status` are touched, so re-running
+        a wave is harmless.
+
+        :param application_ids: Applications to transition.
+        :param from_status: Expected current status.
+        :param to_status: New status, must be reachable from `from_status`.
+        :return: Number of applications updated.
+        """
+        if to_status not in ALLOWED_TRANSITIONS.get(from_status, set()):
+            logger.error("Validation error: Invalid status transition %s -> %s.", from_status, to_status)
+            raise ValidationError(f"Invalid status transition {from_status} -> {to_status}.")
+
+        application_ids = list(application_ids)
+        try:
+            with transaction.atomic():
+                updated = Application.objects.filter(
+                    pk__in=application_ids, Status=from_status
+                ).update(Status=to_status)
+            logger.info("Transitioned %s of %s applications %s -> %s", updated, len(application_ids), from_status, to_status)
+            return updated
+        except Exception as e:
+            logger.error("Unexpected error while transitioning application status: %s", e)
+            raise
+
+    """ ==================================
+    Interview Scheduling
+    ======================================
+    """
+
+    def assign_interview_dates(self, assignments: Dict[int, date]) -> int:
+        """
+        Set Date_Of_Interview for many applications.
+
+        Applications sharing a date are updated together, so a wave costs one
+        UPDATE per distinct interview day rather than one per application.
+
+        :param assignments: Mapping of application id to interview date.
+        :return: Number of applications updated.
+        """
+        by_date = defaultdict(list)
+        for application_id, interview_date in assignments.items():
+            by_date[interview_date].append(application_id)
+
+        try:
+            updated = 0
+            with transaction.atomic():
+                for interview_date, application_ids in by_date.items():
+                    updated += Application.objects.filter(pk__in=application_ids).update(
+                        Date_Of_Interview=interview_date
+                    )
+            logger.info("Assigned interview dates to %s applications over %s day(s)", updated, len(by_date))
+            return updated
+        except Exception as e:
+            logger.error("Unexpected error while assigning interview dates: %s", e)
+            raise
+
+    def schedule_interviews(self, start: Optional[date] = None, days: Optional[int] = None,
+                            capacity: Union[int, Dict[date, int], None] = None,
+                            priorities: Optional[Dict[int, int]] = None,
+                            availability: Optional[Dict[int, Tuple[date, date]]] = None,
+                            scheduled_program_id: Optional[int] = None, dry_run: bool = False) -> dict:
+        """
+        Give every application in INTERVIEW status an interview day within the panel capacity.
+
+        Days are planned in memory (see participant.services.interview_scheduler) and only
+        the changed dates are written, through assign_interview_dates. Applications that do
+        not fit keep their current date and are reported as unscheduled, and as overbooked
+        when that date lies within the horizon.
+
+        :param start: First interview day (defaults to tomorrow).
+        :param days: Days planned from `start` (defaults to ADMISSIONS_INTERVIEW_HORIZON_DAYS).
+        :param capacity: Seats per panel day (defaults to ADMISSIONS_INTERVIEW_DAILY_CAPACITY),
+                         or a mapping of date to seats overriding single dates.
+        :param priorities: Mapping of scheduled program id to priority; higher is served first, default 0.
+        :param availability: Mapping of application id to the (earliest, latest) days it can attend.
+        :param scheduled_program_id: Only schedule the applications of this scheduled program.
+        :param dry_run: Plan without writing.
+        :return: Dictionary with the counts, the unscheduled and overbooked application ids and the
+                 stored interviews per day of the horizon (as planned on a dry run).
+        """
+        try:
+            with transaction.atomic():
+                planned = interview_scheduler.plan(start=start, days=days, capacity=capacity,
+                                                   priorities=priorities, availability=availability,
+                                                   scheduled_program_id=scheduled_program_id)
+                if dry_run:
+                    updated, load = 0, planned['load']
+                else:
+                    updated = self.assign_interview_dates(planned['changed'])
+                    load = dict(interview_scheduler.stored_load(*planned['horizon']))
+            logger.info("Scheduled %s interviews (%s date(s) changed, %s unscheduled)%s",
+                        len(planned['assignments']), len(planned['changed']), len(planned['unscheduled']),
+                        " [dry run]" if dry_run else "")
+            return {
+                'applicants': len(planned['assignments']) + len(planned['unscheduled']),
+                'scheduled': len(planned['assignments']),
+                'changed': len(planned['changed']),
+                'updated': updated,
+                'unscheduled': planned['unscheduled'],
+                'overbooked': planned['overbooked'],
+                'load': {interview_date.isoformat(): n for interview_date, n in load.items()},
+            }
+        except ValidationError:
+            raise
+        except Exception as e:
+            logger.error("Unexpected error while scheduling interviews: %s", e)
+            raise
+
+    """ ==================================
+    Promotion To Participants
+    ======================================
+    """
+
+    def promote_accepted(self, scheduled_program_id: Optional[int] = None) -> int:
+        """
+        Create Participant rows for accepted applications that do not have one yet.
+
+        Sessions with a capacity only take as many participants as they have free
+        seats, best Rank first; the rest stay accepted on the waiting list. Roll
+        numbers continue from the highest roll number already issued for each
+        scheduled program.
+
+        Each session is promoted in its own transaction, holding the lock on its
+        scheduled program row: concurrent promotions and enrolments never hand out
+        the same seat or roll number, and a run over every session only ever
+        blocks enrolments into the session it is working on.
+
+        :param scheduled_program_id: Restrict promotion to one scheduled program.
+        :return: Number of participants created.
+        """
+        try:
+            if scheduled_program_id is not None:
+                program_ids = [scheduled_program_id]
+            else:
+                program_ids = list(
+                    Application.objects.filter(Status=Application.STATUS_ACCEPTED, participant__isnull=True)
+                    .order_by('Scheduled_program_id')
+                    .values_list('Scheduled_program_id', flat=True)
+                    .distinct()
+                )
+            promoted = sum(self._promote_session(program_id) for program_id in program_ids)
+            logger.info("Promoted %s accepted applications to participants", promoted)
+            return promoted
+        except Exception as e:
+            logger.error("Unexpected error while promoting accepted applications: %s", e)
+            raise
+
+    def _promote_session(self, scheduled_program_id: int) -> int:
+        """
+        Promote the accepted applications of one scheduled program, waiting for its row lock.
+
+        :return: Number of participants created.
+        """
+        batch_size = getattr(settings, 'ADMISSIONS_BATCH_SIZE', 1000)
+        with transaction.atomic():
+            program = (
+                Programs_Scheduled.objects.select_for_update()
+                .filter(pk=scheduled_program_id)
+                .values_list('capacity', 'enrolled_count')
+                .first()
+            )
+            if program is None:
+                return 0
+            capacity, enrolled = program
+            accepted = (
+                Application.objects.filter(
+                    Scheduled_program_id=scheduled_program_id,
+                    Status=Application.STATUS_ACCEPTED,
+                    participant__isnull=True,
+                )
+                .order_by(F('Rank').asc(nulls_last=True), 'Application_id')
+                .values_list('Application_id', 'Email_id')
+            )
+            if capacity is not None:
+                accepted = accepted[:max(capacity - enrolled, 0)]
+            roll_no = Participant.objects.filter(
+                Scheduled_program_id=scheduled_program_id
+            ).aggregate(last=Max('Roll_no'))['last'] or 0
+
+            participants = [
+                Participant(
+                    Roll_no=roll_no + offset,
+                    Email_id=email,
+                    Application_id_id=application_id,
+                    Scheduled_program_id=scheduled_program_id,
+                )
+                for offset, (application_id, email) in enumerate(accepted.iterator(chunk_size=batch_size), 1)
+            ]
+            # bulk_create sends no post_save, so the seats are counted here
+            Participant.objects.bulk_create(participants, batch_size=batch_size)
+            if participants:
+                Programs_Scheduled.objects.filter(pk=scheduled_program_id).update(
+                    enrolled_count=F('enrolled_count') + len(participants)
+                )
+        return len(participants)
+
+    """ ==================================
+    Seat Reservations
+    ======================================
+    """
+
+    def reserve_seats(self, scheduled_program_id: int, seats: int = 1) -> bool:
+        """
+        Take `seats` seats of a scheduled program if they are free.
+
+        A single conditional UPDATE (enrolled_count = enrolled_count + seats WHERE it
+        still fits the capacity) both checks and takes the seats. Concurrent callers
+        queue on that one row only, and each re-evaluates the condition once the
+        previous holder commits, so the session can never be overbooked.
+
+        :param scheduled_program_id: Scheduled program to reserve in.
+        :param seats: Number of seats.
+        :return: True when reserved, False when the session is full or does not exist.
+        """
+        if seats < 1:
+            raise ValidationError("Seats must be a positive integer.")
+        reserved = Programs_Scheduled.objects.filter(
+            Q(capacity__isnull=True) | Q(enrolled_count__lte=F('capacity') - seats),
+            pk=scheduled_program_id,
+        ).update(enrolled_count=F('enrolled_count') + seats)
+        if not reserved:
+            logger.info("No %s free seat(s) in scheduled program %s", seats, scheduled_program_id)
+        return bool(reserved)
+
+    def release_seats(self, scheduled_program_id: int, seats: int = 1) -> bool:
+        """
+        Give back `seats` seats of a scheduled program.
+
+        :return: True when released, False when fewer seats were taken.
+        """
+        if seats < 1:
+            raise ValidationError("Seats must be a positive integer.")
+        released = Programs_Scheduled.objects.filter(
+            pk=scheduled_program_id, enrolled_count__gte=seats
+        ).update(enrolled_count=F('enrolled_count') - seats)
+        return bool(released)
+
+    def enrol(self, application_id: int) -> Participant:
+        """
+        Turn one accepted application into a participant, taking a seat in its session.
+
+        The application row is locked first and the session row second (by the
+        reservation), always in that order, so concurrent enrolments cannot deadlock.
+
+        :param application_id: Accepted application to enrol.
+        :return: The created Participant.
+        :raises ValidationError: With code 'full' when no seat is left, or when the
+            application is not accepted or already enrolled.
+        """
+        try:
+            with transaction.atomic():
+                application = (
+                    Application.objects.select_for_update()
+                    .only('Application_id', 'Email_id', 'Scheduled_program_id', 'Status')
+                    .get(pk=application_id)
+                )
+                if application.Status != Application.STATUS_ACCEPTED:
+                    raise ValidationError(f"Application {application_id} is not accepted.")
+                if Participant.objects.filter(Application_id=application_id).exists():
+                    raise ValidationError(f"Application {application_id} is already enrolled.")
+                program_id = application.Scheduled_program_id
+                if not self.reserve_seats(program_id):
+                    raise ValidationError(f"No seats left in scheduled program {program_id}.", code='full')
+
+                # The reservation holds the session row lock until commit, so this maximum is stable
+                last_roll_no = Participant.objects.filter(
+                    Scheduled_program_id=program_id
+                ).aggregate(last=Max('Roll_no'))['last'] or 0
+                participant = Participant(
+                    Roll_no=last_roll_no + 1,
+                    Email_id=application.Email_id,
+                    Application_id_id=application_id,
+                    Scheduled_program_id=program_id,
+                )
+                # bulk_create skips post_save: the seat was already counted by the reservation
+                Participant.objects.bulk_create([participant])
+            logger.info("Enrolled application %s in scheduled program %s as roll no %s",
+                        application_id, program_id, participant.Roll_no)
+            return participant
+        except ValidationError:
+            raise
+        except Application.DoesNotExist:
+            logger.error("Application not found: %s", application_id)
+            raise
+        except Exception as e:
+            logger.error("Unexpected error while enrolling application %s: %s", application_id, e)
+            raise
@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+class DashboardService(ABC):
+
+    @abstractmethod
+    def admissions_summary(self, scheduled_program_id: Optional[int] = None, days: Optional[int] = None) -> dict:
+        pass
+
+    @abstractmethod
+    def rebuild_statistics(self) -> int:
+        pass
@@ -0,0 +1,101 @@
+import logging
+from collections import Counter, defaultdict
+from datetime import timedelta
+from typing import Optional
+from django.conf import settings
+from django.utils import timezone
+from programms.models import Programs_Scheduled
+from .dashboard import DashboardService
+from . import admissions_stats
+from ..models import ApplicationStats, InterviewDayLoad
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardServiceImpl(DashboardService):
+    """
+    Admissions dashboard served from the ApplicationStats / InterviewDayLoad summary tables.
+
+    The work is bounded by programs x statuses and by the number of days shown,
+    never by the number of applications.
+    """
+
+    def admissions_summary(self, scheduled_program_id: Optional[int] = None, days: Optional[int] = None) -> dict:
+        """
+        Applications per program and status, their mark summary and the upcoming interview-day load.
+
+        :param scheduled_program_id: Restrict the program figures to one scheduled program;
+            the interview-day load always covers every program.
+        :param days: Interview days to show from today (defaults to ADMISSIONS_DASHBOARD_DAYS).
+        """
+        days = days or getattr(settings, 'ADMISSIONS_DASHBOARD_DAYS', 30)
+        try:
+            rows = ApplicationStats.objects.filter(applications__gt=0)
+            if scheduled_program_id is not None:
+                rows = rows.filter(Scheduled_program_id=scheduled_program_id)
+
+            by_program = defaultdict(dict)
+            counts, marks_totals = Counter(), Counter()
+            for row in rows.order_by('Scheduled_program_id', 'Status'):
+                by_program[row.Scheduled_program_id][row.Status] = {
+                    'applications': row.applications,
+                    'mean': row.marks_total / row.applications,
+                    'median': row.marks_median,
+                    'min': row.marks_min,
+                    'max': row.marks_max,
+                }
+                counts[row.Status] += row.applications
+                marks_totals[row.Status] += row.marks_total
+
+            names = Programs_Scheduled.objects.in_bulk(list(by_program))
+            programs = [
+                {
+                    'Scheduled_program_id': program_id,
+                    'ProgramName': names[program_id].ProgramName if program_id in names else None,
+                    'Location': names[program_id].Location if program_id in names else None,
+                    'applications': sum(status['applications'] for status in by_status.values()),
+                    'by_status': by_status,
+                }
+                for program_id, by_status in by_program.items()
+            ]
+
+            today = timezone.localdate()
+            load = dict(
+                InterviewDayLoad.objects.filter(
+                    Date_Of_Interview__gte=today, Date_Of_Interview__lt=today + timedelta(days=days),
+                    applications__gt=0,
+                ).values_list('Date_Of_Interview', 'applications')
+            )
+            interview_load = [
+                {'date': today + timedelta(days=offset), 'interviews': load.get(today + timedelta(days=offset), 0)}
+                for offset in range(days)
+            ]
+            total = sum(counts.values())
+            return {
+                'generated_at': timezone.now(),
+                'totals': {
+                    'applications': total,
+                    'mean': sum(marks_totals.values()) / total if total else None,
+                    'by_status': {
+                        status: {'applications': n, 'mean': marks_totals[status] / n}
+                        for status, n in sorted(counts.items())
+                    },
+                },
+                'programs': programs,
+                'interview_load': interview_load,
+            }
+        except Exception as e:
+            logger.error("Unexpected error while building the admissions dashboard: %s", e)
+            raise
+
+    def rebuild_statistics(self) -> int:
+        """
+        Recompute the summary tables from Application.
+
+        :return: Number of ApplicationStats rows written.
+        """
+        try:
+            return admissions_stats.rebuild()
+        except Exception as e:
+            logger.error("Unexpected error while rebuilding admissions statistics: %s", e)
+            raise
@@ -0,0 +1,180 @@
+"""
+Interview day assignment for applications in INTERVIEW status.
+
+Every applicant has a window of days they can be interviewed on: the
+planning horizon, narrowed by their own availability when given and closed
+the day before their scheduled program starts. Every day has a panel
+capacity (zero on days outside ADMISSIONS_INTERVIEW_WEEKDAYS).
+
+The solver is greedy: applicants are taken by program priority (highest
+first), then by the last day of their window (earliest first), then by marks,
+and each gets the earliest day of its window that still has a free seat.
+Within one priority level, placing the tightest deadlines first is the
+earliest-deadline-first rule, which fits as many unit-length interviews as
+any assignment can. "Earliest day with a free seat at or after i" is a
+disjoint-set lookup whose sets are merged as days fill up, so planning costs
+one sort plus near-constant work per applicant.
+"""
+import logging
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Count
+from django.utils import timezone
+from programms.models import Programs_Scheduled
+from ..models import Application
+
+logger = logging.getLogger(__name__)
+
+
+def solve(applicants: Iterable[tuple], capacity: List[int]) -> Dict[int, int]:
+    """
+    Assign days to applicants.
+
+    :param applicants: (application_id, priority, first_day, last_day, marks) tuples, days being
+        indexes into `capacity`.
+    :param capacity: Free seats per day.
+    :return: Mapping of application id to day index; applicants that did not fit are left out.
+    """
+    remaining = list(capacity)
+    days = len(remaining)
+    # next_free[i] leads to the first day >= i with a free seat; index `days` means none is left
+    next_free = list(range(days + 1))
+    for day, seats in enumerate(remaining):
+        if seats <= 0:
+            next_free[day] = day + 1
+
+    def find(day):
+        root = day
+        while next_free[root] != root:
+            root = next_free[root]
+        while next_free[day] != root:
+            next_free[day], day = root, next_free[day]
+        return root
+
+    assigned = {}
+    for application_id, _, first, last, _ in sorted(
+        applicants, key=lambda applicant: (-applicant[1], applicant[3], -applicant[4], applicant[0])
+    ):
+        first, last = max(first, 0), min(last, days - 1)
+        if first > last:
+            continue
+        day = find(first)
+        if day > last:
+            continue
+        assigned[application_id] = day
+        remaining[day] -= 1
+        if not remaining[day]:
+            next_free[day] = day + 1
+    return assigned
+
+
+def day_capacity(start: date, days: int, capacity: Union[int, Dict[date, int], None] = None) -> List[int]:
+    """
+    Seats per day of the horizon: `capacity` (or ADMISSIONS_INTERVIEW_DAILY_CAPACITY) on every
+    ADMISSIONS_INTERVIEW_WEEKDAYS day and none on the others; a mapping of date to seats overrides
+    single dates instead.
+    """
+    default = getattr(settings, 'ADMISSIONS_INTERVIEW_DAILY_CAPACITY', 40)
+    weekdays = set(getattr(settings, 'ADMISSIONS_INTERVIEW_WEEKDAYS', (0, 1, 2, 3, 4)))
+    overrides = {}
+    if isinstance(capacity, int):
+        default = capacity
+    elif capacity:
+        overrides = capacity
+    seats = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        seats.append(overrides.get(day, default if day.weekday() in weekdays else 0))
+    if any(n < 0 for n in seats):
+        raise ValidationError("Daily interview capacity must not be negative.")
+    return seats
+
+
+def plan(start: Optional[date] = None, days: Optional[int] = None,
+         capacity: Union[int, Dict[date, int], None] = None,
+         priorities: Optional[Dict[int, int]] = None,
+         availability: Optional[Dict[int, Tuple[date, date]]] = None,
+         scheduled_program_id: Optional[int] = None) -> dict:
+    """
+    Plan interview days for the INTERVIEW applications in scope, without writing anything.
+
+    Seats already taken by INTERVIEW applications outside the scope are not handed out again.
+    Unscheduled applicants keep their stored date; those whose date lies within the horizon sit
+    on a day that is already full and are reported as overbooked.
+
+    :return: {'horizon': (first day, last day), 'assignments': {application id: date}, 'changed': the
+        assignments differing from the stored date, 'unscheduled': [application ids], 'overbooked':
+        [unscheduled application ids stored within the horizon], 'load': {date: interviews} as it
+        will be stored}
+    """
+    start = start or timezone.localdate() + timedelta(days=1)
+    if days is None:
+        days = getattr(settings, 'ADMISSIONS_INTERVIEW_HORIZON_DAYS', 28)
+    if days < 1:
+        raise ValidationError("The horizon must be at least one day.")
+    end = start + timedelta(days=days - 1)
+    seats = day_capacity(start, days, capacity)
+    priorities = priorities or {}
+    availability = availability or {}
+
+    applications = Application.objects.filter(Status=Application.STATUS_INTERVIEW)
+    load = Counter()
+    if scheduled_program_id is not None:
+        load.update(dict(stored_load(start, end, applications.exclude(Scheduled_program_id=scheduled_program_id))))
+        for interview_date, n in load.items():
+            index = (interview_date - start).days
+            seats[index] = max(seats[index] - n, 0)
+        applications = applications.filter(Scheduled_program_id=scheduled_program_id)
+
+    rows = list(applications.order_by().values_list(
+        'Application_id', 'Scheduled_program_id', 'Marks_obtained', 'Date_Of_Interview'
+    ))
+    program_starts = dict(
+        Programs_Scheduled.objects.filter(pk__in={row[1] for row in rows}).values_list('pk', 'Start_Date')
+    )
+    applicants = []
+    for application_id, program_id, marks, _ in rows:
+        earliest, latest = availability.get(application_id, (start, end))
+        latest = min(latest, program_starts[program_id] - timedelta(days=1))
+        applicants.append((
+            application_id, priorities.get(program_id, 0), (earliest - start).days, (latest - start).days, marks,
+        ))
+
+    assigned = solve(applicants, seats)
+    stored = {row[0]: row[3] for row in rows}
+    assignments = {application_id: start + timedelta(days=day) for application_id, day in assigned.items()}
+    unscheduled = sorted(application_id for application_id in stored if application_id not in assigned)
+    overbooked = [application_id for application_id in unscheduled if start <= stored[application_id] <= end]
+    load.update(assignments.values())
+    load.update(stored[application_id] for application_id in overbooked)
+    logger.info("Planned %s of %s interviews over %s day(s) from %s",
+                len(assignments), len(rows), days, start)
+    if overbooked:
+        logger.warning("%s unscheduled interview(s) stay on full days between %s and %s", len(overbooked), start, end)
+    return {
+        'horizon': (start, end),
+        'assignments': assignments,
+        'changed': {
+            application_id: day for application_id, day in assignments.items() if stored[application_id] != day
+        },
+        'unscheduled': unscheduled,
+        'overbooked': overbooked,
+        'load': dict(sorted(load.items())),
+    }
+
+
+def stored_load(start: date, end: date, applications=None) -> List[Tuple[date, int]]:
+    """
+    Stored interviews per day between `start` and `end`, of all INTERVIEW applications by default.
+    """
+    if applications is None:
+        applications = Application.objects.filter(Status=Application.STATUS_INTERVIEW)
+    return list(
+        applications.filter(Date_Of_Interview__range=(start, end))
+        .order_by('Date_Of_Interview')
+        .values_list('Date_Of_Interview')
+        .annotate(n=Count('pk'))
+    )
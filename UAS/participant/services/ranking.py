@@ -0,0 +1,9 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Union
+
+class RankingService(ABC):
+
+    @abstractmethod
+    def rank_applications(self, seats: Union[int, Dict[int, int], None] = None,
+                          scheduled_program_id: Optional[int] = None) -> Dict[int, dict]:
+        pass
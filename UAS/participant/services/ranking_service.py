@@ -0,0 +1,132 @@
+import logging
+from typing import Dict, List, Optional, Union
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from .ranking import RankingService
+from ..models import Application
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (25, 50, 75, 90)
+
+
+def percentile(ascending: List[int], q: float) -> Optional[float]:
+    """
+    Linearly interpolated percentile of an already sorted list (same definition as numpy's default).
+    """
+    if not ascending:
+        return None
+    position = (len(ascending) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ascending) - 1)
+    return ascending[lower] + (ascending[upper] - ascending[lower]) * (position - lower)
+
+
+class RankingServiceImpl(RankingService):
+    """
+    Ranks applications within each scheduled program by Marks_obtained.
+
+    Ranks are computed by the database with a ROW_NUMBER() window and written
+    back by a single UPDATE ... FROM statement, so no model instances are
+    loaded. Cutoffs and statistics are then derived from one ordered pass over
+    (program, marks) tuples.
+    """
+
+    def rank_applications(self, seats: Union[int, Dict[int, int], None] = None,
+                          scheduled_program_id: Optional[int] = None) -> Dict[int, dict]:
+        """
+        Recompute Application.Rank and return per-program cutoffs and statistics.
+
+        Ties on marks are broken by Date_of_birth (older applicant first), then
+        by Application_id. Rejected applications are not ranked.
+
+        :param seats: Seats per program, either one number for all programs or a mapping of
+                      scheduled program id to seats. Defaults to ADMISSIONS_DEFAULT_SEATS.
+        :param scheduled_program_id: Restrict ranking to one scheduled program.
+        :return: Mapping of scheduled program id to a dictionary of statistics.
+        """
+        default_seats = getattr(settings, 'ADMISSIONS_DEFAULT_SEATS', 30)
+        if seats is None:
+            seats = default_seats
+        seats_for = (lambda program_id: seats.get(program_id, default_seats)) if isinstance(seats, dict) \
+            else (lambda program_id: seats)
+
+        applications = Application.objects.all()
+        if scheduled_program_id is not None:
+            applications = applications.filter(Scheduled_program_id=scheduled_program_id)
+
+        try:
+            with transaction.atomic():
+                applications.filter(Status=Application.STATUS_REJECTED).update(Rank=None)
+                self._write_ranks(applications.exclude(Status=Application.STATUS_REJECTED))
+            statistics = self._statistics(applications.exclude(Rank=None), seats_for)
+            logger.info("Ranked applications for %s scheduled program(s)", len(statistics))
+            return statistics
+        except Exception as e:
+            logger.error("Unexpected error while ranking applications: %s", e)
+            raise
+
+    def _write_ranks(self, applications):
+        ranked = applications.annotate(
+            new_rank=Window(
+                RowNumber(),
+                partition_by=[F('Scheduled_program_id')],
+                order_by=[F('Marks_obtained').desc(), F('Date_of_birth').asc(), F('Application_id').asc()],
+            )
+        ).values('Application_id', 'new_rank')
+
+        if connection.vendor in ('postgresql', 'sqlite'):
+            sql, params = ranked.query.sql_with_params()
+            qn = connection.ops.quote_name
+            table = qn(Application._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'UPDATE {table} SET {qn("Rank")} = ranked.new_rank FROM ({sql}) AS ranked '
+                    f'WHERE {table}.{qn("Application_id")} = ranked.{qn("Application_id")}',
+                    params,
+                )
+            return
+
+        batch_size = getattr(settings, 'ADMISSIONS_BATCH_SIZE', 1000)
+        Application.objects.bulk_update(
+            [Application(Application_id=row['Application_id'], Rank=row['new_rank']) for row in ranked.iterator()],
+            ['Rank'],
+            batch_size=batch_size,
+        )
+
+    def _statistics(self, applications, seats_for):
+        statistics = {}
+        rows = (
+            applications.order_by('Scheduled_program_id', 'Rank')
+            .values_list('Scheduled_program_id', 'Marks_obtained')
+            .iterator(chunk_size=getattr(settings, 'EXPORT_CHUNK_SIZE', 2000))
+        )
+
+        current, marks = None, []
+        for program_id, mark in rows:
+            if program_id != current:
+                if current is not None:
+                    statistics[current] = self._summarize(marks, seats_for(current))
+                current, marks = program_id, []
+            marks.append(mark)
+        if current is not None:
+            statistics[current] = self._summarize(marks, seats_for(current))
+        return statistics
+
+    def _summarize(self, marks_by_rank: List[int], seats: int) -> dict:
+        selected = min(seats, len(marks_by_rank))
+        ascending = marks_by_rank[::-1]
+        summary = {
+            'applicants': len(marks_by_rank),
+            'seats': seats,
+            'selected': selected,
+            'cutoff_marks': marks_by_rank[selected - 1] if selected else None,
+            'mean': sum(marks_by_rank) / len(marks_by_rank),
+            'min': ascending[0],
+            'max': ascending[-1],
+        }
+        for q in PERCENTILES:
+            summary[f'p{q}'] = percentile(ascending, q)
+        return summary
@@ -0,0 +1,54 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from programms.models import Programs_Scheduled
+from .models import STATS_FIELDS, Application, Participant
+from .services import admissions_stats
+
+
+# The admissions service creates participants with bulk_create and counts their seats itself;
+# these keep enrolled_count right for participants saved or deleted one by one (admin, cascades).
+
+@receiver(post_save, sender=Participant)
+def take_seat(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        # Refused by the scheduled_program_not_overbooked constraint when the session is full
+        Programs_Scheduled.objects.filter(pk=instance.Scheduled_program_id).update(
+            enrolled_count=F('enrolled_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Participant)
+def release_seat(sender, instance, **kwargs):
+    Programs_Scheduled.objects.filter(pk=instance.Scheduled_program_id, enrolled_count__gt=0).update(
+        enrolled_count=F('enrolled_count') - 1
+    )
+
+
+# Admissions statistics of applications saved or deleted one by one; bulk writes are
+# counted by ApplicationQuerySet.
+
+def _touches_stats(update_fields):
+    return update_fields is None or not STATS_FIELDS.isdisjoint(update_fields)
+
+
+@receiver(pre_save, sender=Application)
+def remember_stats_key(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not _touches_stats(update_fields):
+        return
+    adding = instance._state.adding or instance.pk is None
+    instance._stats_key = None if adding else admissions_stats.stored_key(instance.pk)
+
+
+@receiver(post_save, sender=Application)
+def count_application(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not _touches_stats(update_fields):
+        return
+    previous = getattr(instance, '_stats_key', None)
+    admissions_stats.apply({admissions_stats.key(instance): 1}, {previous: 1} if previous else None)
+    instance._stats_key = None
+
+
+@receiver(post_delete, sender=Application)
+def uncount_application(sender, instance, **kwargs):
+    admissions_stats.apply({}, {admissions_stats.key(instance): 1})
@@ -1,3 +1,414 @@
-from django.test import TestCase
+import json
+import random
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db.models import ProtectedError
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from programms.models import Programs_Offered, Programs_Scheduled
+from programms.services.programms_service import ProgramServiceImpl
+from .models import Application, ApplicationMarks, ApplicationStats, InterviewDayLoad, Participant
+from .services import admissions_stats
+from .services.application_service import ApplicationServiceImpl
+from .services.admissions_stats import summarize_marks
+from .services.interview_scheduler import solve
+from .services.ranking_service import RankingServiceImpl, percentile
 
-# Create your tests here.
+
+def scheduled_program(**fields):
+    return Programs_Scheduled.objects.create(**{
+        'ProgramName': 'Data Science', 'Location': 'Pune', 'Start_Date': date(2025, 3, 1),
+        'End_Date': date(2025, 6, 30), 'sessions_per_week': 3, **fields,
+    })
+
+
+def application(program, **fields):
+    return Application.objects.create(**{
+        'Full_Name': 'Asha', 'Date_of_birth': date(2000, 1, 1), 'Highest_qualification': 'BSc', 'Goals': 'ML',
+        'Email_id': 'asha@example.com', 'Scheduled_program': program, 'Marks_obtained': 70,
+        'Status': Application.STATUS_PENDING, 'Date_Of_Interview': date(2025, 2, 3), **fields,
+    })
+
+
+class AdmissionsStaffTestCase(TestCase):
+    """
+    Logs in an applicant and a manager account for the admissions views.
+    """
+
+    def setUp(self):
+        users = get_user_model().objects
+        # Run the commit hooks so cached users from earlier tests with the same pk are invalidated.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.applicant = users.create_user(login_id='applicant1', password='x-Pass-123', role='user')
+            self.manager = users.create_user(login_id='manager1', password='x-Pass-123', role='manager')
+
+    def client_for(self, user):
+        client = Client()
+        client.force_login(user)
+        return client
+
+
+class ParticipantExportTests(AdmissionsStaffTestCase):
+
+    def test_staff_only(self):
+        application(scheduled_program(), Full_Name='Ravi')
+        url = '/participant/applications/export/'
+        self.assertEqual(Client().get(url).status_code, 302)
+        self.assertEqual(self.client_for(self.applicant).get(url).status_code, 403)
+
+        response = self.client_for(self.manager).get(url, {'format': 'csv', 'fields': 'Full_Name,Status'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content).decode().splitlines(),
+                         ['Full_Name,Status', 'Ravi,PENDING'])
+
+
+class RosterTests(TestCase):
+
+    def setUp(self):
+        Programs_Offered.objects.create(ProgramName='Data Science', Description='Data', Applicant_eligibility='Any',
+                                        Duration=12, Degree_certificate_offered='Diploma')
+        self.program = scheduled_program()
+        for name in ('Ravi', 'Asha', 'Meera'):
+            application(self.program, Full_Name=name)
+
+    def test_roster_in_one_query(self):
+        with self.assertNumQueries(1):
+            roster = list(Application.objects.roster(self.program.pk))
+            self.assertEqual([row.Full_Name for row in roster], ['Asha', 'Meera', 'Ravi'])
+            self.assertEqual({row.Scheduled_program.Program_offered.Duration for row in roster}, {12})
+
+    def test_scheduled_program_is_protected(self):
+        with self.assertRaises(ProtectedError):
+            self.program.delete()
+        with self.assertRaises(ValidationError):
+            ProgramServiceImpl().bulk_delete('scheduled', [self.program.pk])
+        self.assertTrue(Programs_Scheduled.objects.filter(pk=self.program.pk).exists())
+
+
+class PipelineTests(AdmissionsStaffTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.service = ApplicationServiceImpl()
+        self.program = scheduled_program()
+        self.applications = [application(self.program, Email_id=f'applicant{n}@example.com') for n in range(4)]
+        self.ids = [row.pk for row in self.applications]
+
+    def statuses(self):
+        return list(Application.objects.order_by('pk').values_list('Status', flat=True))
+
+    def test_transition_only_touches_the_expected_status(self):
+        self.assertEqual(self.service.transition_status(self.ids[:2], 'PENDING', 'INTERVIEW'), 2)
+        self.assertEqual(self.service.transition_status(self.ids[1:3], 'PENDING', 'INTERVIEW'), 1)
+        self.assertEqual(self.statuses(), ['INTERVIEW', 'INTERVIEW', 'INTERVIEW', 'PENDING'])
+        with self.assertRaises(ValidationError):
+            self.service.transition_status(self.ids, 'PENDING', 'ACCEPTED')
+
+    def test_interview_dates(self):
+        monday, tuesday = date(2025, 2, 3), date(2025, 2, 4)
+        self.assertEqual(self.service.assign_interview_dates({
+            self.ids[0]: tuesday, self.ids[1]: tuesday, self.ids[2]: monday,
+        }), 3)
+        self.assertEqual(list(Application.objects.order_by('pk').values_list('Date_Of_Interview', flat=True)),
+                         [tuesday, tuesday, monday, monday])
+
+    def test_promotion_continues_roll_numbers(self):
+        Application.objects.filter(pk__in=self.ids[:2]).update(Status='ACCEPTED')
+        self.assertEqual(self.service.promote_accepted(), 2)
+        Application.objects.filter(pk=self.ids[2]).update(Status='ACCEPTED')
+        self.assertEqual(self.service.promote_accepted(self.program.pk), 1)
+        self.assertEqual(self.service.promote_accepted(), 0)
+        self.assertEqual(list(Participant.objects.order_by('Roll_no').values_list('Roll_no', 'Application_id')),
+                         [(1, self.ids[0]), (2, self.ids[1]), (3, self.ids[2])])
+
+    def test_endpoint(self):
+        url = '/participant/applications/pipeline/'
+        body = {'action': 'transition', 'application_ids': self.ids, 'from_status': 'PENDING', 'to_status': 'REJECTED'}
+        self.assertEqual(self.client_for(self.applicant).post(url, body, content_type='application/json').status_code,
+                         403)
+        response = self.client_for(self.manager).post(url, body, content_type='application/json')
+        self.assertEqual(response.json(), {'message': 'OK', 'updated': 4})
+        response = self.client_for(self.manager).post(url, {'action': 'interview_dates',
+                                                            'assignments': {str(self.ids[0]): 'soon'}},
+                                                      content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class RankingTests(TestCase):
+
+    def test_ranks_and_cutoffs(self):
+        program, other = scheduled_program(), scheduled_program(Location='Delhi')
+        older = application(program, Marks_obtained=80, Date_of_birth=date(1999, 1, 1))
+        younger = application(program, Marks_obtained=80, Date_of_birth=date(2001, 1, 1))
+        best = application(program, Marks_obtained=95)
+        weakest = application(program, Marks_obtained=40)
+        rejected = application(program, Marks_obtained=99, Status=Application.STATUS_REJECTED)
+        alone = application(other, Marks_obtained=60)
+
+        statistics = RankingServiceImpl().rank_applications(seats={program.pk: 2})
+        ranks = dict(Application.objects.values_list('pk', 'Rank'))
+        self.assertEqual([ranks[row.pk] for row in (best, older, younger, weakest, rejected, alone)],
+                         [1, 2, 3, 4, None, 1])
+        self.assertEqual(statistics[program.pk], {
+            'applicants': 4, 'seats': 2, 'selected': 2, 'cutoff_marks': 80, 'mean': 73.75, 'min': 40, 'max': 95,
+            'p25': 70.0, 'p50': 80.0, 'p75': 83.75, 'p90': 90.5,
+        })
+        self.assertEqual(statistics[other.pk]['seats'], 30)
+
+    def test_percentile(self):
+        self.assertIsNone(percentile([], 50))
+        self.assertEqual(percentile([7], 90), 7)
+        self.assertEqual(percentile([10, 20, 30, 40], 50), 25)
+        self.assertEqual(percentile([10, 20, 30, 40], 100), 40)
+
+
+class SeatTests(AdmissionsStaffTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.service = ApplicationServiceImpl()
+        self.program = scheduled_program(capacity=2)
+
+    def accepted(self, n, **fields):
+        return application(self.program, Email_id=f'accepted{n}@example.com', Status=Application.STATUS_ACCEPTED,
+                           **fields)
+
+    def enrolled_count(self):
+        return Programs_Scheduled.objects.values_list('enrolled_count', flat=True).get(pk=self.program.pk)
+
+    def test_reserve_and_release(self):
+        self.assertEqual([self.service.reserve_seats(self.program.pk) for _ in range(3)], [True, True, False])
+        self.assertTrue(self.service.release_seats(self.program.pk, 2))
+        self.assertFalse(self.service.release_seats(self.program.pk))
+        unlimited = scheduled_program(Location='Delhi')
+        self.assertTrue(self.service.reserve_seats(unlimited.pk, 500))
+        with self.assertRaises(ValidationError):
+            self.service.release_seats(unlimited.pk, 0)
+
+    def test_enrol(self):
+        first, second, third = (self.accepted(n) for n in range(3))
+        self.assertEqual([self.service.enrol(row.pk).Roll_no for row in (first, second)], [1, 2])
+        with self.assertRaises(ValidationError) as raised:
+            self.service.enrol(third.pk)
+        self.assertEqual(raised.exception.code, 'full')
+        with self.assertRaises(ValidationError):
+            self.service.enrol(first.pk)
+        with self.assertRaises(ValidationError):
+            self.service.enrol(application(self.program, Email_id='pending@example.com').pk)
+        self.assertEqual(self.enrolled_count(), 2)
+
+        Participant.objects.get(Roll_no=1).delete()
+        self.assertEqual(self.enrolled_count(), 1)
+
+    def test_endpoint(self):
+        url = '/participant/enrolments/'
+        client = self.client_for(self.manager)
+        rows = [self.accepted(n) for n in range(3)]
+        responses = [client.post(url, json.dumps({'application_id': row.pk}), content_type='application/json')
+                     for row in rows]
+        self.assertEqual([response.status_code for response in responses], [201, 201, 409])
+        self.assertEqual(responses[1].json()['Roll_no'], 2)
+        self.assertEqual(client.post(url, '{}', content_type='application/json').status_code, 400)
+
+    def test_promotion_fills_free_seats_best_rank_first(self):
+        rows = [self.accepted(n, Marks_obtained=marks) for n, marks in enumerate([50, 90, 70])]
+        RankingServiceImpl().rank_applications()
+        self.assertEqual(self.service.promote_accepted(self.program.pk), 2)
+        self.assertEqual(sorted(Participant.objects.values_list('Application_id', flat=True)), [rows[1].pk, rows[2].pk])
+        self.assertEqual(self.enrolled_count(), 2)
+        self.assertEqual(self.service.promote_accepted(self.program.pk), 0)
+
+    def test_capacity_cannot_drop_below_enrolment(self):
+        for n in range(2):
+            self.service.enrol(self.accepted(n).pk)
+        item = {'Scheduled_program_id': self.program.pk, 'ProgramName': 'Data Science', 'Location': 'Pune',
+                'Start_Date': '2025-03-01', 'End_Date': '2025-06-30', 'sessions_per_week': 3}
+        results = ProgramServiceImpl().bulk_upsert_scheduled_programs([dict(item, capacity=1)])
+        self.assertEqual(results[0]['errors'], {'capacity': ['Capacity cannot drop below the 2 seats already taken.']})
+        response = self.client.put(f'/programms/scheduled/{self.program.pk}/', json.dumps({'capacity': 1}),
+                                   content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        results = ProgramServiceImpl().bulk_upsert_scheduled_programs([dict(item, capacity=5)])
+        self.assertEqual(results[0]['status'], 'upserted')
+        self.assertEqual(Programs_Scheduled.objects.get(pk=self.program.pk).capacity, 5)
+
+
+class SummarizeMarksTests(SimpleTestCase):
+
+    def test_empty(self):
+        empty = {'marks_median': None, 'marks_min': None, 'marks_max': None}
+        self.assertEqual(summarize_marks({}), empty)
+        self.assertEqual(summarize_marks({50: 0}), empty)
+
+    def test_odd_and_even_totals(self):
+        self.assertEqual(summarize_marks({70: 1}), {'marks_median': 70, 'marks_min': 70, 'marks_max': 70})
+        self.assertEqual(summarize_marks({40: 1, 60: 1, 90: 1}),
+                         {'marks_median': 60, 'marks_min': 40, 'marks_max': 90})
+        self.assertEqual(summarize_marks({40: 1, 60: 1}), {'marks_median': 50, 'marks_min': 40, 'marks_max': 60})
+        self.assertEqual(summarize_marks({40: 2, 60: 2, 80: 0})['marks_max'], 60)
+
+    def test_matches_sorted_list(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            histogram = {mark: rng.randint(0, 4) for mark in rng.sample(range(101), rng.randint(1, 8))}
+            marks = sorted(mark for mark, n in histogram.items() for _ in range(n))
+            if not marks:
+                continue
+            middle = len(marks) // 2
+            median = marks[middle] if len(marks) % 2 else (marks[middle - 1] + marks[middle]) / 2
+            self.assertEqual(summarize_marks(histogram),
+                             {'marks_median': median, 'marks_min': marks[0], 'marks_max': marks[-1]})
+
+
+class ApplyTests(TestCase):
+
+    def setUp(self):
+        self.program = Programs_Scheduled.objects.create(
+            ProgramName='Data Science', Location='Pune', Start_Date=date(2025, 3, 1), End_Date=date(2025, 6, 30),
+            sessions_per_week=3,
+        ).pk
+
+    def stats(self, status):
+        return ApplicationStats.objects.filter(Scheduled_program_id=self.program, Status=status).values(
+            'applications', 'marks_total', 'marks_median', 'marks_min', 'marks_max'
+        ).first()
+
+    def load(self):
+        return dict(InterviewDayLoad.objects.filter(applications__gt=0).values_list('Date_Of_Interview', 'applications'))
+
+    def test_counts_and_moves(self):
+        day, monday, tuesday = date(2025, 1, 1), date(2025, 2, 3), date(2025, 2, 4)
+        admissions_stats.apply({(self.program, 'PENDING', 60, day): 2, (self.program, 'PENDING', 80, day): 1})
+        self.assertEqual(self.stats('PENDING'), {
+            'applications': 3, 'marks_total': 200, 'marks_median': 60, 'marks_min': 60, 'marks_max': 80,
+        })
+        self.assertEqual(self.load(), {})
+
+        admissions_stats.apply({(self.program, 'INTERVIEW', 80, monday): 1}, {(self.program, 'PENDING', 80, day): 1})
+        self.assertEqual(self.stats('PENDING'), {
+            'applications': 2, 'marks_total': 120, 'marks_median': 60, 'marks_min': 60, 'marks_max': 60,
+        })
+        self.assertEqual(self.stats('INTERVIEW')['applications'], 1)
+        self.assertEqual(self.load(), {monday: 1})
+
+        # Rescheduling only moves the day load
+        admissions_stats.apply({(self.program, 'INTERVIEW', 80, tuesday): 1},
+                               {(self.program, 'INTERVIEW', 80, monday): 1})
+        self.assertEqual(self.stats('INTERVIEW')['applications'], 1)
+        self.assertEqual(self.load(), {tuesday: 1})
+
+        admissions_stats.apply({}, {(self.program, 'INTERVIEW', 80, tuesday): 1})
+        self.assertEqual(self.stats('INTERVIEW'), {
+            'applications': 0, 'marks_total': 0, 'marks_median': None, 'marks_min': None, 'marks_max': None,
+        })
+        self.assertFalse(ApplicationMarks.objects.filter(Status='INTERVIEW', applications__gt=0).exists())
+
+    def test_no_change_writes_nothing(self):
+        unchanged = {(self.program, 'PENDING', 60, date(2025, 1, 1)): 1}
+        with self.assertNumQueries(0):
+            admissions_stats.apply(unchanged, unchanged)
+
+    def test_signals_keep_tables_in_step(self):
+        fields = {
+            'Full_Name': 'Asha', 'Date_of_birth': date(2000, 1, 1), 'Highest_qualification': 'BSc', 'Goals': 'ML',
+            'Email_id': 'asha@example.com', 'Scheduled_program_id': self.program, 'Status': 'PENDING',
+            'Date_Of_Interview': date(2025, 2, 3),
+        }
+        first = Application.objects.create(Marks_obtained=70, **fields)
+        Application.objects.create(Marks_obtained=90, **fields)
+        first.Status = 'INTERVIEW'
+        first.save()
+        Application.objects.filter(Marks_obtained=90).update(Status='REJECTED')
+        self.assertEqual(admissions_stats.drift(), 0)
+        self.assertEqual(self.stats('INTERVIEW')['marks_median'], 70)
+        self.assertEqual(self.stats('REJECTED')['applications'], 1)
+        self.assertEqual(self.load(), {date(2025, 2, 3): 1})
+
+        counted = {status: self.stats(status) for status in ('PENDING', 'INTERVIEW', 'REJECTED')}
+        admissions_stats.rebuild()
+        for status, stats in counted.items():
+            if stats['applications']:
+                self.assertEqual(self.stats(status), stats)
+        self.assertEqual(self.load(), {date(2025, 2, 3): 1})
+
+    @override_settings(ADMISSIONS_BATCH_SIZE=2)
+    def test_update_applies_to_the_locked_snapshot(self):
+        program = Programs_Scheduled.objects.get(pk=self.program)
+        for n in range(5):
+            application(program, Email_id=f'applicant{n}@example.com', Marks_obtained=60 + n)
+        self.assertEqual(Application.objects.filter(Status='PENDING').update(Status='INTERVIEW'), 5)
+        self.assertEqual(self.stats('INTERVIEW')['applications'], 5)
+        self.assertEqual(self.stats('PENDING')['applications'], 0)
+        self.assertEqual(admissions_stats.drift(), 0)
+
+
+class DashboardTests(AdmissionsStaffTestCase):
+    url = '/participant/dashboard/'
+
+    def test_admissions_staff_only(self):
+        self.assertEqual(Client().get(self.url).status_code, 302)
+        response = self.client_for(self.applicant).get(self.url)
+        self.assertEqual((response.status_code, response.json()), (403, {'error': 'Admissions staff only'}))
+        self.assertEqual(self.client_for(self.manager).get(self.url).status_code, 200)
+
+    def test_parameters(self):
+        client = self.client_for(self.manager)
+        program = scheduled_program()
+        application(program)
+        self.assertEqual(client.get(self.url, {'program': program.pk, 'days': 7}).status_code, 200)
+        self.assertEqual(client.get(self.url, {'days': 0}).status_code, 400)
+        self.assertEqual(client.get(self.url, {'program': 'x'}).status_code, 400)
+
+
+class SolveTests(SimpleTestCase):
+
+    def test_earliest_deadline_first(self):
+        # The tighter window is placed first, so both fit
+        applicants = [(1, 0, 0, 1, 50), (2, 0, 0, 0, 50)]
+        self.assertEqual(solve(applicants, [1, 1]), {2: 0, 1: 1})
+
+    def test_priority_and_marks(self):
+        applicants = [(1, 0, 0, 0, 90), (2, 1, 0, 0, 10), (3, 0, 0, 0, 95)]
+        self.assertEqual(solve(applicants, [2]), {2: 0, 3: 0})
+
+    def test_closed_days_and_windows(self):
+        applicants = [(1, 0, 0, 2, 50), (2, 0, 0, 2, 50), (3, 0, 3, 9, 50), (4, 0, 2, 1, 50), (5, 0, -3, -1, 50)]
+        self.assertEqual(solve(applicants, [1, 0, 1, 0]), {1: 0, 2: 2})
+
+    def test_empty(self):
+        self.assertEqual(solve([], [3, 3]), {})
+        self.assertEqual(solve([(1, 0, 0, 0, 50)], []), {})
+
+    def test_maximum_within_one_priority(self):
+        rng = random.Random(11)
+        for _ in range(100):
+            days = rng.randint(1, 6)
+            capacity = [rng.randint(0, 2) for _ in range(days)]
+            applicants = []
+            for application_id in range(rng.randint(0, 10)):
+                first = rng.randint(0, days - 1)
+                applicants.append((application_id, 0, first, rng.randint(first, days - 1), rng.randint(0, 100)))
+            assigned = solve(applicants, capacity)
+
+            windows = {applicant[0]: applicant[2:4] for applicant in applicants}
+            for application_id, day in assigned.items():
+                self.assertTrue(windows[application_id][0] <= day <= windows[application_id][1])
+            for day, seats in enumerate(capacity):
+                self.assertLessEqual(list(assigned.values()).count(day), seats)
+            self.assertEqual(len(assigned), self.max_matching(applicants, capacity))
+
+    @staticmethod
+    def max_matching(applicants, capacity):
+        seats = [(day, seat) for day, n in enumerate(capacity) for seat in range(n)]
+        owner = {}
+
+        def augment(applicant, seen):
+            for seat in seats:
+                if applicant[2] <= seat[0] <= applicant[3] and seat not in seen:
+                    seen.add(seat)
+                    if seat not in owner or augment(owner[seat], seen):
+                        owner[seat] = applicant
+                        return True
+            return False
+
+        return sum(augment(applicant, set()) for applicant in applicants)
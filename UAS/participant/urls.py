@@ -0,0 +1,13 @@
+from django.urls import path
+from .views import ParticipantExportView, ApplicationPipelineView, EnrolmentView, AdmissionsDashboardView
+from .models import Application, Participant
+
+app_name = 'participant'
+
+urlpatterns = [
+    path('applications/pipeline/', ApplicationPipelineView.as_view(), name='application_pipeline'),
+    path('dashboard/', AdmissionsDashboardView.as_view(), name='admissions_dashboard'),
+    path('enrolments/', EnrolmentView.as_view(), name='enrolments'),
+    path('applications/export/', ParticipantExportView.as_view(model=Application), name='export_applications'),
+    path('participants/export/', ParticipantExportView.as_view(model=Participant), name='export_participants'),
+]
@@ -1,3 +1,152 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+from django.utils.dateparse import parse_date
+from django.views import View
+from UAS.exports import export_from_request
+from UAS.serializers import FastJsonResponse
+from .models import Application
+from .services.application_service import ApplicationServiceImpl
+from .services.dashboard_service import DashboardServiceImpl
+import logging
+import json
 
-# Create your views here.
+logger = logging.getLogger(__name__)
+
+# Roles allowed to read and act on admissions data besides staff accounts
+ADMISSIONS_ROLES = ('admin', 'manager')
+
+
+class AdmissionsStaffRequiredMixin(LoginRequiredMixin):
+    """
+    Lets only staff accounts and users with an admissions role (admin, manager) through; applicants get 403.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        user = request.user
+        if user.is_authenticated and not (user.is_staff or getattr(user, 'role', None) in ADMISSIONS_ROLES):
+            logger.error(f"Forbidden: {user} requested {request.path}")
+            return JsonResponse({'error': 'Admissions staff only'}, status=403)
+        return super().dispatch(request, *args, **kwargs)
+
+
+class ParticipantExportView(AdmissionsStaffRequiredMixin, View):
+    """
+    Streams the Application or Participant table as NDJSON or CSV (?format=ndjson|csv&fields=...).
+    """
+    model = None
+
+    def get(self, request, *args, **kwargs):
+        try:
+            return export_from_request(request, self.model.objects.all())
+        except ValidationError as e:
+            return JsonResponse({'error': f"Validation error: {e.messages}"}, status=400)
+        except Exception as e:
+            logger.error(f"Unexpected error while exporting {self.model.__name__}: {e}")
+            return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
+
+
+class ApplicationPipelineView(AdmissionsStaffRequiredMixin, View):
+    """
+    Bulk admissions actions, posted as JSON:
+
+    {"action": "transition", "application_ids": [...], "from_status": "PENDING", "to_status": "INTERVIEW"}
+    {"action": "interview_dates", "assignments": {"<application id>": "YYYY-MM-DD", ...}}
+    {"action": "promote", "scheduled_program_id": 3}
+    """
+
+    def __init__(self, **kwargs):
+        self.service = ApplicationServiceImpl()
+        super().__init__(**kwargs)
+
+    def post(self, request, *args, **kwargs):
+        try:
+            data = json.loads(request.body)
+            action = data.get('action')
+            if action == 'transition':
+                updated = self.service.transition_status(
+                    data.get('application_ids', []), data.get('from_status'), data.get('to_status')
+                )
+            elif action == 'interview_dates':
+                assignments = {}
+                for application_id, value in data.get('assignments', {}).items():
+                    interview_date = parse_date(value or '')
+                    if interview_date is None:
+                        raise ValidationError(f"Invalid interview date for application {application_id}: {value}")
+                    assignments[int(application_id)] = interview_date
+                updated = self.service.assign_interview_dates(assignments)
+            elif action == 'promote':
+                updated = self.service.promote_accepted(data.get('scheduled_program_id'))
+            else:
+                return JsonResponse({'error': f"Unknown action '{action}'"}, status=400)
+            return JsonResponse({'message': 'OK', 'updated': updated}, status=200)
+        except (json.JSONDecodeError, ValueError):
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        except ValidationError as e:
+            return JsonResponse({'error': f"Validation error: {e.messages}"}, status=400)
+        except Exception as e:
+            logger.error(f"Unexpected error during admissions pipeline action: {e}")
+            return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
+
+
+class EnrolmentView(AdmissionsStaffRequiredMixin, View):
+    """
+    Enrol one accepted application, posted as JSON: {"application_id": 42}; admissions staff only.
+
+    Answers 201 with the roll number, or 409 when the scheduled program has no seat left.
+    """
+
+    def __init__(self, **kwargs):
+        self.service = ApplicationServiceImpl()
+        super().__init__(**kwargs)
+
+    def post(self, request, *args, **kwargs):
+        try:
+            data = json.loads(request.body)
+            participant = self.service.enrol(int(data['application_id']))
+            return JsonResponse({
+                'message': 'Enrolled',
+                'Participant_id': participant.pk,
+                'Roll_no': participant.Roll_no,
+                'Scheduled_program_id': participant.Scheduled_program_id,
+            }, status=201)
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+            return JsonResponse({'error': 'Invalid request'}, status=400)
+        except Application.DoesNotExist:
+            return JsonResponse({'error': 'Application not found'}, status=404)
+        except ValidationError as e:
+            status = 409 if e.code == 'full' else 400
+            return JsonResponse({'error': f"Validation error: {e.messages}"}, status=status)
+        except Exception as e:
+            logger.error(f"Unexpected error while enrolling: {e}")
+            return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
+
+
+class AdmissionsDashboardView(AdmissionsStaffRequiredMixin, View):
+    """
+    GET the admissions dashboard as JSON (?program=<scheduled program id>&days=<interview days>); admissions staff only.
+    """
+
+    def __init__(self, **kwargs):
+        self.service = DashboardServiceImpl()
+        super().__init__(**kwargs)
+
+    def get(self, request, *args, **kwargs):
+        try:
+            program = request.GET.get('program')
+            days = request.GET.get('days')
+            max_days = getattr(settings, 'ADMISSIONS_DASHBOARD_MAX_DAYS', 366)
+            if days and not 0 < int(days) <= max_days:
+                raise ValidationError(f"'days' must be between 1 and {max_days}.")
+            return FastJsonResponse(self.service.admissions_summary(
+                scheduled_program_id=int(program) if program else None,
+                days=int(days) if days else None,
+            ))
+        except ValueError:
+            return JsonResponse({'error': "'program' and 'days' must be integers"}, status=400)
+        except ValidationError as e:
+            return JsonResponse({'error': f"Validation error: {e.messages}"}, status=400)
+        except Exception as e:
+            logger.error(f"Unexpected error while serving the admissions dashboard: {e}")
+            return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
@@ -1,6 +1,28 @@
+import logging
 from django.apps import AppConfig
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
 
 
 class ProgrammsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "programms"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        precompile_templates()
+
+
+def precompile_templates():
+    """
+    Load PRECOMPILED_TEMPLATES through every template engine so the cached loader holds them.
+    """
+    from django.template import TemplateDoesNotExist, engines
+
+    for name in getattr(settings, 'PRECOMPILED_TEMPLATES', []):
+        for engine in engines.all():
+            try:
+                engine.get_template(name)
+            except TemplateDoesNotExist:
+                logger.warning("Template %s not found by the %s engine, not precompiled", name, engine.name)
@@ -0,0 +1,121 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from programms.models import Programs_Scheduled
+from programms.services import conflicts, versions
+from programms.services.cache import SCHEDULED
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic sessions inside a transaction that is rolled back afterwards and report the cost "
+        "of overlap lookups, bulk conflict validation and an audit of the seeded locations "
+        "(programms.services.conflicts) against a linear scan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sessions', type=int, default=100_000, help="Scheduled programs to seed.")
+        parser.add_argument('--locations', type=int, default=500, help="Distinct locations they are spread over.")
+        parser.add_argument('--queries', type=int, default=1000, help="Overlap lookups per variant.")
+        parser.add_argument('--bulk', type=int, default=1000, help="Items in the bulk validation run.")
+        parser.add_argument('--batch-size', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        rng = random.Random(11)
+        self.stdout.write(f"Conflict backend: {conflicts.get_backend()} ({connection.vendor})")
+        locations = [f"Bench room {i}" for i in range(options['locations'])]
+        try:
+            with transaction.atomic():
+                self.seed(rng, locations, options['sessions'], options['batch_size'])
+                self.run(rng, locations, options)
+                transaction.set_rollback(True)
+        finally:
+            # Trees built from rolled back rows must not outlive the benchmark
+            conflicts._trees.clear()
+
+    @staticmethod
+    def session(rng):
+        start = date(2026, 1, 1) + timedelta(days=rng.randrange(3 * 365))
+        return start, start + timedelta(days=rng.randint(1, 30))
+
+    @staticmethod
+    def tree_lookup(trees, location, start, end):
+        # A location that drew no seeded session has no tree, and so no overlaps
+        tree = trees.get(location)
+        return tree.overlapping(start, end) if tree is not None else []
+
+    def seed(self, rng, locations, count, batch_size):
+        self.stdout.write(f"Seeding {count} sessions over {len(locations)} locations...")
+        for offset in range(0, count, batch_size):
+            batch = []
+            for _ in range(offset, min(offset + batch_size, count)):
+                start, end = self.session(rng)
+                batch.append(Programs_Scheduled(
+                    ProgramName='Conflict benchmark', Location=rng.choice(locations), Start_Date=start,
+                    End_Date=end, sessions_per_week=1,
+                ))
+            Programs_Scheduled.objects.bulk_create(batch)
+        versions.bump(SCHEDULED)
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE "Programs Scheduled"')
+
+    def run(self, rng, locations, options):
+        rows = list(
+            Programs_Scheduled.objects.filter(Location__in=locations)
+            .values_list('Location', 'Start_Date', 'End_Date', 'pk')
+        )
+        started = time.perf_counter()
+        trees = conflicts.build_trees(rows)
+        self.stdout.write(f"Interval trees for {len(rows)} sessions built in "
+                          f"{(time.perf_counter() - started) * 1000:.1f} ms")
+
+        probes = [(rng.choice(locations), *self.session(rng)) for _ in range(options['queries'])]
+        self.report('linear scan', [
+            self.timed(lambda p=probe: [
+                pk for location, start, end, pk in rows if location == p[0] and start <= p[2] and end >= p[1]
+            ])
+            for probe in probes
+        ])
+        self.report('interval tree lookup', [
+            self.timed(lambda p=probe: self.tree_lookup(trees, *p)) for probe in probes
+        ])
+        self.report(f'conflicts.overlapping ({conflicts.get_backend()}, cached per version)', [
+            self.timed(lambda p=probe: conflicts.overlapping(*p)) for probe in probes
+        ])
+
+        items = []
+        for index in range(options['bulk']):
+            start, end = self.session(rng)
+            items.append((index, Programs_Scheduled(
+                ProgramName='Conflict benchmark', Location=rng.choice(locations), Start_Date=start, End_Date=end,
+                sessions_per_week=1,
+            )))
+        started = time.perf_counter()
+        errors = conflicts.validate_bulk(items)
+        self.stdout.write(self.style.SUCCESS(
+            f"Bulk validation of {len(items)} items: {(time.perf_counter() - started) * 1000:.1f} ms, "
+            f"{len(errors)} conflicting"
+        ))
+
+        started = time.perf_counter()
+        pairs = sum(1 for location in locations for _ in conflicts.audit(location))
+        self.stdout.write(self.style.SUCCESS(
+            f"Audit of the seeded locations: {pairs} overlapping pairs in {time.perf_counter() - started:.2f}s"
+        ))
+
+    def report(self, label, timings):
+        timings = sorted(timings)
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(self.style.SUCCESS(
+            f"{label}: p50 {statistics.median(timings):.3f} ms, p95 {p95:.3f} ms over {len(timings)} lookups"
+        ))
+
+    @staticmethod
+    def timed(run):
+        started = time.perf_counter()
+        run()
+        return (time.perf_counter() - started) * 1000
@@ -0,0 +1,125 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from programms.models import Programs_Offered, Programs_Scheduled
+from programms.services import search, versions
+from programms.services.cache import OFFERED, SCHEDULED
+from programms.services.programms_service import ProgramServiceImpl
+
+SUBJECTS = [
+    'Data Science', 'Web Development', 'Nursing', 'Accounting', 'Mechanical Engineering', 'Graphic Design',
+    'Cyber Security', 'Marketing', 'Psychology', 'Architecture', 'Biotechnology', 'Journalism',
+    'Robotics', 'Hospitality', 'Pharmacy', 'Physiotherapy', 'Logistics', 'Music Production',
+]
+LEVELS = ['Foundation', 'Diploma', 'Advanced', 'Professional', 'Evening', 'Weekend', 'Online', 'Intensive']
+TOPICS = [
+    'machine learning', 'clinical practice', 'financial reporting', 'user experience', 'cloud computing',
+    'supply chain', 'digital media', 'research methods', 'leadership', 'statistics', 'ethics', 'networks',
+]
+ELIGIBILITY = ['Any', 'Graduate', 'High school', 'Science graduate', 'Work experience']
+CAMPUSES = ['North Campus', 'City Centre', 'Riverside', 'Online', 'Harbour', 'Airport Road']
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic programs inside a transaction that is rolled back afterwards and report "
+        "latency of ranked searches with typos (programms.services.search) against the previous "
+        "exact Description lookup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--programs', type=int, default=500_000, help="Programs offered and scheduled to seed.")
+        parser.add_argument('--queries', type=int, default=200, help="Searches per program kind.")
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--keep', action='store_true', help="Commit the seeded rows instead of rolling back.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(7)
+        self.stdout.write(f"Search backend: {search.get_backend()} ({connection.vendor})")
+        try:
+            with transaction.atomic():
+                names = self.seed(rng, options['programs'], options['batch_size'])
+                self.run(rng, names, options['queries'])
+                if not options['keep']:
+                    transaction.set_rollback(True)
+        finally:
+            # Indexes built from rolled back rows must not outlive the benchmark
+            search._indexes.clear()
+
+    def seed(self, rng, count, batch_size):
+        self.stdout.write(f"Seeding {count} programs offered and scheduled...")
+        start = date(2026, 1, 5)
+        names = []
+        for offset in range(0, count, batch_size):
+            offered, scheduled = [], []
+            for i in range(offset, min(offset + batch_size, count)):
+                name = f"{rng.choice(LEVELS)} {rng.choice(SUBJECTS)} {i}"
+                names.append(name)
+                offered.append(Programs_Offered(
+                    ProgramName=name, Description=f"{rng.choice(TOPICS)} and {rng.choice(TOPICS)}"[:50],
+                    Applicant_eligibility=rng.choice(ELIGIBILITY), Duration=rng.randint(1, 48),
+                    Degree_certificate_offered='Certificate',
+                ))
+                scheduled.append(Programs_Scheduled(
+                    ProgramName=name, Location=rng.choice(CAMPUSES), Start_Date=start + timedelta(days=i % 365),
+                    End_Date=start + timedelta(days=i % 365 + 90), sessions_per_week=rng.randint(1, 5),
+                ))
+            Programs_Offered.objects.bulk_create(offered)
+            Programs_Scheduled.objects.bulk_create(scheduled)
+        versions.bump(OFFERED)
+        versions.bump(SCHEDULED)
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE "Programs Offered", "Programs Scheduled"')
+        return names
+
+    def run(self, rng, names, queries):
+        service = ProgramServiceImpl()
+        probes = [rng.choice(names) for _ in range(queries)]
+
+        descriptions = list(Programs_Offered.objects.values_list('Description', flat=True)[:queries])
+        self.report('exact Description lookup (previous search)', [
+            self.timed(lambda d=description: list(Programs_Offered.objects.filter(Description=d)[:20]))
+            for description in descriptions
+        ])
+
+        for kind in (OFFERED, SCHEDULED):
+            started = time.perf_counter()
+            service.search_programs(probes[0], kind=kind, page_size=20)
+            self.stdout.write(f"{kind}: first search (includes any index build) "
+                              f"{(time.perf_counter() - started) * 1000:.1f} ms")
+            self.report(f"{kind}: ranked search, typo in one word", [
+                self.timed(lambda q=self.typo(rng, probe): service.search_programs(q, kind=kind, page_size=20))
+                for probe in probes
+            ])
+            self.report(f"{kind}: ranked search, page 5", [
+                self.timed(lambda q=probe: service.search_programs(q, kind=kind, page=5, page_size=20))
+                for probe in probes[:max(1, queries // 4)]
+            ])
+
+    def report(self, label, timings):
+        timings = sorted(timings)
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(self.style.SUCCESS(
+            f"{label}: p50 {statistics.median(timings):.2f} ms, p95 {p95:.2f} ms over {len(timings)} queries"
+        ))
+
+    @staticmethod
+    def timed(run):
+        started = time.perf_counter()
+        run()
+        return (time.perf_counter() - started) * 1000
+
+    @staticmethod
+    def typo(rng, name):
+        words = name.split()
+        index = rng.randrange(len(words) - 1)
+        word = words[index]
+        if len(word) > 3:
+            position = rng.randrange(1, len(word) - 1)
+            word = word[:position] + word[position + 1:]
+        words[index] = word
+        return ' '.join(words)
@@ -0,0 +1,72 @@
+import datetime
+import json
+import time
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from participant.models import Application
+from participant.serializers import ApplicationSerializer
+from programms.models import Programs_Offered
+from programms.serializers import ProgramsOfferedSerializer
+from UAS import serializers
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rows/s of the model serializers (UAS.serializers) with the previous __dict__ approach. "
+        "Rows are built in memory, so only serialization and encoding are measured."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20000, help="Rows per model.")
+        parser.add_argument('--repeat', type=int, default=5, help="Runs per variant; the best one is reported.")
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        datasets = (
+            (ProgramsOfferedSerializer, [
+                Programs_Offered(ProgramId=i, ProgramName=f'Program {i}', Description='Evening course',
+                                 Applicant_eligibility='Graduate', Duration=12, Degree_certificate_offered='MSc')
+                for i in range(rows)
+            ]),
+            (ApplicationSerializer, [
+                Application(Application_id=i, Full_Name=f'Applicant {i}', Date_of_birth=datetime.date(2000, 1, 1),
+                            Highest_qualification='BSc', Marks_obtained=i % 100, Goals='Research',
+                            Email_id=f'applicant{i}@example.com', Scheduled_program_id=i % 50, Status='PENDING',
+                            Date_Of_Interview=datetime.date(2026, 11, 2), Rank=None)
+                for i in range(rows)
+            ]),
+        )
+
+        self.stdout.write(f"JSON backend: {serializers.JSON_BACKEND}")
+        for serializer, instances in datasets:
+            baseline = self.best(options['repeat'], lambda: self.dict_copy(instances))
+            stdlib = self.best(options['repeat'], lambda: json.dumps(
+                serializer.to_list(instances), cls=DjangoJSONEncoder).encode())
+            fast = self.best(options['repeat'], lambda: serializers.dumps(serializer.to_list(instances)))
+            subset = self.best(options['repeat'], lambda: serializers.dumps(
+                serializer.to_list(instances, fields=serializer.fields[:2])))
+
+            self.stdout.write(serializer.model.__name__)
+            for label, elapsed in (
+                ('__dict__ copy + stdlib', baseline),
+                ('serializer + stdlib', stdlib),
+                (f'serializer + {serializers.JSON_BACKEND}', fast),
+                (f'serializer + {serializers.JSON_BACKEND}, 2 fields', subset),
+            ):
+                self.stdout.write(f"  {label:<34} {rows / elapsed:>12,.0f} rows/s")
+            self.stdout.write(self.style.SUCCESS(f"  Speed-up (all fields): {baseline / fast:.1f}x"))
+
+    @staticmethod
+    def dict_copy(instances):
+        # JsonResponse(program.__dict__) cannot encode _state, so the old approach had to drop it
+        data = [{key: value for key, value in instance.__dict__.items() if key != '_state'} for instance in instances]
+        return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+    @staticmethod
+    def best(repeat, run):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
@@ -0,0 +1,91 @@
+import datetime
+import re
+import time
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.template import Context, engines
+from django.template.engine import Engine
+from django.utils import timezone
+from programms.models import Programs_Offered, Programs_Scheduled
+
+# Strips the {% cache %} wrappers to measure the templates as they were before fragment caching
+CACHE_TAGS = re.compile(r'{%\s*(?:end)?cache\b[^%]*%}')
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark rendering of the catalogue templates: parse + render without any caching, "
+        "the cached loader alone, and the cached loader with cold and warm row fragments."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help="Programs per rendered page.")
+        parser.add_argument('--repeat', type=int, default=5, help="Renders per variant; the best one is reported.")
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        now = timezone.now()
+        pages = (
+            ('programs_offered.html', {'programs_offered': [
+                Programs_Offered(ProgramId=i, ProgramName=f'Program {i}', Description='Evening course',
+                                 Applicant_eligibility='Graduate', Duration=12, Degree_certificate_offered='MSc',
+                                 updated_at=now)
+                for i in range(1, rows + 1)
+            ]}),
+            ('scheduled_programs.html', {'programs_scheduled': [
+                Programs_Scheduled(Scheduled_program_id=i, ProgramName=f'Program {i}', Location='Campus A',
+                                   Start_Date=datetime.date(2026, 1, 5), End_Date=datetime.date(2026, 6, 26),
+                                   sessions_per_week=3, updated_at=now)
+                for i in range(1, rows + 1)
+            ]}),
+            ('program_detail.html', {'program': Programs_Offered(
+                ProgramId=1, ProgramName='Program 1', Description='Evening course', Applicant_eligibility='Graduate',
+                Duration=12, Degree_certificate_offered='MSc', updated_at=now,
+            )}),
+        )
+
+        engine = engines['django'].engine
+        uncached_engine = Engine(
+            dirs=engine.dirs,
+            app_dirs=True,
+            libraries=engine.libraries,
+            builtins=engine.builtins,
+        )
+        fragments = caches['template_fragments']
+        repeat = options['repeat']
+
+        for name, context in pages:
+            source = engine.get_template(name).source
+            plain = uncached_engine.from_string(CACHE_TAGS.sub('', source))
+
+            def no_fragments():
+                # Parse on every request, as the loader did without caching
+                uncached_engine.from_string(CACHE_TAGS.sub('', source)).render(Context(context))
+
+            def cold():
+                fragments.clear()
+                engine.get_template(name).render(Context(context))
+
+            def warm():
+                engine.get_template(name).render(Context(context))
+
+            warm()
+            self.stdout.write(name)
+            results = (
+                ('parse + render, no fragment cache', self.best(repeat, no_fragments)),
+                ('cached loader, no fragment cache', self.best(repeat, lambda: plain.render(Context(context)))),
+                ('cached loader, cold fragments', self.best(repeat, cold)),
+                ('cached loader, warm fragments', self.best(repeat, warm)),
+            )
+            for label, elapsed in results:
+                self.stdout.write(f"  {label:<36} {elapsed * 1000:9.2f} ms")
+            self.stdout.write(self.style.SUCCESS(f"  Speed-up (warm vs uncached): {results[0][1] / results[-1][1]:.1f}x"))
+
+    @staticmethod
+    def best(repeat, run):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
@@ -0,0 +1,103 @@
+import time
+import uuid
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.urls import Resolver404, URLResolver, get_resolver, resolve
+from django.urls.resolvers import RoutePattern
+
+# Sample values for path() converters when building a concrete URL per route
+CONVERTER_SAMPLES = {
+    'int': '1',
+    'str': 'sample',
+    'slug': 'sample',
+    'path': 'sample',
+    'uuid': str(uuid.UUID(int=1)),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark URL resolution and view dispatch for every route of ROOT_URLCONF. "
+        "Dispatch is measured with an OPTIONS request, which goes through View.dispatch "
+        "without running handler code or touching the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000, help="Repetitions per route.")
+        parser.add_argument('--prefix', default='', help="Only benchmark URLs starting with this prefix.")
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        factory = RequestFactory()
+        routes, skipped = self.sample_urls(get_resolver().url_patterns)
+        routes = [(url, name) for url, name in routes if url.startswith('/' + options['prefix'].lstrip('/'))]
+
+        resolve_total = dispatch_total = 0.0
+        dispatched = 0
+        for url, name in routes:
+            try:
+                match = resolve(url)
+            except Resolver404:
+                self.stdout.write(self.style.WARNING(f"{url}: does not resolve, skipped"))
+                continue
+
+            started = time.perf_counter()
+            for _ in range(iterations):
+                resolve(url)
+            resolve_us = (time.perf_counter() - started) * 1e6 / iterations
+            resolve_total += resolve_us
+
+            dispatch_us = None
+            if hasattr(match.func, 'view_class'):
+                request = factory.options(url)
+                request.user = AnonymousUser()
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    match = resolve(url)
+                    match.func(request, *match.args, **match.kwargs)
+                dispatch_us = (time.perf_counter() - started) * 1e6 / iterations
+                dispatch_total += dispatch_us
+                dispatched += 1
+
+            dispatch_text = f"{dispatch_us:8.2f}" if dispatch_us is not None else "       -"
+            self.stdout.write(f"{resolve_us:8.2f} {dispatch_text}  {url}  ({name or match.view_name})")
+
+        if not routes:
+            self.stdout.write(self.style.WARNING("No routes matched."))
+            return
+        self.stdout.write(f"Columns: resolve us, resolve + dispatch us. {len(routes)} routes, "
+                          f"{skipped} regex routes skipped.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Mean resolve: {resolve_total / len(routes):.2f} us per request; "
+            f"mean resolve + dispatch: {dispatch_total / max(dispatched, 1):.2f} us over {dispatched} class-based views"
+        ))
+
+    def sample_urls(self, patterns, prefix='/', namespace=''):
+        """
+        Return ([(url, view name)], skipped) for every path() route, filling converters with samples.
+        """
+        routes, skipped = [], 0
+        for pattern in patterns:
+            if not isinstance(pattern.pattern, RoutePattern):
+                skipped += 1
+                continue
+            route = prefix + self.fill(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                child_namespace = f"{namespace}{pattern.namespace}:" if pattern.namespace else namespace
+                child_routes, child_skipped = self.sample_urls(pattern.url_patterns, route, child_namespace)
+                routes.extend(child_routes)
+                skipped += child_skipped
+            else:
+                routes.append((route, f"{namespace}{pattern.name}" if pattern.name else None))
+        return routes, skipped
+
+    @staticmethod
+    def fill(pattern):
+        route = str(pattern)
+        for name, converter in pattern.converters.items():
+            converter_name = next(key for key, value in CONVERTER_SAMPLES.items()
+                                  if type(converter).__name__.lower().startswith(key))
+            route = route.replace(f"<{converter_name}:{name}>", CONVERTER_SAMPLES[converter_name])
+            route = route.replace(f"<{name}>", CONVERTER_SAMPLES['str'])
+        return route
@@ -0,0 +1,81 @@
+import random
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from django.db import connection
+from participant.models import Application
+from programms.models import Programs_Offered, Programs_Scheduled
+
+STATUSES = ['PENDING', 'INTERVIEW', 'ACCEPTED', 'REJECTED']
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic programs/applications and print the query plan and timing of the hot lookups, "
+        "to check that each of them is answered from an index rather than a sequential scan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000,
+                            help="Rows to seed into each of Programs Offered, Programs Scheduled and Application.")
+        parser.add_argument('--no-seed', action='store_true', help="Reuse rows seeded by a previous run.")
+        parser.add_argument('--batch-size', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        if not options['no_seed']:
+            self.seed(rows, options['batch_size'])
+
+        probe = rows // 2
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE "Programs Offered", "Programs Scheduled", "Application"')
+
+        lookups = {
+            'Programs_Offered by ProgramName': Programs_Offered.objects.filter(ProgramName=f'bench-program-{probe}'),
+            'Programs_Offered by Description': Programs_Offered.objects.filter(Description=f'bench-desc-{probe}'),
+            'Programs_Scheduled by ProgramName': Programs_Scheduled.objects.filter(ProgramName=f'bench-program-{probe}'),
+            'Application by Email_id': Application.objects.filter(Email_id=f'applicant{probe}@example.com'),
+            'Application by program and Status': Application.objects.filter(
+                Scheduled_program_id=Programs_Scheduled.objects.order_by('pk').values_list('pk', flat=True)[0],
+                Status='ACCEPTED',
+            ),
+            'Application by Status (count)': Application.objects.filter(Status='INTERVIEW'),
+        }
+        for label, queryset in lookups.items():
+            started = time.perf_counter()
+            count = queryset.count()
+            elapsed = (time.perf_counter() - started) * 1000
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{label}: {count} row(s) in {elapsed:.2f} ms"))
+            self.stdout.write(queryset.explain())
+
+    def seed(self, rows, batch_size):
+        rng = random.Random(42)
+        start = date(2025, 1, 1)
+        self.stdout.write(f"Seeding {rows} rows per table...")
+        program_ids = []
+        for offset in range(0, rows, batch_size):
+            ids = range(offset, min(offset + batch_size, rows))
+            Programs_Offered.objects.bulk_create([
+                Programs_Offered(
+                    ProgramName=f'bench-program-{i}', Description=f'bench-desc-{i}', Applicant_eligibility='Any',
+                    Duration=rng.randint(1, 48), Degree_certificate_offered='Certificate',
+                ) for i in ids
+            ])
+            scheduled = Programs_Scheduled.objects.bulk_create([
+                Programs_Scheduled(
+                    ProgramName=f'bench-program-{i}', Location=f'Campus {i % 50}',
+                    Start_Date=start + timedelta(days=i % 365), End_Date=start + timedelta(days=i % 365 + 90),
+                    sessions_per_week=rng.randint(1, 5),
+                ) for i in ids
+            ])
+            # Spread applications over the first 1000 sessions, like a real intake.
+            program_ids = program_ids or [program.pk for program in scheduled[:1000]]
+            Application.objects.bulk_create([
+                Application(
+                    Full_Name=f'Applicant {i}', Date_of_birth=date(1990, 1, 1) + timedelta(days=i % 7000),
+                    Highest_qualification='Bachelor', Marks_obtained=rng.randint(0, 100), Goals='Learn',
+                    Email_id=f'applicant{i}@example.com', Scheduled_program_id=program_ids[i % len(program_ids)],
+                    Status=rng.choice(STATUSES), Date_Of_Interview=start + timedelta(days=i % 90),
+                ) for i in ids
+            ])
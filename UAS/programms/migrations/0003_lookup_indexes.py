@@ -0,0 +1,54 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:55
+
+from django.db import migrations, models
+
+
+def check_unique_program_names(apps, schema_editor):
+    """
+    Fail with a readable message instead of an IntegrityError if names are duplicated.
+    """
+    Programs_Offered = apps.get_model("programms", "Programs_Offered")
+    duplicates = list(
+        Programs_Offered.objects.order_by()
+        .values("ProgramName")
+        .annotate(count=models.Count("ProgramId"))
+        .filter(count__gt=1)
+        .values_list("ProgramName", flat=True)
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Cannot make Programs_Offered.ProgramName unique, duplicated names: "
+            + ", ".join(duplicates)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("programms", "0002_alter_programs_offered_duration"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_unique_program_names, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="programs_offered",
+            name="Description",
+            field=models.CharField(
+                db_index=True, max_length=50, verbose_name="Description"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="programs_offered",
+            name="ProgramName",
+            field=models.CharField(
+                max_length=50, unique=True, verbose_name="Program_Name"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="programs_scheduled",
+            name="ProgramName",
+            field=models.CharField(
+                db_index=True, max_length=50, verbose_name="Program Name"
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("programms", "0003_lookup_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="programs_scheduled",
+            name="Program_offered",
+            field=models.ForeignObject(
+                from_fields=("ProgramName",),
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="schedules",
+                to="programms.programs_offered",
+                to_fields=("ProgramName",),
+            ),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:40
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def seed_catalogue_versions(apps, schema_editor):
+    CatalogueVersion = apps.get_model("programms", "CatalogueVersion")
+    for table in ("offered", "scheduled"):
+        CatalogueVersion.objects.get_or_create(table=table)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("programms", "0004_programs_scheduled_program_offered"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="programs_offered",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+                verbose_name="Updated At",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="programs_scheduled",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+                verbose_name="Updated At",
+            ),
+            preserve_default=False,
+        ),
+        migrations.CreateModel(
+            name="CatalogueVersion",
+            fields=[
+                (
+                    "table",
+                    models.CharField(
+                        max_length=20,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Table",
+                    ),
+                ),
+                (
+                    "version",
+                    models.PositiveBigIntegerField(default=0, verbose_name="Version"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Updated At"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Catalogue Version",
+                "verbose_name_plural": "Catalogue Versions",
+                "db_table": "Catalogue Version",
+            },
+        ),
+        migrations.RunPython(seed_catalogue_versions, migrations.RunPython.noop),
+    ]
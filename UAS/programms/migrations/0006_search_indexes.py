@@ -0,0 +1,65 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:20
+
+from django.db import migrations
+
+# Must match programms.services.search.SEARCH_FIELDS / TRIGRAM_FIELDS so the planner uses them.
+SEARCH_FIELDS = {
+    "Programs_Offered": {"ProgramName": "A", "Description": "B", "Applicant_eligibility": "C"},
+    "Programs_Scheduled": {"ProgramName": "A", "Location": "B"},
+}
+SEARCH_INDEXES = {
+    "Programs_Offered": "programs_offered_search_idx",
+    "Programs_Scheduled": "programs_sched_search_idx",
+}
+TRIGRAM_INDEXES = {
+    "Programs_Offered": {
+        "ProgramName": "programs_offered_name_trgm_idx",
+        "Description": "programs_offered_desc_trgm_idx",
+    },
+    "Programs_Scheduled": {
+        "ProgramName": "programs_sched_name_trgm_idx",
+        "Location": "programs_sched_loc_trgm_idx",
+    },
+}
+
+
+def search_indexes():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    for model_name, fields in SEARCH_FIELDS.items():
+        vector = None
+        for field, weight in fields.items():
+            part = SearchVector(field, weight=weight, config="english")
+            vector = part if vector is None else vector + part
+        yield model_name, GinIndex(vector, name=SEARCH_INDEXES[model_name])
+        for field, name in TRIGRAM_INDEXES[model_name].items():
+            yield model_name, GinIndex(fields=[field], opclasses=["gin_trgm_ops"], name=name)
+
+
+def add_search_indexes(apps, schema_editor):
+    """
+    Full-text and trigram GIN indexes; PostgreSQL only, other databases use the Python index.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for model_name, index in search_indexes():
+        schema_editor.add_index(apps.get_model("programms", model_name), index)
+
+
+def remove_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for model_name, index in search_indexes():
+        schema_editor.remove_index(apps.get_model("programms", model_name), index)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("programms", "0005_catalogue_version"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_indexes, remove_search_indexes),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("programms", "0006_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="programs_scheduled",
+            name="capacity",
+            field=models.PositiveIntegerField(
+                blank=True, null=True, verbose_name="Capacity"
+            ),
+        ),
+        migrations.AddField(
+            model_name="programs_scheduled",
+            name="enrolled_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Enrolled Count"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="programs_scheduled",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    ("capacity__isnull", True),
+                    ("enrolled_count__lte", models.F("capacity")),
+                    _connector="OR",
+                ),
+                name="scheduled_program_not_overbooked",
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+# Must match programms.services.conflicts.date_range so the planner uses it.
+PERIOD_INDEX = "programs_sched_period_idx"
+
+
+def period_index():
+    from django.contrib.postgres.fields import DateRangeField
+    from django.contrib.postgres.indexes import GistIndex
+
+    period = models.Func(
+        models.F("Start_Date"),
+        models.F("End_Date"),
+        models.Value("[]"),
+        function="daterange",
+        output_field=DateRangeField(),
+    )
+    return GistIndex(models.F("Location"), period, name=PERIOD_INDEX)
+
+
+def add_period_index(apps, schema_editor):
+    """
+    GiST index over (Location, daterange) for overlap queries; PostgreSQL only, other databases use interval trees.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    # Lets GiST index the plain Location column next to the range
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    schema_editor.add_index(
+        apps.get_model("programms", "Programs_Scheduled"), period_index()
+    )
+
+
+def remove_period_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.remove_index(
+        apps.get_model("programms", "Programs_Scheduled"), period_index()
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("programms", "0007_capacity"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="programs_scheduled",
+            index=models.Index(
+                fields=["Location", "Start_Date"], name="programs_sched_loc_start_idx"
+            ),
+        ),
+        migrations.RunPython(add_period_index, remove_period_index),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 # Create your models here.
@@ -6,16 +7,50 @@ from django.utils.translation import gettext_lazy as _
 class Programs_Scheduled(models.Model):
 
     Scheduled_program_id = models.AutoField(_("Scheduled Program Id"), primary_key=True)
-    ProgramName = models.CharField(_("Program Name"), max_length=50)
+    ProgramName = models.CharField(_("Program Name"), max_length=50, db_index=True)
     Location = models.CharField(_("Location"), max_length=50)
     Start_Date = models.DateField(_("Start Date"), auto_now=False, auto_now_add=False)
     End_Date = models.DateField(_("End Date"), auto_now=False, auto_now_add=False)
     sessions_per_week = models.IntegerField(_("Sessions Per Week"))
+    # Seats on offer (no limit when empty) and seats taken; enrolled_count only moves through
+    # the seat reservations of participant.services.application_service, never through save().
+    capacity = models.PositiveIntegerField(_("Capacity"), null=True, blank=True)
+    enrolled_count = models.PositiveIntegerField(_("Enrolled Count"), default=0, editable=False)
+    updated_at = models.DateTimeField(_("Updated At"), auto_now=True)
+    # Virtual relation over ProgramName (no column, no constraint) so schedules
+    # can select_related their offered program in the same query.
+    Program_offered = models.ForeignObject(
+        "Programs_Offered",
+        on_delete=models.DO_NOTHING,
+        from_fields=["ProgramName"],
+        to_fields=["ProgramName"],
+        related_name="schedules",
+        null=True,
+    )
 
     class Meta:
         db_table = 'Programs Scheduled'
         verbose_name = 'Program Scheduled'
         verbose_name_plural = 'Programs Scheduled'
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(capacity__isnull=True) | models.Q(enrolled_count__lte=models.F('capacity')),
+                name='scheduled_program_not_overbooked',
+            ),
+        ]
+        indexes = [
+            # Sessions of one location by date, for conflict checks on databases without GiST
+            models.Index(fields=['Location', 'Start_Date'], name='programs_sched_loc_start_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Editing a session must not write back a stale enrolled_count over concurrent reservations
+        if self.pk is not None and not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'enrolled_count'
+            ]
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return (
@@ -27,11 +62,12 @@ class Programs_Scheduled(models.Model):
 class Programs_Offered(models.Model):
 
     ProgramId = models.AutoField(_("Program Id"), primary_key=True)
-    ProgramName = models.CharField(_("Program_Name"), max_length=50)
-    Description = models.CharField(_("Description"), max_length=50)
+    ProgramName = models.CharField(_("Program_Name"), max_length=50, unique=True)
+    Description = models.CharField(_("Description"), max_length=50, db_index=True)
     Applicant_eligibility = models.CharField(_("Applicant Eligibility"), max_length=30)
     Duration = models.IntegerField(_("Duration"))
     Degree_certificate_offered = models.CharField(_("Degree Certificate Offered"), max_length=20)
+    updated_at = models.DateTimeField(_("Updated At"), auto_now=True)
     
 
     class Meta:
@@ -45,4 +81,23 @@ class Programs_Offered(models.Model):
            f"{self.Degree_certificate_offered}"
        )
 
- 
+
+class CatalogueVersion(models.Model):
+    """
+    Change counter of a catalogue table ('offered' or 'scheduled').
+
+    Bumped on every write to the table, so conditional GETs of the catalogue can be
+    answered from this one row without running the list query.
+    """
+
+    table = models.CharField(_("Table"), max_length=20, primary_key=True)
+    version = models.PositiveBigIntegerField(_("Version"), default=0)
+    updated_at = models.DateTimeField(_("Updated At"), default=timezone.now)
+
+    class Meta:
+        db_table = 'Catalogue Version'
+        verbose_name = 'Catalogue Version'
+        verbose_name_plural = 'Catalogue Versions'
+
+    def __str__(self):
+        return f"{self.table} v{self.version} {self.updated_at}"
@@ -0,0 +1,18 @@
+from UAS.serializers import ModelSerializer
+from .models import Programs_Offered, Programs_Scheduled
+
+
+class ProgramsOfferedSerializer(ModelSerializer):
+    model = Programs_Offered
+    fields = (
+        'ProgramId', 'ProgramName', 'Description', 'Applicant_eligibility', 'Duration',
+        'Degree_certificate_offered', 'updated_at',
+    )
+
+
+class ProgramsScheduledSerializer(ModelSerializer):
+    model = Programs_Scheduled
+    fields = (
+        'Scheduled_program_id', 'ProgramName', 'Location', 'Start_Date', 'End_Date', 'sessions_per_week',
+        'capacity', 'updated_at',
+    )
@@ -0,0 +1,76 @@
+"""
+Read-through caching for ProgramServiceImpl.
+
+Cached results live in the Django cache named by PROGRAMS_CACHE_ALIAS
+(locmem by default, any shared backend in production). Every key embeds
+the CatalogueVersion of its namespace, the same committed row the
+catalogue ETags are built from: a write bumps that row in its own
+transaction, so once it commits no process reads the old entries again,
+and before it commits no other process sees the new version. The writing
+transaction itself bypasses the cache until it commits.
+"""
+import functools
+import hashlib
+import logging
+import threading
+from django.conf import settings
+from django.core.cache import caches
+from . import versions
+
+logger = logging.getLogger(__name__)
+
+OFFERED = 'offered'
+SCHEDULED = 'scheduled'
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+def get_cache():
+    return caches[getattr(settings, 'PROGRAMS_CACHE_ALIAS', 'default')]
+
+
+def _record(namespace, outcome):
+    with _stats_lock:
+        counters = _stats.setdefault(namespace, {'hits': 0, 'misses': 0})
+        counters[outcome] += 1
+
+
+def cache_stats():
+    """
+    Return a snapshot of per-namespace hit/miss counters for this process.
+    """
+    with _stats_lock:
+        return {namespace: dict(counters) for namespace, counters in _stats.items()}
+
+
+def _make_key(namespace, method_name, args, kwargs):
+    raw = repr((args, sorted(kwargs.items())))
+    digest = hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+    # updated_at keeps the keys apart should the version row ever be recreated from 0
+    version, updated_at = versions.current(namespace)
+    return f'programms:{namespace}:v{version}.{updated_at.timestamp():.6f}:{method_name}:{digest}'
+
+
+def cached(namespace):
+    """
+    Cache the decorated service method's result per argument tuple in `namespace`.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if versions.pending(namespace):
+                return method(self, *args, **kwargs)
+            cache = get_cache()
+            key = _make_key(namespace, method.__name__, args, kwargs)
+            result = cache.get(key)
+            if result is not None:
+                _record(namespace, 'hits')
+                return result
+            _record(namespace, 'misses')
+            result = method(self, *args, **kwargs)
+            cache.set(key, result, getattr(settings, 'PROGRAMS_CACHE_TIMEOUT', 300))
+            return result
+        return wrapper
+    return decorator
+
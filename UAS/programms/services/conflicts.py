@@ -0,0 +1,268 @@
+"""
+Timetable conflict detection for scheduled programs.
+
+Two sessions conflict when they share a Location and their closed
+[Start_Date, End_Date] ranges overlap.
+
+On PostgreSQL "what overlaps this range" is answered by the GiST index on
+(Location, daterange(Start_Date, End_Date, '[]')) from migration 0008. Other
+databases (SQLite in tests and local runs) use an in-process interval tree per
+location, rebuilt when the CatalogueVersion of the schedule moves. Bulk writes
+are checked against interval trees of the affected locations built in one
+query, and the whole table is audited with a sweep over sessions ordered by
+location and start date.
+"""
+import heapq
+import logging
+import threading
+from collections import defaultdict
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import DateField, F, Func, Value
+from .cache import SCHEDULED
+from . import versions
+from ..models import Programs_Scheduled
+
+logger = logging.getLogger(__name__)
+
+
+def get_backend():
+    backend = getattr(settings, 'PROGRAMS_CONFLICT_BACKEND', 'auto')
+    if backend == 'auto':
+        return 'postgresql' if connection.vendor == 'postgresql' else 'python'
+    return backend
+
+
+def date_range(start, end):
+    """
+    daterange(start, end, '[]'); must stay identical to the expression indexed in migration 0008.
+    """
+    from django.contrib.postgres.fields import DateRangeField
+
+    return Func(start, end, Value('[]'), function='daterange', output_field=DateRangeField())
+
+
+class _Node:
+    __slots__ = ('center', 'by_start', 'by_end', 'left', 'right')
+
+
+class IntervalTree:
+    """
+    Static centered interval tree over closed (start, end, key) intervals.
+
+    Each node holds the intervals containing its center, sorted by start and by
+    end, and only non-empty nodes are built, so an overlap query visits
+    O(log n) nodes plus the k intervals it reports.
+    """
+
+    def __init__(self, intervals):
+        self.size = len(intervals)
+        self.root = self._build(list(intervals))
+
+    @classmethod
+    def _build(cls, intervals):
+        if not intervals:
+            return None
+        points = sorted(point for start, end, _ in intervals for point in (start, end))
+        center = points[len(points) // 2]
+        left, here, right = [], [], []
+        for interval in intervals:
+            if interval[1] < center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        node = _Node()
+        node.center = center
+        node.by_start = sorted(here, key=lambda interval: interval[0])
+        node.by_end = sorted(here, key=lambda interval: interval[1], reverse=True)
+        node.left = cls._build(left)
+        node.right = cls._build(right)
+        return node
+
+    def overlapping(self, start, end):
+        """
+        Return the keys of all intervals overlapping [start, end].
+        """
+        found = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if end < node.center:
+                for interval in node.by_start:
+                    if interval[0] > end:
+                        break
+                    found.append(interval[2])
+                stack.append(node.left)
+            elif start > node.center:
+                for interval in node.by_end:
+                    if interval[1] < start:
+                        break
+                    found.append(interval[2])
+                stack.append(node.right)
+            else:
+                found.extend(interval[2] for interval in node.by_start)
+                stack.append(node.left)
+                stack.append(node.right)
+        return found
+
+
+def build_trees(rows):
+    """
+    Group (location, start, end, key) rows into one IntervalTree per location.
+    """
+    intervals = defaultdict(list)
+    for location, start, end, key in rows:
+        intervals[location].append((start, end, key))
+    return {location: IntervalTree(items) for location, items in intervals.items()}
+
+
+_trees = {}
+_trees_lock = threading.Lock()
+
+
+def get_tree(location):
+    """
+    Return the interval tree of the sessions at `location`, rebuilt when the schedule version moved.
+    """
+    version, _ = versions.current(SCHEDULED)
+    tree = _trees.get(location)
+    if tree is not None and tree[0] == version:
+        return tree[1]
+    with _trees_lock:
+        if _trees and next(iter(_trees.values()))[0] != version:
+            _trees.clear()
+        tree = _trees.get(location)
+        if tree is None:
+            rows = Programs_Scheduled.objects.filter(Location=location).values_list('Start_Date', 'End_Date', 'pk')
+            tree = (version, IntervalTree(list(rows)))
+            _trees[location] = tree
+    return tree[1]
+
+
+def overlapping(location, start, end, exclude_id=None):
+    """
+    Return the sorted ids of scheduled programs at `location` overlapping [start, end].
+    """
+    if get_backend() == 'postgresql':
+        ids = list(
+            Programs_Scheduled.objects.alias(period=date_range(F('Start_Date'), F('End_Date')))
+            .filter(Location=location, period__overlap=date_range(
+                Value(start, output_field=DateField()), Value(end, output_field=DateField())
+            ))
+            .values_list('pk', flat=True)
+        )
+    else:
+        ids = get_tree(location).overlapping(start, end)
+    return sorted(pk for pk in ids if pk != exclude_id)
+
+
+def lock_locations(locations):
+    """
+    Serialise schedule writes per location until the end of the current transaction (PostgreSQL only),
+    so two sessions checked concurrently cannot both pass and then overlap.
+    """
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        for location in sorted(set(locations)):
+            cursor.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', [f'Programs Scheduled:{location}'])
+
+
+def validate(program):
+    """
+    Raise ValidationError when `program` would overlap another session at its location.
+    """
+    if not getattr(settings, 'PROGRAMS_REJECT_SCHEDULE_CONFLICTS', True):
+        return
+    # Views assign the dates straight from JSON; clean them in place before comparing
+    program.clean_fields(exclude=[
+        field.name for field in program._meta.fields if field.name not in ('Location', 'Start_Date', 'End_Date')
+    ])
+    if program.End_Date < program.Start_Date:
+        raise ValidationError({'End_Date': ["End date must not be before the start date."]})
+    conflicts = overlapping(program.Location, program.Start_Date, program.End_Date, exclude_id=program.pk)
+    if conflicts:
+        raise ValidationError({'Location': [_conflict_message(program, conflicts)]})
+
+
+def validate_bulk(instances):
+    """
+    Check (index, instance) pairs against the stored schedule and against each other.
+
+    Sessions being upserted are checked with their new dates only.
+
+    :return: Error results in the bulk endpoint format, one per conflicting item.
+    """
+    if not getattr(settings, 'PROGRAMS_REJECT_SCHEDULE_CONFLICTS', True) or not instances:
+        return []
+    results = [
+        {'index': index, 'status': 'error', 'errors': {'End_Date': ["End date must not be before the start date."]}}
+        for index, instance in instances if instance.End_Date < instance.Start_Date
+    ]
+    if results:
+        return results
+    locations = {instance.Location for _, instance in instances}
+    replaced = {instance.pk for _, instance in instances if instance.pk is not None}
+    first = min(instance.Start_Date for _, instance in instances)
+    last = max(instance.End_Date for _, instance in instances)
+    stored = build_trees(
+        Programs_Scheduled.objects.filter(Location__in=locations, Start_Date__lte=last, End_Date__gte=first)
+        .exclude(pk__in=replaced)
+        .values_list('Location', 'Start_Date', 'End_Date', 'pk')
+        .iterator(chunk_size=10000)
+    )
+    incoming = build_trees(
+        (instance.Location, instance.Start_Date, instance.End_Date, index) for index, instance in instances
+    )
+
+    for index, instance in instances:
+        messages = []
+        tree = stored.get(instance.Location)
+        conflicts = sorted(tree.overlapping(instance.Start_Date, instance.End_Date)) if tree else []
+        if conflicts:
+            messages.append(_conflict_message(instance, conflicts))
+        others = sorted(
+            other for other in incoming[instance.Location].overlapping(instance.Start_Date, instance.End_Date)
+            if other != index
+        )
+        if others:
+            messages.append(f"Overlaps item(s) {', '.join(map(str, others))} of this request "
+                            f"at {instance.Location}.")
+        if messages:
+            results.append({'index': index, 'status': 'error', 'errors': {'Location': messages}})
+    return results
+
+
+def audit(location=None):
+    """
+    Yield (location, earlier id, later id) for every pair of overlapping sessions.
+
+    Sessions are streamed ordered by location and start date and swept with a
+    heap of the sessions still running, in O(n log n + k).
+    """
+    rows = Programs_Scheduled.objects.order_by('Location', 'Start_Date', 'pk')
+    if location is not None:
+        rows = rows.filter(Location=location)
+    current, running = object(), []
+    for row_location, start, end, pk in rows.values_list(
+        'Location', 'Start_Date', 'End_Date', 'pk'
+    ).iterator(chunk_size=10000):
+        if row_location != current:
+            current, running = row_location, []
+        while running and running[0][0] < start:
+            heapq.heappop(running)
+        for _, other in running:
+            yield row_location, other, pk
+        heapq.heappush(running, (end, pk))
+
+
+def _conflict_message(program, conflicts):
+    shown = ', '.join(map(str, conflicts[:10]))
+    more = f" and {len(conflicts) - 10} more" if len(conflicts) > 10 else ''
+    return (f"Overlaps scheduled program(s) {shown}{more} at {program.Location} "
+            f"between {program.Start_Date} and {program.End_Date}.")
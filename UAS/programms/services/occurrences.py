@@ -0,0 +1,176 @@
+"""
+Session dates of scheduled programs.
+
+A scheduled program only stores Start_Date, End_Date and sessions_per_week.
+Its sessions are spread evenly over every week counted from Start_Date: with
+3 sessions a week they fall 0, 2 and 4 days into each week. At most one
+session is held per day, so more than 7 sessions a week count as 7.
+
+Occurrences are generated lazily, one calendar month at a time, so a
+multi-year window is never held in memory. Each expanded month is cached
+under the schedule's CatalogueVersion: any schedule write moves the version
+and the old months are simply never read again.
+"""
+import hashlib
+import heapq
+import logging
+from collections import namedtuple
+from datetime import timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from .cache import SCHEDULED, _record, get_cache
+from . import versions
+from ..models import Programs_Scheduled
+
+logger = logging.getLogger(__name__)
+
+OCCURRENCES = 'occurrences'
+SCOPES = ('program', 'location')
+
+Occurrence = namedtuple('Occurrence', 'date number Scheduled_program_id ProgramName Location')
+
+
+def session_offsets(sessions_per_week):
+    """
+    Day offsets of the sessions within each week, e.g. (0, 2, 4) for 3 sessions a week.
+    """
+    sessions = min(max(sessions_per_week or 0, 0), 7)
+    return tuple(sorted({(i * 7) // sessions for i in range(sessions)}))
+
+
+def expand(program, window_start, window_end):
+    """
+    Yield the Occurrences of one (pk, ProgramName, Location, Start_Date, End_Date, sessions_per_week) row
+    between window_start and window_end inclusive, in date order.
+    """
+    pk, name, location, start, end, sessions_per_week = program
+    offsets = session_offsets(sessions_per_week)
+    first, last = max(start, window_start), min(end, window_end)
+    if not offsets or first > last:
+        return
+    week = (first - start).days // 7
+    while True:
+        week_start = start + timedelta(weeks=week)
+        for index, offset in enumerate(offsets):
+            day = week_start + timedelta(days=offset)
+            if day > last:
+                return
+            if day >= first:
+                yield Occurrence(day, week * len(offsets) + index + 1, pk, name, location)
+        week += 1
+
+
+def _months(window_start, window_end):
+    month = window_start.replace(day=1)
+    while month <= window_end:
+        following = (month + timedelta(days=32)).replace(day=1)
+        yield month, following - timedelta(days=1)
+        month = following
+
+
+def _expand_month(scope, key, month_start, month_end):
+    programs = Programs_Scheduled.objects.filter(Start_Date__lte=month_end, End_Date__gte=month_start)
+    programs = programs.filter(pk=key) if scope == 'program' else programs.filter(Location=key)
+    rows = programs.order_by('pk').values_list(
+        'pk', 'ProgramName', 'Location', 'Start_Date', 'End_Date', 'sessions_per_week'
+    )
+    return list(heapq.merge(*(expand(row, month_start, month_end) for row in rows)))
+
+
+def occurrences(scope, key, window_start, window_end):
+    """
+    Lazily yield the Occurrences of one scheduled program (scope 'program', key = id) or of every
+    session at a location (scope 'location', key = Location) in the window, ordered by date.
+
+    Being a generator, nothing runs before the first item is requested; call validate() first
+    when errors must surface before a response starts streaming.
+    """
+    cache = get_cache()
+    timeout = getattr(settings, 'PROGRAMS_CACHE_TIMEOUT', 300)
+    version, _ = versions.current(SCHEDULED)
+    # Locations are free text; hash them into a key any cache backend accepts
+    digest = hashlib.md5(f'{scope}:{key}'.encode(), usedforsecurity=False).hexdigest()
+    for month_start, month_end in _months(window_start, window_end):
+        cache_key = f'programms:{OCCURRENCES}:v{version}:{digest}:{month_start:%Y-%m}'
+        month = cache.get(cache_key)
+        if month is None:
+            _record(OCCURRENCES, 'misses')
+            month = _expand_month(scope, key, month_start, month_end)
+            cache.set(cache_key, month, timeout)
+        else:
+            _record(OCCURRENCES, 'hits')
+        for occurrence in month:
+            if window_start <= occurrence.date <= window_end:
+                yield occurrence
+
+
+def validate(scope, window_start, window_end):
+    if scope not in SCOPES:
+        raise ValidationError(f"Unknown scope '{scope}'. Must be one of {list(SCOPES)}.")
+    if window_end < window_start:
+        raise ValidationError("The window must not end before it starts.")
+    max_days = getattr(settings, 'PROGRAMS_OCCURRENCES_MAX_DAYS', 3660)
+    if (window_end - window_start).days >= max_days:
+        raise ValidationError(f"The window may span at most {max_days} days.")
+
+
+def _ical_text(value):
+    return (str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _ical_line(line):
+    # Content lines are folded at 75 octets (RFC 5545 3.1)
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts, limit = [], 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1  # never split a UTF-8 sequence
+        parts.append(encoded[:cut].decode())
+        encoded, limit = encoded[cut:], 74
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def ical_lines(items, name, stamp):
+    """
+    Yield an iCalendar (RFC 5545) feed of `items`, one all-day VEVENT per occurrence.
+    """
+    host = getattr(settings, 'PROGRAMS_ICAL_UID_DOMAIN', 'uas.local')
+    stamp = stamp.astimezone(dt_timezone.utc)
+    yield _ical_line('BEGIN:VCALENDAR')
+    yield _ical_line('VERSION:2.0')
+    yield _ical_line('PRODID:-//UAS//Scheduled programs//EN')
+    yield _ical_line(f'X-WR-CALNAME:{_ical_text(name)}')
+    for occurrence in items:
+        yield ''.join((
+            _ical_line('BEGIN:VEVENT'),
+            _ical_line(f'UID:{occurrence.Scheduled_program_id}-{occurrence.number}@{host}'),
+            _ical_line(f'DTSTAMP:{stamp:%Y%m%dT%H%M%SZ}'),
+            _ical_line(f'DTSTART;VALUE=DATE:{occurrence.date:%Y%m%d}'),
+            _ical_line(f'DTEND;VALUE=DATE:{occurrence.date + timedelta(days=1):%Y%m%d}'),
+            _ical_line(f'SUMMARY:{_ical_text(occurrence.ProgramName)} (session {occurrence.number})'),
+            _ical_line(f'LOCATION:{_ical_text(occurrence.Location)}'),
+            _ical_line('END:VEVENT'),
+        ))
+    yield _ical_line('END:VCALENDAR')
+
+
+def json_chunks(items, dumps):
+    """
+    Yield {"occurrences": [...]} piece by piece, one encoded occurrence at a time.
+    """
+    yield b'{"occurrences":['
+    separator = b''
+    for occurrence in items:
+        yield separator + dumps(occurrence._asdict())
+        separator = b','
+    yield b']}'
+
+
+def default_window():
+    today = timezone.localdate()
+    return today, today + timedelta(days=getattr(settings, 'PROGRAMS_OCCURRENCES_DEFAULT_DAYS', 90))
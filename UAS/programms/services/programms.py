@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List
+from datetime import date
+from typing import Iterable, Iterator, List, Optional, Sequence
 from ..models import Programs_Offered, Programs_Scheduled
 
 class ProgramService(ABC):
@@ -16,10 +17,24 @@ class ProgramService(ABC):
     def delete_program_offered(self, program_name: str):
         pass
 
+    @abstractmethod
+    def get_program_offered(self, program_id: int) -> Programs_Offered:
+        pass
+
     @abstractmethod
     def list_all_programs(self) -> List[Programs_Offered]:
         pass
 
+    @abstractmethod
+    def list_programs_page(self, after: Optional[int] = None, before: Optional[int] = None,
+                           limit: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> dict:
+        pass
+
+    @abstractmethod
+    def search_programs(self, query: str, kind: str = 'offered', page: int = 1,
+                        page_size: Optional[int] = None) -> dict:
+        pass
+
     @abstractmethod
     def create_scheduled_program(self, programs_scheduled: Programs_Scheduled):
         pass
@@ -35,3 +50,28 @@ class ProgramService(ABC):
     @abstractmethod
     def list_all_scheduled_programs(self, program_name: str) -> List[Programs_Scheduled]:
         pass
+
+    @abstractmethod
+    def find_schedule_overlaps(self, location: str, start_date: date, end_date: date,
+                               exclude_id: Optional[int] = None) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def audit_schedule_conflicts(self, location: Optional[str] = None, limit: Optional[int] = 100) -> dict:
+        pass
+
+    @abstractmethod
+    def list_occurrences(self, scope: str, key, start_date: date, end_date: date) -> Iterator:
+        pass
+
+    @abstractmethod
+    def bulk_add_programs_offered(self, items: Sequence[dict]) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def bulk_upsert_scheduled_programs(self, items: Sequence[dict]) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def bulk_delete(self, kind: str, ids: Iterable[int]) -> List[dict]:
+        pass
@@ -1,101 +1,477 @@
 import logging
-from typing import List
+from collections import Counter, defaultdict
+from datetime import date
+from typing import Iterable, Iterator, List, Optional, Sequence
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import transaction
+from django.db.models import ProtectedError
 from .programms import ProgramService
+from .cache import OFFERED, SCHEDULED, cached
+from . import conflicts, occurrences, search, versions
 from ..models import Programs_Offered, Programs_Scheduled
+from ..serializers import ProgramsOfferedSerializer, ProgramsScheduledSerializer
 
 logger = logging.getLogger(__name__)
 
+PROGRAM_OFFERED_FIELDS = (
+    'ProgramId', 'ProgramName', 'Description', 'Applicant_eligibility', 'Duration', 'Degree_certificate_offered',
+)
+PROGRAM_SCHEDULED_FIELDS = (
+    'Scheduled_program_id', 'ProgramName', 'Location', 'Start_Date', 'End_Date', 'sessions_per_week', 'capacity',
+)
+
 class ProgramServiceImpl(ProgramService):
 
     def add_program_offered(self, programs_offered: Programs_Offered):
         try:
-            programs_offered.save()
-            logger.info(f"Program offered added: {programs_offered.ProgramName}")
+            with transaction.atomic():
+                programs_offered.save()
+            logger.info("Program offered added: %s", programs_offered.ProgramName)
         except ValidationError as e:
-            logger.error(f"Validation error while adding program offered: {e}")
+            logger.error("Validation error while adding program offered: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error while adding program offered: {e}")
+            logger.error("Unexpected error while adding program offered: %s", e)
             raise
 
     def update_program_offered(self, programs_offered: Programs_Offered):
         try:
-            programs_offered.save()
-            logger.info(f"Program offered updated: {programs_offered.ProgramName}")
+            with transaction.atomic():
+                programs_offered.save()
+            logger.info("Program offered updated: %s", programs_offered.ProgramName)
         except ObjectDoesNotExist:
-            logger.error(f"Program offered not found: {programs_offered.ProgramId}")
+            logger.error("Program offered not found: %s", programs_offered.ProgramId)
             raise
         except ValidationError as e:
-            logger.error(f"Validation error while updating program offered: {e}")
+            logger.error("Validation error while updating program offered: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error while updating program offered: {e}")
+            logger.error("Unexpected error while updating program offered: %s", e)
             raise
 
     def delete_program_offered(self, program_name: str):
         try:
             program = Programs_Offered.objects.get(ProgramName=program_name)
             program.delete()
-            logger.info(f"Program offered deleted: {program_name}")
+            logger.info("Program offered deleted: %s", program_name)
+        except ObjectDoesNotExist:
+            logger.error("Program offered not found: %s", program_name)
+            raise
+        except Exception as e:
+            logger.error("Unexpected error while deleting program offered: %s", e)
+            raise
+
+    @cached(OFFERED)
+    def get_program_offered(self, program_id: int) -> Programs_Offered:
+        try:
+            program = Programs_Offered.objects.get(pk=program_id)
+            logger.info("Fetched program offered: %s", program_id)
+            return program
         except ObjectDoesNotExist:
-            logger.error(f"Program offered not found: {program_name}")
+            logger.error("Program offered not found: %s", program_id)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error while deleting program offered: {e}")
+            logger.error("Unexpected error while fetching program offered: %s", e)
             raise
 
+    @cached(OFFERED)
     def list_all_programs(self) -> List[Programs_Offered]:
         try:
             programs = Programs_Offered.objects.all()
             logger.info("Listed all programs offered")
             return list(programs)
         except Exception as e:
-            logger.error(f"Unexpected error while listing all programs offered: {e}")
+            logger.error("Unexpected error while listing all programs offered: %s", e)
+            raise
+
+    @cached(OFFERED)
+    def list_programs_page(self, after: Optional[int] = None, before: Optional[int] = None,
+                           limit: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> dict:
+        """
+        Return one keyset-paginated page of programs offered, ordered by ProgramId.
+
+        :param after: Return programs with a ProgramId greater than this cursor.
+        :param before: Return programs with a ProgramId lower than this cursor.
+        :param limit: Page size, capped at PROGRAMS_MAX_PAGE_SIZE.
+        :param fields: Field names to project; ProgramId is always included.
+        :return: Dictionary with 'results' (list of dicts), 'next' and 'prev' cursors.
+        """
+        if after is not None and before is not None:
+            raise ValidationError("Only one of 'after' and 'before' may be given.")
+
+        default_size = getattr(settings, 'PROGRAMS_PAGE_SIZE', 50)
+        max_size = getattr(settings, 'PROGRAMS_MAX_PAGE_SIZE', 200)
+        limit = default_size if limit is None else limit
+        if limit < 1:
+            raise ValidationError("Page size must be a positive integer.")
+        limit = min(limit, max_size)
+
+        if fields:
+            unknown = [field for field in fields if field not in PROGRAM_OFFERED_FIELDS]
+            if unknown:
+                raise ValidationError(f"Unknown fields: {', '.join(unknown)}")
+            fields = ['ProgramId'] + [field for field in fields if field != 'ProgramId']
+        else:
+            fields = list(PROGRAM_OFFERED_FIELDS)
+
+        try:
+            programs = Programs_Offered.objects.values(*fields)
+            if before is not None:
+                rows = list(programs.filter(ProgramId__lt=before).order_by('-ProgramId')[:limit + 1])
+                has_more = len(rows) > limit
+                rows = rows[:limit][::-1]
+                has_prev, has_next = has_more, True
+            else:
+                if after is not None:
+                    programs = programs.filter(ProgramId__gt=after)
+                rows = list(programs.order_by('ProgramId')[:limit + 1])
+                has_more = len(rows) > limit
+                rows = rows[:limit]
+                has_prev, has_next = after is not None, has_more
+
+            logger.info("Listed page of %s programs offered (after=%s, before=%s)", len(rows), after, before)
+            return {
+                'results': rows,
+                'next': rows[-1]['ProgramId'] if rows and has_next else None,
+                'prev': rows[0]['ProgramId'] if rows and has_prev else None,
+            }
+        except Exception as e:
+            logger.error("Unexpected error while listing page of programs offered: %s", e)
+            raise
+
+    def search_programs(self, query: str, kind: str = OFFERED, page: int = 1,
+                        page_size: Optional[int] = None) -> dict:
+        """
+        Ranked full-text and trigram search over programs offered or scheduled.
+
+        :param query: Free text, typos allowed, e.g. "data sciense evening".
+        :param kind: 'offered' (name, description, eligibility) or 'scheduled' (name, location).
+        :param page: 1-based page number.
+        :param page_size: Results per page, PROGRAMS_PAGE_SIZE by default and capped at PROGRAMS_MAX_PAGE_SIZE.
+        :return: Dictionary with 'results' (program fields plus 'rank'), 'page', 'page_size' and 'has_next'.
+        """
+        search.validate(kind, query)
+        page_size = page_size or getattr(settings, 'PROGRAMS_PAGE_SIZE', 50)
+        if page < 1 or page_size < 1:
+            raise ValidationError("Page and page size must be positive integers.")
+        page_size = min(page_size, getattr(settings, 'PROGRAMS_MAX_PAGE_SIZE', 200))
+
+        try:
+            ranked, has_next = search.search(kind, query, (page - 1) * page_size, page_size)
+            serializer = ProgramsOfferedSerializer if kind == OFFERED else ProgramsScheduledSerializer
+            programs = serializer.model.objects.in_bulk([pk for pk, _ in ranked])
+            results = [
+                dict(serializer.to_dict(programs[pk]), rank=round(rank, 4))
+                for pk, rank in ranked if pk in programs
+            ]
+            logger.info("Search for %r over %s programs returned %s result(s) on page %s",
+                        query, kind, len(results), page)
+            return {'results': results, 'page': page, 'page_size': page_size, 'has_next': has_next}
+        except Exception as e:
+            logger.error("Unexpected error while searching %s programs: %s", kind, e)
             raise
 
     def create_scheduled_program(self, programs_scheduled: Programs_Scheduled):
         try:
-            programs_scheduled.save()
-            logger.info(f"Scheduled program created: {programs_scheduled.ProgramName}")
+            with transaction.atomic():
+                conflicts.lock_locations([programs_scheduled.Location])
+                conflicts.validate(programs_scheduled)
+                programs_scheduled.save()
+            logger.info("Scheduled program created: %s", programs_scheduled.ProgramName)
         except ValidationError as e:
-            logger.error(f"Validation error while creating scheduled program: {e}")
+            logger.error("Validation error while creating scheduled program: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error while creating scheduled program: {e}")
+            logger.error("Unexpected error while creating scheduled program: %s", e)
             raise
 
     def update_scheduled_program(self, programs_scheduled: Programs_Scheduled):
         try:
-            programs_scheduled.save()
-            logger.info(f"Scheduled program updated: {programs_scheduled.ProgramName}")
+            with transaction.atomic():
+                if programs_scheduled.capacity is not None:
+                    enrolled = Programs_Scheduled.objects.select_for_update().values_list(
+                        'enrolled_count', flat=True
+                    ).get(pk=programs_scheduled.pk)
+                    if programs_scheduled.capacity < enrolled:
+                        raise ValidationError(f"Capacity cannot drop below the {enrolled} seats already taken.")
+                conflicts.lock_locations([programs_scheduled.Location])
+                conflicts.validate(programs_scheduled)
+                programs_scheduled.save()
+            logger.info("Scheduled program updated: %s", programs_scheduled.ProgramName)
         except ObjectDoesNotExist:
-            logger.error(f"Scheduled program not found: {programs_scheduled.Scheduled_program_id}")
+            logger.error("Scheduled program not found: %s", programs_scheduled.Scheduled_program_id)
             raise
         except ValidationError as e:
-            logger.error(f"Validation error while updating scheduled program: {e}")
+            logger.error("Validation error while updating scheduled program: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error while updating scheduled program: {e}")
+            logger.error("Unexpected error while updating scheduled program: %s", e)
             raise
 
     def delete_scheduled_program(self, scheduled_program_id: int):
         try:
             program = Programs_Scheduled.objects.get(Scheduled_program_id=scheduled_program_id)
             program.delete()
-            logger.info(f"Scheduled program deleted: {scheduled_program_id}")
+            logger.info("Scheduled program deleted: %s", scheduled_program_id)
         except ObjectDoesNotExist:
-            logger.error(f"Scheduled program not found: {scheduled_program_id}")
+            logger.error("Scheduled program not found: %s", scheduled_program_id)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error while deleting scheduled program: {e}")
+            logger.error("Unexpected error while deleting scheduled program: %s", e)
             raise
 
+    @cached(SCHEDULED)
     def list_all_scheduled_programs(self, program_name: str) -> List[Programs_Scheduled]:
         try:
             programs = Programs_Scheduled.objects.filter(ProgramName=program_name)
-            logger.info(f"Listed all scheduled programs for program: {program_name}")
+            logger.info("Listed all scheduled programs for program: %s", program_name)
             return list(programs)
         except Exception as e:
-            logger.error(f"Unexpected error while listing all scheduled programs: {e}")
+            logger.error("Unexpected error while listing all scheduled programs: %s", e)
+            raise
+
+    """ ==================================
+    Timetable Conflicts
+    ======================================
+    """
+
+    def find_schedule_overlaps(self, location: str, start_date: date, end_date: date,
+                               exclude_id: Optional[int] = None) -> List[dict]:
+        """
+        Return the sessions at `location` whose dates overlap [start_date, end_date], by id.
+
+        :param exclude_id: Session to leave out, e.g. the one being edited.
+        """
+        if not location:
+            raise ValidationError("A location is required.")
+        if end_date < start_date:
+            raise ValidationError("End date must not be before the start date.")
+        try:
+            ids = conflicts.overlapping(location, start_date, end_date, exclude_id=exclude_id)
+            programs = Programs_Scheduled.objects.in_bulk(ids)
+            return [ProgramsScheduledSerializer.to_dict(programs[pk]) for pk in ids if pk in programs]
+        except Exception as e:
+            logger.error("Unexpected error while looking up schedule overlaps at %s: %s", location, e)
+            raise
+
+    def audit_schedule_conflicts(self, location: Optional[str] = None, limit: Optional[int] = 100) -> dict:
+        """
+        Find every pair of overlapping sessions in the schedule (or at one location).
+
+        :param limit: Number of pairs to return; all of them are counted.
+        :return: Dict with the number of conflicts, the count per location and the first pairs.
+        """
+        try:
+            per_location = Counter()
+            pairs = []
+            for row_location, first, second in conflicts.audit(location):
+                per_location[row_location] += 1
+                if limit is None or len(pairs) < limit:
+                    pairs.append({'Location': row_location, 'Scheduled_program_ids': [first, second]})
+            total = sum(per_location.values())
+            logger.info("Schedule audit found %s conflict(s) at %s location(s)", total, len(per_location))
+            return {'conflicts': total, 'locations': dict(per_location.most_common()), 'pairs': pairs}
+        except Exception as e:
+            logger.error("Unexpected error while auditing the schedule: %s", e)
+            raise
+
+    """ ==================================
+    Session Occurrences
+    ======================================
+    """
+
+    def list_occurrences(self, scope: str, key, start_date: date, end_date: date) -> Iterator:
+        """
+        Return a lazy iterator over the session dates of one scheduled program or one location.
+
+        The arguments are checked here, before anything is generated, so callers can
+        stream the iterator straight into a response.
+
+        :param scope: 'program' (key is a Scheduled_program_id) or 'location' (key is a Location).
+        :return: Iterator of occurrences.Occurrence ordered by date.
+        """
+        occurrences.validate(scope, start_date, end_date)
+        if scope == 'program' and not Programs_Scheduled.objects.filter(pk=key).exists():
+            logger.error("Scheduled program not found: %s", key)
+            raise ObjectDoesNotExist(f"Scheduled program {key} does not exist.")
+        logger.info("Expanding %s %s occurrences from %s to %s", scope, key, start_date, end_date)
+        return occurrences.occurrences(scope, key, start_date, end_date)
+
+    """ ==================================
+    Bulk Operations
+    ======================================
+    """
+
+    def _build_instances(self, model, fields, items):
+        """
+        Build and validate one model instance per item without touching the database.
+
+        :return: Tuple of (instances, results); results hold an error entry for every invalid item.
+        """
+        max_items = getattr(settings, 'PROGRAMS_BULK_MAX_ITEMS', 20000)
+        if not isinstance(items, (list, tuple)):
+            raise ValidationError("Expected a JSON array of objects.")
+        if len(items) > max_items:
+            raise ValidationError(f"At most {max_items} items may be sent in one request.")
+
+        instances, results = [], []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results.append({'index': index, 'status': 'error', 'errors': {'__all__': ['Expected an object.']}})
+                continue
+            unknown = set(item) - set(fields)
+            if unknown:
+                results.append({'index': index, 'status': 'error',
+                                'errors': {field: ['Unknown field.'] for field in sorted(unknown)}})
+                continue
+            instance = model(**item)
+            try:
+                # Uniqueness is enforced by the database inside the transaction instead of per row.
+                # Virtual relations (Program_offered) have no column to validate and would query.
+                instance.full_clean(
+                    exclude=[field.name for field in model._meta.fields if not field.concrete],
+                    validate_unique=False,
+                )
+            except ValidationError as e:
+                results.append({'index': index, 'status': 'error', 'errors': e.message_dict})
+                continue
+            instances.append((index, instance))
+        return instances, results
+
+    def bulk_add_programs_offered(self, items: Sequence[dict]) -> List[dict]:
+        """
+        Validate and insert many programs offered in one transaction.
+
+        Nothing is written unless every item is valid.
+
+        :param items: List of dictionaries with Programs_Offered field values.
+        :return: Per-item results in input order.
+        """
+        instances, errors = self._build_instances(
+            Programs_Offered, [f for f in PROGRAM_OFFERED_FIELDS if f != 'ProgramId'], items
+        )
+        if errors:
+            logger.error("Bulk add of programs offered rejected: %s invalid item(s)", len(errors))
+            return sorted(errors, key=lambda result: result['index'])
+
+        batch_size = getattr(settings, 'PROGRAMS_BULK_BATCH_SIZE', 1000)
+        try:
+            with transaction.atomic():
+                created = Programs_Offered.objects.bulk_create(
+                    [instance for _, instance in instances], batch_size=batch_size
+                )
+                # bulk_create sends no post_save, so record the change here
+                versions.bump(OFFERED)
+            logger.info("Bulk added %s programs offered", len(created))
+            return [
+                {'index': index, 'status': 'created', 'id': instance.pk}
+                for (index, _), instance in zip(instances, created)
+            ]
+        except Exception as e:
+            logger.error("Unexpected error while bulk adding programs offered: %s", e)
+            raise
+
+    def bulk_upsert_scheduled_programs(self, items: Sequence[dict]) -> List[dict]:
+        """
+        Validate and insert or update many scheduled programs in one transaction.
+
+        Items carrying a Scheduled_program_id are upserted on that key with
+        `bulk_create(update_conflicts=True)`; items without one are inserted.
+        The id must belong to an existing session: inserting explicit primary
+        keys would leave the PostgreSQL sequence behind them. Upserts only
+        overwrite the fields the item sends. Nothing is written unless every
+        item is valid.
+
+        :param items: List of dictionaries with Programs_Scheduled field values.
+        :return: Per-item results in input order.
+        """
+        instances, errors = self._build_instances(Programs_Scheduled, PROGRAM_SCHEDULED_FIELDS, items)
+        if errors:
+            logger.error("Bulk upsert of scheduled programs rejected: %s invalid item(s)", len(errors))
+            return sorted(errors, key=lambda result: result['index'])
+
+        new = [(index, instance) for index, instance in instances if instance.pk is None]
+        existing = [(index, instance) for index, instance in instances if instance.pk is not None]
+        batch_size = getattr(settings, 'PROGRAMS_BULK_BATCH_SIZE', 1000)
+
+        try:
+            with transaction.atomic():
+                if existing:
+                    # Locked (in pk order) so no enrolment takes a seat between this check and the write
+                    enrolled = dict(Programs_Scheduled.objects.select_for_update().filter(
+                        pk__in=[instance.pk for _, instance in existing]
+                    ).order_by('pk').values_list('pk', 'enrolled_count'))
+                    errors = []
+                    for index, instance in existing:
+                        if instance.pk not in enrolled:
+                            errors.append({'index': index, 'status': 'error', 'errors': {
+                                'Scheduled_program_id': [f"No scheduled program with id {instance.pk}."]
+                            }})
+                        elif 'capacity' in items[index] and instance.capacity is not None \
+                                and instance.capacity < enrolled[instance.pk]:
+                            errors.append({'index': index, 'status': 'error', 'errors': {
+                                'capacity': [f"Capacity cannot drop below the {enrolled[instance.pk]} seats already taken."]
+                            }})
+                    if errors:
+                        logger.error("Bulk upsert of scheduled programs rejected: %s invalid item(s)", len(errors))
+                        return errors
+                conflicts.lock_locations(instance.Location for _, instance in instances)
+                errors = conflicts.validate_bulk(instances)
+                if errors:
+                    logger.error("Bulk upsert of scheduled programs rejected: %s conflicting item(s)", len(errors))
+                    return errors
+                Programs_Scheduled.objects.bulk_create([instance for _, instance in new], batch_size=batch_size)
+                # Only the fields an item sends are overwritten: an omitted capacity must not become NULL (unlimited)
+                by_fields = defaultdict(list)
+                for index, instance in existing:
+                    sent = tuple(
+                        f for f in PROGRAM_SCHEDULED_FIELDS if f != 'Scheduled_program_id' and f in items[index]
+                    )
+                    by_fields[sent].append(instance)
+                for sent, group in by_fields.items():
+                    Programs_Scheduled.objects.bulk_create(
+                        group,
+                        batch_size=batch_size,
+                        update_conflicts=True,
+                        unique_fields=['Scheduled_program_id'],
+                        update_fields=list(sent) + ['updated_at'],
+                    )
+                versions.bump(SCHEDULED)
+            logger.info("Bulk upserted scheduled programs: %s created, %s upserted", len(new), len(existing))
+            results = [{'index': index, 'status': 'created', 'id': instance.pk} for index, instance in new]
+            results += [{'index': index, 'status': 'upserted', 'id': instance.pk} for index, instance in existing]
+            return sorted(results, key=lambda result: result['index'])
+        except Exception as e:
+            logger.error("Unexpected error while bulk upserting scheduled programs: %s", e)
+            raise
+
+    def bulk_delete(self, kind: str, ids: Iterable[int]) -> List[dict]:
+        """
+        Delete many programs by primary key with a single DELETE per batch.
+
+        :param kind: 'offered' or 'scheduled'.
+        :param ids: Primary keys to delete.
+        :return: Per-id results, 'deleted' or 'not_found'.
+        """
+        models_by_kind = {OFFERED: Programs_Offered, SCHEDULED: Programs_Scheduled}
+        if kind not in models_by_kind:
+            raise ValidationError(f"Unknown program kind '{kind}'. Must be one of {list(models_by_kind)}.")
+        try:
+            ids = [int(pk) for pk in ids]
+        except (TypeError, ValueError):
+            raise ValidationError("Expected a JSON array of integer ids.")
+
+        model = models_by_kind[kind]
+        try:
+            with transaction.atomic():
+                found = set(model.objects.filter(pk__in=ids).values_list('pk', flat=True))
+                model.objects.filter(pk__in=found).delete()
+            logger.info("Bulk deleted %s %s", len(found), model._meta.verbose_name_plural)
+            return [{'id': pk, 'status': 'deleted' if pk in found else 'not_found'} for pk in ids]
+        except ProtectedError as e:
+            logger.error("Bulk delete of %s programs blocked by existing applications: %s", kind, e)
+            raise ValidationError("Some programs still have applications or participants and cannot be deleted.")
+        except Exception as e:
+            logger.error("Unexpected error while bulk deleting %s programs: %s", kind, e)
             raise
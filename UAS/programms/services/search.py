@@ -0,0 +1,188 @@
+"""
+Ranked search over the program catalogue.
+
+On PostgreSQL a query matches a program when the weighted full-text vector of
+its searchable fields matches (GIN index from migration 0006) or when a
+trigram field is similar enough (gin_trgm_ops indexes), so typos still find
+programs. Results are ranked by SearchRank plus trigram similarity.
+
+Other databases (SQLite in tests and local runs) use an in-process inverted
+index with trigram matching of unknown tokens against the vocabulary. The
+index is rebuilt whenever the table's CatalogueVersion changes.
+"""
+import heapq
+import logging
+import re
+import threading
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import Q
+from .cache import OFFERED, SCHEDULED
+from . import versions
+from ..models import Programs_Offered, Programs_Scheduled
+
+logger = logging.getLogger(__name__)
+
+MODELS = {OFFERED: Programs_Offered, SCHEDULED: Programs_Scheduled}
+
+# Searchable fields and their full-text weight (A ranks highest)
+SEARCH_FIELDS = {
+    OFFERED: {'ProgramName': 'A', 'Description': 'B', 'Applicant_eligibility': 'C'},
+    SCHEDULED: {'ProgramName': 'A', 'Location': 'B'},
+}
+# Fields matched by trigram similarity for typo tolerance
+TRIGRAM_FIELDS = {
+    OFFERED: ('ProgramName', 'Description'),
+    SCHEDULED: ('ProgramName', 'Location'),
+}
+# PostgreSQL's default ts_rank weights, reused by the Python index
+WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+SEARCH_CONFIG = 'english'
+
+_token = re.compile(r'\w+')
+
+
+def search_vector(kind):
+    """
+    Weighted SearchVector of `kind`; must stay identical to the expression indexed in migration 0006.
+    """
+    from django.contrib.postgres.search import SearchVector
+
+    vector = None
+    for field, weight in SEARCH_FIELDS[kind].items():
+        part = SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def get_backend():
+    backend = getattr(settings, 'PROGRAMS_SEARCH_BACKEND', 'auto')
+    if backend == 'auto':
+        return 'postgresql' if connection.vendor == 'postgresql' else 'python'
+    return backend
+
+
+def search(kind, query, offset, limit):
+    """
+    Return ([(pk, rank)], has_more) for one page of `query` over `kind`, best match first.
+    """
+    if get_backend() == 'postgresql':
+        return _search_postgresql(kind, query, offset, limit)
+    return _search_python(kind, query, offset, limit)
+
+
+def _search_postgresql(kind, query, offset, limit):
+    from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+
+    model = MODELS[kind]
+    search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+    rank = SearchRank(search_vector(kind), search_query)
+    matches = Q(search=search_query)
+    for field in TRIGRAM_FIELDS[kind]:
+        rank = rank + TrigramSimilarity(field, query)
+        matches |= Q(**{f'{field}__trigram_similar': query})
+
+    with connection.cursor() as cursor:
+        # Threshold of the % operator behind trigram_similar, per session
+        cursor.execute('SELECT set_limit(%s)', [getattr(settings, 'PROGRAMS_SEARCH_MIN_SIMILARITY', 0.3)])
+    rows = list(
+        model.objects.alias(search=search_vector(kind))
+        .filter(matches)
+        .annotate(rank=rank)
+        .order_by('-rank', 'pk')
+        .values_list('pk', 'rank')[offset:offset + limit + 1]
+    )
+    return rows[:limit], len(rows) > limit
+
+
+def tokenize(text):
+    return _token.findall(text.lower())
+
+
+def trigrams(token):
+    # Padded like pg_trgm: two spaces before the word, one after
+    padded = f'  {token} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class InvertedIndex:
+    """
+    token -> {pk: weight} postings plus a trigram -> tokens map for fuzzy matching.
+    """
+
+    def __init__(self, rows, fields, min_similarity):
+        self.min_similarity = min_similarity
+        self.postings = defaultdict(dict)
+        weights = [WEIGHTS[weight] for weight in fields.values()]
+        for pk, *values in rows:
+            for weight, value in zip(weights, values):
+                for token in tokenize(value or ''):
+                    postings = self.postings[token]
+                    postings[pk] = postings.get(pk, 0.0) + weight
+        self.vocabulary = defaultdict(set)
+        for token in self.postings:
+            for gram in trigrams(token):
+                self.vocabulary[gram].add(token)
+
+    def similar_tokens(self, token):
+        """
+        Yield (indexed token, similarity) for `token`: itself when indexed, trigram neighbours otherwise.
+        """
+        if token in self.postings:
+            yield token, 1.0
+            return
+        grams = trigrams(token)
+        shared = Counter(candidate for gram in grams for candidate in self.vocabulary.get(gram, ()))
+        for candidate, count in shared.items():
+            similarity = count / (len(grams) + len(trigrams(candidate)) - count)
+            if similarity >= self.min_similarity:
+                yield candidate, similarity
+
+    def search(self, query, limit):
+        """
+        Return the best `limit` (pk, score) pairs for documents matching any query token, best first.
+        """
+        scores = defaultdict(float)
+        for token in set(tokenize(query)):
+            for candidate, similarity in self.similar_tokens(token):
+                for pk, weight in self.postings[candidate].items():
+                    scores[pk] += weight * similarity
+        return heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(kind):
+    """
+    Return the inverted index of `kind`, rebuilding it when the catalogue version moved.
+    """
+    version, _ = versions.current(kind)
+    index = _indexes.get(kind)
+    if index is not None and index[0] == version:
+        return index[1]
+    with _indexes_lock:
+        index = _indexes.get(kind)
+        if index is None or index[0] != version:
+            fields = SEARCH_FIELDS[kind]
+            rows = MODELS[kind].objects.values_list('pk', *fields).iterator(chunk_size=10000)
+            min_similarity = getattr(settings, 'PROGRAMS_SEARCH_MIN_SIMILARITY', 0.3)
+            index = (version, InvertedIndex(rows, fields, min_similarity))
+            _indexes[kind] = index
+            logger.info("Search index for %s rebuilt at version %s", kind, version)
+    return index[1]
+
+
+def _search_python(kind, query, offset, limit):
+    ranked = get_index(kind).search(query, offset + limit + 1)
+    return ranked[offset:offset + limit], len(ranked) > offset + limit
+
+
+def validate(kind, query):
+    if kind not in MODELS:
+        raise ValidationError(f"Unknown program kind '{kind}'. Must be one of {list(MODELS)}.")
+    if not query or not tokenize(query):
+        raise ValidationError("A search query is required.")
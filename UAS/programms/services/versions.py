@@ -0,0 +1,109 @@
+"""
+Table-level change tracking for conditional GETs of the program catalogue.
+
+Every write to Programs_Offered / Programs_Scheduled bumps the matching
+CatalogueVersion row (from the model signals and from the bulk service
+methods). Catalogue views derive a strong ETag and Last-Modified from that
+row, so a matching If-None-Match / If-Modified-Since is answered with 304
+after one primary key lookup, without running the list query or template.
+"""
+import functools
+import hashlib
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import condition
+from ..models import CatalogueVersion
+
+
+def _marker(table):
+    connection = transaction.get_connection()
+    for _, func, *_ in connection.run_on_commit:
+        if getattr(func, 'catalogue_table', None) == table:
+            return func
+    return None
+
+
+def pending(table):
+    """
+    Whether the current transaction has written `table` and not committed yet.
+    """
+    return transaction.get_connection().in_atomic_block and _marker(table) is not None
+
+
+def bump(table):
+    """
+    Record a change to `table` ('offered' or 'scheduled').
+
+    Inside a transaction only the first write to `table` updates the row: it stays
+    locked until commit and nothing is visible before then, so one bump covers the
+    whole transaction (a queryset delete sends post_delete once per row).
+    """
+    if transaction.get_connection().in_atomic_block:
+        if _marker(table) is not None:
+            return
+
+        # Registered with the savepoint or transaction, and dropped when that rolls back
+        def marker():
+            pass
+        marker.catalogue_table = table
+        transaction.on_commit(marker)
+    now = timezone.now()
+    if not CatalogueVersion.objects.filter(table=table).update(version=F('version') + 1, updated_at=now):
+        CatalogueVersion.objects.get_or_create(table=table, defaults={'version': 1, 'updated_at': now})
+
+
+def current(table):
+    """
+    Return (version, updated_at) of `table`.
+    """
+    row = CatalogueVersion.objects.filter(table=table).values_list('version', 'updated_at').first()
+    if row is None:
+        row = CatalogueVersion.objects.get_or_create(table=table)[0]
+        return row.version, row.updated_at
+    return row
+
+
+def _request_state(request, table):
+    # Computed once per request: condition() asks for the ETag and Last-Modified separately
+    cached = getattr(request, '_catalogue_versions', None)
+    if cached is None:
+        cached = request._catalogue_versions = {}
+    if table not in cached:
+        cached[table] = current(table)
+    return cached[table]
+
+
+def catalogue_condition(table, window=None):
+    """
+    View decorator adding ETag / Last-Modified for `table` and answering conditional requests.
+
+    The ETag covers the table version, the full path (ids, filters, ?fields=) and the
+    requested Content-Type, because the same URL serves HTML and JSON. Views whose
+    output also depends on the date pass `window(request)`, returning the resolved
+    date range: it goes into the ETag, and no Last-Modified is sent since the
+    response changes when the range moves even if the table does not.
+    """
+    def etag(request, *args, **kwargs):
+        version, _ = _request_state(request, table)
+        representation = f"{table}:{version}:{request.get_full_path()}:{request.headers.get('Content-Type', '')}"
+        if window is not None:
+            representation += f":{window(request)}"
+        return hashlib.sha1(representation.encode(), usedforsecurity=False).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        return _request_state(request, table)[1]
+
+    conditional = condition(etag_func=etag, last_modified_func=last_modified if window is None else None)
+
+    def decorator(view):
+        conditional_view = conditional(view)
+
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            patch_vary_headers(response, ('Content-Type',))
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Programs_Offered, Programs_Scheduled
+from .services import versions
+from .services.cache import OFFERED, SCHEDULED
+
+
+@receiver([post_save, post_delete], sender=Programs_Offered)
+def invalidate_programs_offered(sender, **kwargs):
+    versions.bump(OFFERED)
+
+
+@receiver([post_save, post_delete], sender=Programs_Scheduled)
+def invalidate_programs_scheduled(sender, **kwargs):
+    versions.bump(SCHEDULED)
@@ -1,3 +1,549 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import random
+from datetime import date, timedelta
+from unittest import mock, skipUnless
+from django.core.exceptions import ValidationError
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import F
+from django.template import engines
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from .apps import precompile_templates
+from .models import CatalogueVersion, Programs_Offered, Programs_Scheduled
+from .services import search, versions
+from .services.cache import OFFERED, SCHEDULED, get_cache
+from .services.conflicts import IntervalTree, audit
+from .services.occurrences import Occurrence, expand, session_offsets
+from .services.programms_service import ProgramServiceImpl
 
-# Create your tests here.
+
+def offered(name, **fields):
+    return Programs_Offered(**{
+        'ProgramName': name, 'Description': f'{name} track', 'Applicant_eligibility': 'Graduate',
+        'Duration': 12, 'Degree_certificate_offered': 'Diploma', **fields,
+    })
+
+
+class ProgramPageTests(TestCase):
+
+    def setUp(self):
+        self.service = ProgramServiceImpl()
+        for n in range(5):
+            offered(f'Program {n}').save()
+        self.ids = list(Programs_Offered.objects.order_by('pk').values_list('pk', flat=True))
+
+    def test_forward_and_back(self):
+        first = self.service.list_programs_page(limit=2)
+        self.assertEqual([row['ProgramId'] for row in first['results']], self.ids[:2])
+        self.assertEqual((first['prev'], first['next']), (None, self.ids[1]))
+
+        second = self.service.list_programs_page(after=first['next'], limit=2)
+        self.assertEqual([row['ProgramId'] for row in second['results']], self.ids[2:4])
+        self.assertEqual((second['prev'], second['next']), (self.ids[2], self.ids[3]))
+
+        last = self.service.list_programs_page(after=second['next'], limit=2)
+        self.assertEqual([row['ProgramId'] for row in last['results']], self.ids[4:])
+        self.assertIsNone(last['next'])
+
+        back = self.service.list_programs_page(before=last['prev'], limit=2)
+        self.assertEqual(back['results'], second['results'])
+
+    def test_fields_and_validation(self):
+        page = self.service.list_programs_page(limit=1, fields=['Duration'])
+        self.assertEqual(page['results'], [{'ProgramId': self.ids[0], 'Duration': 12}])
+        with self.assertRaises(ValidationError):
+            self.service.list_programs_page(fields=['password'])
+        with self.assertRaises(ValidationError):
+            self.service.list_programs_page(after=1, before=3)
+        with self.assertRaises(ValidationError):
+            self.service.list_programs_page(limit=0)
+
+    def test_json_listing_links(self):
+        response = self.client.get('/programms/programs/', {'limit': 2, 'fields': 'ProgramName'},
+                                   CONTENT_TYPE='application/json')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual([row['ProgramName'] for row in body['programs_offered']], ['Program 0', 'Program 1'])
+        self.assertIsNone(body['prev'])
+        following = self.client.get(body['next'], CONTENT_TYPE='application/json').json()
+        self.assertEqual([row['ProgramName'] for row in following['programs_offered']], ['Program 2', 'Program 3'])
+
+
+class ProgramExportTests(TestCase):
+
+    def setUp(self):
+        for n in range(3):
+            offered(f'Program {n}', Duration=n + 1).save()
+
+    def test_ndjson(self):
+        response = self.client.get('/programms/programs/export/', {'fields': 'ProgramName,Duration'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertIn('Programs_Offered.ndjson', response['Content-Disposition'])
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [
+            {'ProgramName': f'Program {n}', 'Duration': n + 1} for n in range(3)
+        ])
+
+    def test_csv(self):
+        response = self.client.get('/programms/programs/export/', {'format': 'csv', 'fields': 'ProgramName'})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows, [['ProgramName'], ['Program 0'], ['Program 1'], ['Program 2']])
+
+    def test_rejects_unknown_format_and_fields(self):
+        self.assertEqual(self.client.get('/programms/programs/export/', {'format': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get('/programms/scheduled/export/', {'fields': 'secret'}).status_code, 400)
+
+
+def scheduled_item(**fields):
+    return {
+        'ProgramName': 'Data Science', 'Location': 'Pune', 'Start_Date': '2025-01-01', 'End_Date': '2025-01-31',
+        'sessions_per_week': 3, **fields,
+    }
+
+
+class BulkProgramTests(TestCase):
+
+    def setUp(self):
+        self.service = ProgramServiceImpl()
+
+    def test_add_is_all_or_nothing(self):
+        items = [{'ProgramName': 'Data Science', 'Description': 'Data', 'Applicant_eligibility': 'Graduate',
+                  'Duration': 12, 'Degree_certificate_offered': 'Diploma'}]
+        results = self.service.bulk_add_programs_offered(items + [dict(items[0], ProgramName='Robotics', Duration='x')])
+        self.assertEqual([(result['index'], result['status']) for result in results], [(1, 'error')])
+        self.assertFalse(Programs_Offered.objects.exists())
+
+        results = self.service.bulk_add_programs_offered(items)
+        self.assertEqual(results, [{'index': 0, 'status': 'created', 'id': Programs_Offered.objects.get().pk}])
+
+    def test_upsert(self):
+        stored = self.service.bulk_upsert_scheduled_programs([scheduled_item()])[0]['id']
+        results = self.service.bulk_upsert_scheduled_programs([
+            scheduled_item(Location='Delhi'),
+            scheduled_item(Scheduled_program_id=stored, End_Date='2025-02-28'),
+        ])
+        self.assertEqual([result['status'] for result in results], ['created', 'upserted'])
+        self.assertEqual(Programs_Scheduled.objects.get(pk=stored).End_Date, date(2025, 2, 28))
+        self.assertEqual(Programs_Scheduled.objects.count(), 2)
+
+    def test_upsert_rejects_unknown_ids_and_overlaps(self):
+        results = self.service.bulk_upsert_scheduled_programs([scheduled_item(Scheduled_program_id=999)])
+        self.assertEqual(results[0]['errors'], {'Scheduled_program_id': ['No scheduled program with id 999.']})
+
+        results = self.service.bulk_upsert_scheduled_programs([
+            scheduled_item(), scheduled_item(Start_Date='2025-01-31', End_Date='2025-02-10'),
+        ])
+        self.assertEqual([result['status'] for result in results], ['error', 'error'])
+        self.assertFalse(Programs_Scheduled.objects.exists())
+
+    def test_delete(self):
+        stored = self.service.bulk_upsert_scheduled_programs([scheduled_item()])[0]['id']
+        self.assertEqual(self.service.bulk_delete(SCHEDULED, [stored, 999]), [
+            {'id': stored, 'status': 'deleted'}, {'id': 999, 'status': 'not_found'},
+        ])
+        with self.assertRaises(ValidationError):
+            self.service.bulk_delete('participants', [1])
+        with self.assertRaises(ValidationError):
+            self.service.bulk_delete(SCHEDULED, ['one'])
+
+    def test_endpoint_status(self):
+        url = '/programms/scheduled/bulk/'
+        response = self.client.post(url, [scheduled_item()], content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(url, [scheduled_item(Location='')], content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['results'][0]['status'], 'error')
+        self.assertEqual(self.client.post(url, 'not json', content_type='application/json').status_code, 400)
+
+
+class LookupIndexTests(TestCase):
+
+    @skipUnless(connection.vendor == 'sqlite', "PostgreSQL may prefer a sequential scan on a few hundred rows")
+    def test_hot_lookups_use_indexes(self):
+        out = io.StringIO()
+        call_command('explain_lookups', rows=300, batch_size=100, stdout=out)
+        plans = [line for line in out.getvalue().splitlines() if line[:1].isdigit()]
+        self.assertEqual(len(plans), 6)
+        for plan in plans:
+            self.assertIn('USING INDEX', plan)
+
+
+class ProgramCacheTests(TransactionTestCase):
+
+    def setUp(self):
+        get_cache().clear()
+        self.service = ProgramServiceImpl()
+
+    def test_reads_are_cached_until_a_write_commits(self):
+        self.service.add_program_offered(offered('Data Science'))
+        self.assertEqual(len(self.service.list_all_programs()), 1)
+        with self.assertNumQueries(1):  # the version row only
+            self.assertEqual(len(self.service.list_all_programs()), 1)
+
+        self.service.add_program_offered(offered('Robotics'))
+        self.assertEqual(len(self.service.list_all_programs()), 2)
+
+    def test_writing_transaction_bypasses_the_cache(self):
+        self.service.add_program_offered(offered('Data Science'))
+        self.service.list_all_programs()
+        with transaction.atomic():
+            offered('Robotics').save()
+            self.assertTrue(versions.pending(OFFERED))
+            self.assertEqual(len(self.service.list_all_programs()), 2)
+            transaction.set_rollback(True)
+        self.assertFalse(versions.pending(OFFERED))
+        self.assertEqual(len(self.service.list_all_programs()), 1)
+
+    def test_one_bump_per_transaction(self):
+        Programs_Scheduled.objects.bulk_create([
+            Programs_Scheduled(ProgramName='Data Science', Location=f'Room {n}', Start_Date=date(2025, 1, 1),
+                               End_Date=date(2025, 1, 31), sessions_per_week=3)
+            for n in range(5)
+        ])
+        before = versions.current(SCHEDULED)[0]
+        with CaptureQueriesContext(connection) as queries:
+            self.service.bulk_delete(SCHEDULED, Programs_Scheduled.objects.values_list('pk', flat=True))
+        bumps = [query for query in queries if 'Catalogue Version' in query['sql'] and 'UPDATE' in query['sql']]
+        self.assertEqual(len(bumps), 1)
+        self.assertEqual(versions.current(SCHEDULED)[0], before + 1)
+
+    def test_rolled_back_savepoint_bumps_again(self):
+        before = versions.current(OFFERED)[0]
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    offered('Data Science').save()
+                    raise ValueError
+            except ValueError:
+                pass
+            self.assertFalse(versions.pending(OFFERED))
+            offered('Robotics').save()
+        self.assertEqual(versions.current(OFFERED)[0], before + 1)
+
+
+class RoutingTests(TestCase):
+
+    def setUp(self):
+        offered('Data Science').save()
+        self.program = Programs_Offered.objects.get()
+
+    def test_literal_routes_win_over_ids(self):
+        for path, name in [
+            ('/programms/programs/search/', 'search_program_for_update'),
+            ('/programms/programs/bulk/', 'bulk_programs_offered'),
+            ('/programms/programs/7/', 'program_detail'),
+            ('/programms/programs/update/7/', 'update_program_offered'),
+            ('/programms/scheduled/overlaps/', 'scheduled_overlaps'),
+            ('/programms/scheduled/7/', 'scheduled_program_detail'),
+        ]:
+            self.assertEqual(resolve(path).url_name, name)
+
+    def test_program_detail_methods(self):
+        url = f'/programms/programs/{self.program.pk}/'
+        response = self.client.get(url, CONTENT_TYPE='application/json')
+        self.assertEqual(response.json()['ProgramName'], 'Data Science')
+        response = self.client.put(url, json.dumps({'Duration': 24}), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Programs_Offered.objects.get().Duration, 24)
+        self.assertEqual(self.client.delete(url).status_code, 200)
+        self.assertFalse(Programs_Offered.objects.exists())
+        self.assertEqual(self.client.delete(url).status_code, 404)
+
+    def test_delete_page(self):
+        url = f'/programms/programs/delete/{self.program.pk}/'
+        self.assertContains(self.client.get(url), 'Data Science')
+        self.assertRedirects(self.client.post(url), '/programms/programs/', fetch_redirect_response=False)
+        self.assertFalse(Programs_Offered.objects.exists())
+
+    def test_scheduled_routes(self):
+        response = self.client.post('/programms/scheduled/', json.dumps(scheduled_item()),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        url = f'/programms/scheduled/{Programs_Scheduled.objects.get().pk}/'
+        response = self.client.put(url, json.dumps({'Location': 'Mumbai'}), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Programs_Scheduled.objects.get().Location, 'Mumbai')
+        self.assertEqual(self.client.delete(url).status_code, 200)
+        self.assertEqual(self.client.put(url, '{}', content_type='application/json').status_code, 404)
+
+    def test_bench_urls(self):
+        out = io.StringIO()
+        call_command('bench_urls', '--iterations', '2', '--prefix', '/programms/', stdout=out)
+        self.assertIn('/programms/programs/', out.getvalue())
+
+
+class ConditionalGetTests(TransactionTestCase):
+    """
+    Each write has to commit to bump the version, so these run outside a test transaction.
+    """
+    url = '/programms/programs/'
+
+    def setUp(self):
+        get_cache().clear()
+        offered('Data Science').save()
+
+    def test_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Content-Type', response['Vary'])
+        with self.assertNumQueries(1):
+            cached = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_depends_on_path_and_content_type(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertNotEqual(self.client.get(self.url, CONTENT_TYPE='application/json')['ETag'], etag)
+        self.assertNotEqual(self.client.get(self.url, {'limit': 1})['ETag'], etag)
+
+    def test_write_changes_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        offered('Robotics').save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_scheduled_writes_leave_offered_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        scheduled_etag = self.client.get('/programms/scheduled/')['ETag']
+        ProgramServiceImpl().bulk_upsert_scheduled_programs([scheduled_item()])
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get('/programms/scheduled/', HTTP_IF_NONE_MATCH=scheduled_etag).status_code, 200)
+
+
+class TemplateCacheTests(TestCase):
+
+    def setUp(self):
+        caches['template_fragments'].clear()
+        offered('Data Science').save()
+        self.program = Programs_Offered.objects.get()
+
+    def render(self):
+        return render_to_string('programs_offered.html', {'programs_offered': Programs_Offered.objects.all()})
+
+    def test_templates_are_precompiled(self):
+        loader = engines['django'].engine.template_loaders[0]
+        loader.reset()
+        precompile_templates()
+        self.assertTrue(any(key.startswith('programs_offered.html') for key in loader.get_template_cache))
+
+    def test_rows_are_cached_by_id_and_updated_at(self):
+        self.assertIn('Data Science track', self.render())
+        # update() leaves updated_at alone, so the cached row is still served
+        Programs_Offered.objects.update(Description='Renamed track')
+        self.assertIn('Data Science track', self.render())
+        self.program.Description = 'Renamed track'
+        self.program.save()
+        self.assertIn('Renamed track', self.render())
+
+    def test_bench_templates(self):
+        out = io.StringIO()
+        call_command('bench_templates', '--rows', '5', '--repeat', '1', stdout=out)
+        self.assertTrue(out.getvalue())
+
+
+@skipUnless(connection.vendor != 'postgresql', "exercises the in-process search index")
+class SearchFallbackTests(TestCase):
+
+    def setUp(self):
+        search._indexes.clear()
+        self.service = ProgramServiceImpl()
+        offered('Data Science', Description='Statistics and machine learning').save()
+        offered('Robotics', Description='Embedded systems for data collection').save()
+        offered('Fine Arts', Description='Painting').save()
+
+    def names(self, query, **kwargs):
+        return [row['ProgramName'] for row in self.service.search_programs(query, **kwargs)['results']]
+
+    def test_uses_the_python_index(self):
+        self.assertEqual(search.get_backend(), 'python')
+
+    def test_weighted_ranking(self):
+        self.assertEqual(self.names('data'), ['Data Science', 'Robotics'])
+        self.assertEqual(self.names('painting'), ['Fine Arts'])
+
+    def test_typos_match_by_trigrams(self):
+        self.assertEqual(self.names('sciense'), ['Data Science'])
+        self.assertEqual(self.names('xyzzy'), [])
+
+    def test_pages(self):
+        first = self.service.search_programs('data', page_size=1)
+        self.assertTrue(first['has_next'])
+        second = self.service.search_programs('data', page=2, page_size=1)
+        self.assertEqual(([row['ProgramName'] for row in second['results']], second['has_next']), (['Robotics'], False))
+
+    def test_index_follows_the_catalogue_version(self):
+        self.assertEqual(self.names('chemistry'), [])
+        offered('Chemistry').save()
+        CatalogueVersion.objects.filter(table=OFFERED).update(version=F('version') + 1)
+        self.assertEqual(self.names('chemistry'), ['Chemistry'])
+
+    def test_scheduled_and_api(self):
+        self.service.bulk_upsert_scheduled_programs([scheduled_item(Location='Pune')])
+        self.assertEqual(self.names('pune', kind=SCHEDULED), ['Data Science'])
+        response = self.client.get('/programms/search/', {'q': 'robotic'})
+        self.assertEqual([row['ProgramName'] for row in response.json()['results']], ['Robotics'])
+        self.assertEqual(self.client.get('/programms/search/', {'q': ''}).status_code, 400)
+        self.assertEqual(self.client.get('/programms/search/', {'q': 'data', 'kind': 'other'}).status_code, 400)
+
+
+class IntervalTreeTests(SimpleTestCase):
+
+    def test_closed_intervals(self):
+        tree = IntervalTree([(1, 3, 'a'), (5, 8, 'b'), (8, 9, 'c'), (10, 10, 'd')])
+        self.assertEqual(sorted(tree.overlapping(3, 5)), ['a', 'b'])
+        self.assertEqual(sorted(tree.overlapping(8, 8)), ['b', 'c'])
+        self.assertEqual(tree.overlapping(4, 4), [])
+        self.assertEqual(tree.overlapping(10, 12), ['d'])
+        self.assertEqual(sorted(tree.overlapping(0, 20)), ['a', 'b', 'c', 'd'])
+
+    def test_empty(self):
+        tree = IntervalTree([])
+        self.assertEqual(tree.size, 0)
+        self.assertEqual(tree.overlapping(1, 2), [])
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        intervals = []
+        for key in range(300):
+            start = rng.randint(0, 1000)
+            intervals.append((start, start + rng.randint(0, 60), key))
+        tree = IntervalTree(intervals)
+        for _ in range(200):
+            start = rng.randint(-20, 1050)
+            end = start + rng.randint(0, 80)
+            expected = sorted(key for first, last, key in intervals if first <= end and last >= start)
+            self.assertEqual(sorted(tree.overlapping(start, end)), expected)
+
+    def test_dates(self):
+        tree = IntervalTree([(date(2025, 1, 1), date(2025, 3, 31), 1), (date(2025, 4, 1), date(2025, 6, 30), 2)])
+        self.assertEqual(sorted(tree.overlapping(date(2025, 3, 31), date(2025, 4, 1))), [1, 2])
+        self.assertEqual(tree.overlapping(date(2025, 7, 1), date(2025, 7, 2)), [])
+
+
+class AuditTests(TestCase):
+
+    def schedule(self, location, start, end):
+        return Programs_Scheduled.objects.create(
+            ProgramName='Data Science', Location=location, Start_Date=start, End_Date=end, sessions_per_week=3,
+        ).pk
+
+    def test_overlapping_pairs(self):
+        first = self.schedule('Pune', date(2025, 1, 1), date(2025, 1, 31))
+        second = self.schedule('Pune', date(2025, 1, 31), date(2025, 2, 28))
+        third = self.schedule('Pune', date(2025, 1, 10), date(2025, 1, 20))
+        self.schedule('Pune', date(2025, 3, 1), date(2025, 3, 31))
+        other = self.schedule('Delhi', date(2025, 1, 1), date(2025, 1, 31))
+        self.schedule('Delhi', date(2025, 2, 1), date(2025, 2, 28))
+
+        self.assertEqual(sorted(audit()), [
+            ('Pune', first, second),
+            ('Pune', first, third),
+        ])
+        self.assertEqual(list(audit('Delhi')), [])
+        self.schedule('Delhi', date(2025, 1, 15), date(2025, 1, 15))
+        self.assertEqual([pair[:2] for pair in audit('Delhi')], [('Delhi', other)])
+
+
+class BenchConflictsTests(TestCase):
+
+    def test_locations_without_sessions(self):
+        out = io.StringIO()
+        call_command('bench_conflicts', '--sessions', '3', '--locations', '20', '--queries', '20', '--bulk', '5',
+                     stdout=out)
+        self.assertIn('interval tree lookup', out.getvalue())
+        self.assertFalse(Programs_Scheduled.objects.exists())
+
+
+class SessionOffsetsTests(SimpleTestCase):
+
+    def test_offsets(self):
+        self.assertEqual(session_offsets(1), (0,))
+        self.assertEqual(session_offsets(3), (0, 2, 4))
+        self.assertEqual(session_offsets(7), (0, 1, 2, 3, 4, 5, 6))
+
+    def test_clamped(self):
+        self.assertEqual(session_offsets(12), session_offsets(7))
+        self.assertEqual(session_offsets(0), ())
+        self.assertEqual(session_offsets(-2), ())
+        self.assertEqual(session_offsets(None), ())
+
+
+class ExpandTests(SimpleTestCase):
+
+    row = (5, 'Data Science', 'Pune', date(2025, 1, 6), date(2025, 1, 26), 3)
+
+    def test_whole_program(self):
+        occurrences = list(expand(self.row, date(2025, 1, 1), date(2025, 12, 31)))
+        self.assertEqual(len(occurrences), 9)
+        self.assertEqual(occurrences[0], Occurrence(date(2025, 1, 6), 1, 5, 'Data Science', 'Pune'))
+        self.assertEqual(occurrences[-1], Occurrence(date(2025, 1, 24), 9, 5, 'Data Science', 'Pune'))
+        self.assertEqual([occurrence.number for occurrence in occurrences], list(range(1, 10)))
+        self.assertEqual(
+            [occurrence.date for occurrence in occurrences[:3]],
+            [date(2025, 1, 6), date(2025, 1, 8), date(2025, 1, 10)],
+        )
+
+    def test_window_keeps_numbering(self):
+        occurrences = list(expand(self.row, date(2025, 1, 13), date(2025, 1, 15)))
+        self.assertEqual(
+            [(occurrence.date, occurrence.number) for occurrence in occurrences],
+            [(date(2025, 1, 13), 4), (date(2025, 1, 15), 5)],
+        )
+
+    def test_stops_at_end_date(self):
+        row = self.row[:4] + (date(2025, 1, 8), 3)
+        self.assertEqual([occurrence.date for occurrence in expand(row, date(2025, 1, 1), date(2025, 2, 1))],
+                         [date(2025, 1, 6), date(2025, 1, 8)])
+
+    def test_nothing_to_expand(self):
+        self.assertEqual(list(expand(self.row, date(2025, 2, 1), date(2025, 2, 28))), [])
+        self.assertEqual(list(expand(self.row, date(2025, 1, 20), date(2025, 1, 19))), [])
+        self.assertEqual(list(expand(self.row[:5] + (0,), date(2025, 1, 1), date(2025, 12, 31))), [])
+
+    def test_one_session_a_day(self):
+        row = self.row[:5] + (9,)
+        days = [occurrence.date for occurrence in expand(row, date(2025, 1, 1), date(2025, 1, 31))]
+        self.assertEqual(days, [date(2025, 1, 6) + timedelta(days=offset) for offset in range(21)])
+
+
+class OccurrencesViewTests(TestCase):
+    url = '/programms/scheduled/occurrences/'
+
+    def setUp(self):
+        ProgramServiceImpl().bulk_upsert_scheduled_programs([scheduled_item(
+            Start_Date='2025-01-06', End_Date='2025-03-31', sessions_per_week=1,
+        )])
+        self.program = Programs_Scheduled.objects.get()
+
+    def get(self, today, etag=None, **params):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        with mock.patch('programms.services.occurrences.timezone.localdate', return_value=today):
+            return self.client.get(self.url, {'program': self.program.pk, **params}, **headers)
+
+    def test_default_window_is_part_of_the_etag(self):
+        monday = self.get(date(2025, 1, 6))
+        self.assertEqual(json.loads(b''.join(monday.streaming_content))['occurrences'][0]['date'], '2025-01-06')
+        self.assertNotIn('Last-Modified', monday)
+        same_day = self.get(date(2025, 1, 6), monday['ETag'])
+        self.assertEqual(same_day.status_code, 304)
+        next_day = self.get(date(2025, 1, 7), monday['ETag'])
+        self.assertEqual(next_day.status_code, 200)
+        self.assertEqual(json.loads(b''.join(next_day.streaming_content))['occurrences'][0]['date'], '2025-01-13')
+
+    def test_explicit_window_does_not_move(self):
+        window = {'start': '2025-01-01', 'end': '2025-01-31'}
+        etag = self.get(date(2025, 1, 6), **window)['ETag']
+        self.assertEqual(self.get(date(2025, 1, 20), etag, **window).status_code, 304)
+
+    def test_invalid_window(self):
+        self.assertEqual(self.get(date(2025, 1, 6), start='2025-02-30').status_code, 400)
+        self.assertEqual(self.get(date(2025, 1, 6), start='soon').status_code, 400)
@@ -1,13 +1,25 @@
 from django.urls import path
-from .views import ProgramServiceView
+from . import views
+from .models import Programs_Offered, Programs_Scheduled
 
 app_name = 'programms'
 
+# One view per action; literal segments come before the <int:...> routes of the same prefix.
 urlpatterns = [
-    path('programs/', ProgramServiceView.as_view(), name='list_programs_offered'),
-    path('programs/<int:program_id>/', ProgramServiceView.as_view(), name='program_detail'),
-    path('programs/search/', ProgramServiceView.as_view(), name='search_program_for_update'),
-    path('programs/update/<int:program_id>/', ProgramServiceView.as_view(), name='update_program_offered'),
-    path('programs/delete/<int:program_id>/', ProgramServiceView.as_view(), name='delete_program_offered'),
-    path('program/create/', ProgramServiceView.as_view(), name='create_program_offered'),
+    path('programs/', views.ProgramListView.as_view(), name='list_programs_offered'),
+    path('program/create/', views.ProgramCreateView.as_view(), name='create_program_offered'),
+    path('programs/search/', views.ProgramSearchView.as_view(), name='search_program_for_update'),
+    path('programs/bulk/', views.ProgramBulkView.as_view(), name='bulk_programs_offered'),
+    path('programs/export/', views.ProgramExportView.as_view(model=Programs_Offered), name='export_programs_offered'),
+    path('programs/update/<int:program_id>/', views.ProgramUpdateView.as_view(), name='update_program_offered'),
+    path('programs/delete/<int:program_id>/', views.ProgramDeleteView.as_view(), name='delete_program_offered'),
+    path('programs/<int:program_id>/', views.ProgramDetailView.as_view(), name='program_detail'),
+    path('scheduled/', views.ScheduledProgramListView.as_view(), name='list_scheduled_programs'),
+    path('scheduled/bulk/', views.ScheduledProgramBulkView.as_view(), name='bulk_programs_scheduled'),
+    path('scheduled/overlaps/', views.ScheduledOverlapView.as_view(), name='scheduled_overlaps'),
+    path('scheduled/occurrences/', views.ScheduledOccurrencesView.as_view(), name='scheduled_occurrences'),
+    path('scheduled/export/', views.ProgramExportView.as_view(model=Programs_Scheduled), name='export_programs_scheduled'),
+    path('scheduled/<int:program_id>/', views.ScheduledProgramDetailView.as_view(), name='scheduled_program_detail'),
+    path('search/', views.ProgramSearchApiView.as_view(), name='search_programs'),
+    path('cache/stats/', views.ProgramCacheStatsView.as_view(), name='program_cache_stats'),
 ]
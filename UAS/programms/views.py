@@ -1,5 +1,5 @@
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, Http404, StreamingHttpResponse
 from django.views import View
 from django.views.decorators.csrf import csrf_protect
 from django.utils.decorators import method_decorator
@@ -7,78 +7,159 @@ from django.core.exceptions import ValidationError, ObjectDoesNotExist
 from django.urls import reverse
 from .services.programms_service import ProgramServiceImpl
 from .models import Programs_Offered, Programs_Scheduled
+from .services.cache import OFFERED, SCHEDULED, cache_stats
+from .services.versions import catalogue_condition
+from .serializers import ProgramsOfferedSerializer, ProgramsScheduledSerializer
+from UAS.exports import export_from_request
+from UAS.serializers import FastJsonResponse, dumps, fields_from_request
+from .services import occurrences, versions
+from django.utils.dateparse import parse_date
 import logging
 import json
 
 logger = logging.getLogger(__name__)
 
-logger = logging.getLogger(__name__)
 
-class ProgramServiceView(View):
+class ProgramView(View):
+    """
+    Base of the programs offered views; every routed action gets its own subclass.
+    """
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         self.service = ProgramServiceImpl()
-        super().__init__()
+        super().__init__(**kwargs)
 
     @method_decorator(csrf_protect)
     def dispatch(self, request, *args, **kwargs):
         return super().dispatch(request, *args, **kwargs)
 
-    def get(self, request, *args, **kwargs):
-        program_id = kwargs.get('program_id')
-        if 'search' in request.path:
-            return self.search_program_for_update(request)
-        if program_id:
-            if 'update' in request.path:
-                return self.update_program_offered(request, program_id)
-            return self.program_detail(request, program_id)
-        if 'create' in request.path:
-            return render(request, 'create_program.html')
-        return self.list_programs_offered(request, *args, **kwargs)
+    def update_from_json(self, request, program_id):
+        """
+        Apply a JSON body to a program offered (PUT on the detail and update routes).
+        """
+        try:
+            data = json.loads(request.body)
+            program = get_object_or_404(Programs_Offered, pk=program_id)
+            self.service.update_program_offered(apply_program_changes(program, data))
+            return JsonResponse({'message': 'Program updated successfully'})
+        except json.JSONDecodeError:
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        except ValidationError as e:
+            return JsonResponse({'error': f"Validation error: {e.messages}"}, status=400)
+        except Http404:
+            return JsonResponse({'error': 'Program not found'}, status=404)
+        except Exception as e:
+            logger.error(f"Unexpected error while updating program offered: {e}")
+            return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
 
-    def post(self, request, *args, **kwargs):
-        if 'create' in request.path:
-            return self.create_program_offered(request, *args, **kwargs)
-        if 'update' in request.path:
-            program_id = kwargs.get('program_id')
-            return self.update_program_offered(request, program_id)
-        if 'delete' in request.path:
-            program_id = kwargs.get('program_id')
-            return self.delete_program_offered(request, program_id)
-        if 'search' in request.path:
-            return self.search_program_for_update(request, is_post=True)
-        return JsonResponse({'error': 'Invalid request'}, status=400)
 
-    def put(self, request, *args, **kwargs):
-        program_id = kwargs.get('program_id')
-        return self.update_program_offered(request, program_id)
+def apply_program_changes(program, data):
+    """
+    Copy the editable program fields present in `data` onto `program`.
+    """
+    program.ProgramName = data.get('ProgramName', program.ProgramName)
+    program.Description = data.get('Description', program.Description)
+    program.Applicant_eligibility = data.get('Applicant_eligibility', program.Applicant_eligibility)
+    program.Duration = data.get('Duration', program.Duration)
+    program.Degree_certificate_offered = data.get('Degree_certificate_offered', program.Degree_certificate_offered)
+    return program
 
-    def delete(self, request, *args, **kwargs):
-        program_id = kwargs.get('program_id')
-        return self.delete_program_offered(request, program_id)
 
-    def list_programs_offered(self, request, *args, **kwargs):
+class ProgramListView(ProgramView):
+    """
+    GET programs/ - HTML catalogue, or a keyset paginated JSON page for JSON requests.
+    """
+
+    @method_decorator(catalogue_condition(OFFERED))
+    def get(self, request, *args, **kwargs):
         try:
-            programs = self.service.list_all_programs()
             if request.headers.get('Content-Type') == 'application/json':
-                programs_data = [program.__dict__ for program in programs]
-                return JsonResponse({'programs_offered': programs_data})
+                return self.list_programs_offered_page(request)
+            programs = self.service.list_all_programs()
             return render(request, 'programs_offered.html', {'programs_offered': programs})
         except Exception as e:
             logger.error(f"Error fetching programs: {e}")
             return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
 
-    def program_detail(self, request, program_id):
+    def list_programs_offered_page(self, request):
+        """
+        JSON listing paginated on ProgramId, e.g. ?after=120&limit=50&fields=ProgramName,Duration
+        """
         try:
-            program = get_object_or_404(Programs_Offered, pk=program_id)
+            after = request.GET.get('after')
+            before = request.GET.get('before')
+            limit = request.GET.get('limit')
+            page = self.service.list_programs_page(
+                after=int(after) if after else None,
+                before=int(before) if before else None,
+                limit=int(limit) if limit else None,
+                fields=fields_from_request(request),
+            )
+        except ValueError:
+            return JsonResponse({'error': "'after', 'before' and 'limit' must be integers"}, status=400)
+        except ValidationError as e:
+            return JsonResponse({'error': f"Validation error: {e.messages}"}, status=400)
+
+        def page_url(cursor_name, cursor):
+            if cursor is None:
+                return None
+            query = request.GET.copy()
+            query.pop('after', None)
+            query.pop('before', None)
+            query[cursor_name] = cursor
+            return f"{request.path}?{query.urlencode()}"
+
+        return FastJsonResponse({
+            'programs_offered': page['results'],
+            'next': page_url('after', page['next']),
+            'prev': page_url('before', page['prev']),
+        })
+
+
+class ProgramDetailView(ProgramView):
+    """
+    programs/<id>/ - GET the program, PUT a JSON update, DELETE it.
+    """
+
+    @method_decorator(catalogue_condition(OFFERED))
+    def get(self, request, program_id, *args, **kwargs):
+        try:
+            program = self.service.get_program_offered(program_id)
             if request.headers.get('Content-Type') == 'application/json':
-                return JsonResponse(program.__dict__)
+                return FastJsonResponse(ProgramsOfferedSerializer.to_dict(program, fields_from_request(request)))
             return render(request, 'program_detail.html', {'program': program})
+        except ValidationError as e:
+            return JsonResponse({'error': f"Validation error: {e.messages}"}, status=400)
+        except ObjectDoesNotExist:
+            return JsonResponse({'error': 'Program not found'}, status=404)
         except Exception as e:
             logger.error(f"Unexpected error while fetching program details: {e}")
             return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
 
-    def create_program_offered(self, request, *args, **kwargs):
+    def put(self, request, program_id, *args, **kwargs):
+        return self.update_from_json(request, program_id)
+
+    def delete(self, request, program_id, *args, **kwargs):
+        try:
+            program = get_object_or_404(Programs_Offered, pk=program_id)
+            self.service.delete_program_offered(program.ProgramName)
+            return JsonResponse({'message': 'Program deleted successfully'})
+        except Http404:
+            return JsonResponse({'error': 'Program not found'}, status=404)
+        except Exception as e:
+            logger.error(f"Unexpected error while deleting program offered: {e}")
+            return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
+
+
+class ProgramCreateView(ProgramView):
+    """
+    program/create/ - GET the form, POST the form or a JSON body.
+    """
+
+    def get(self, request, *args, **kwargs):
+        return render(request, 'create_program.html')
+
+    def post(self, request, *args, **kwargs):
         if request.headers.get('Content-Type') == 'application/json':
             try:
                 data = json.loads(request.body)
@@ -107,7 +188,7 @@ class ProgramServiceView(View):
                     Degree_certificate_offered=data.get('Degree_certificate_offered')
                 )
                 self.service.add_program_offered(new_program)
-                return redirect(reverse('programms:program_detail', args=[new_program.id]))
+                return redirect(reverse('programms:program_detail', args=[new_program.pk]))
             except ValidationError as e:
                 logger.error(f"Validation error while adding program offered: {e}")
                 return render(request, 'create_program.html', {'error': f"Validation error: {e.messages}"})
@@ -115,101 +196,110 @@ class ProgramServiceView(View):
                 logger.error(f"Unexpected error while adding program offered: {e}")
                 return render(request, 'create_program.html', {'error': 'Unexpected error occurred'})
 
-    def search_program_for_update(self, request, is_post=False):
-        if is_post:
-            description = request.POST.get('Description')
-            if not description:
-                return render(request, 'search_program_for_update.html', {'error': 'Description is required'})
-            try:
-                # Search for the program based on Description
-                program = Programs_Offered.objects.get(Description=description)
-                return redirect(reverse('programms:update_program_offered', args=[program.pk]))
-            except ObjectDoesNotExist:
-                return render(request, 'search_program_for_update.html', {'error': 'Program not found'})
-        return render(request, 'search_program_for_update.html')
 
+class ProgramSearchView(ProgramView):
+    """
+    programs/search/ - find a program by name or description and continue to its update form.
+    """
+
+    def get(self, request, *args, **kwargs):
+        return render(request, 'search_program_for_update.html')
 
-    def update_program_offered(self, request, program_id):
+    def post(self, request, *args, **kwargs):
+        description = request.POST.get('Description')
+        if not description:
+            return render(request, 'search_program_for_update.html', {'error': 'Description is required'})
         try:
-            if request.method == 'GET':
-                # Fetch and display the program details for updating
-                program = get_object_or_404(Programs_Offered, pk=program_id)
-                return render(request, 'update_program.html', {'program': program})
+            programs = self.service.search_programs(description, page_size=20)['results']
+        except ValidationError as e:
+            return render(request, 'search_program_for_update.html', {'error': f"Validation error: {e.messages}"})
+        if not programs:
+            return render(request, 'search_program_for_update.html', {'error': 'Program not found'})
+        if len(programs) == 1:
+            return redirect(reverse('programms:update_program_offered', args=[programs[0]['ProgramId']]))
+        return render(request, 'search_program_for_update.html', {'programs': programs})
 
-            elif request.method == 'POST':
-                # Handle form submission to update the program
-                data = request.POST
-                program = get_object_or_404(Programs_Offered, pk=program_id)
-                program.ProgramName = data.get('ProgramName', program.ProgramName)
-                program.Description = data.get('Description', program.Description)
-                program.Applicant_eligibility = data.get('Applicant_eligibility', program.Applicant_eligibility)
-                program.Duration = data.get('Duration', program.Duration)
-                program.Degree_certificate_offered = data.get('Degree_certificate_offered', program.Degree_certificate_offered)
-                self.service.update_program_offered(program)
-                return redirect(reverse('programms:program_detail', args=[program.pk]))
-
-            elif request.method == 'PUT':
-                # Handle API request for updating the program
-                data = json.loads(request.body)
-                program = get_object_or_404(Programs_Offered, pk=program_id)
-                program.ProgramName = data.get('ProgramName', program.ProgramName)
-                program.Description = data.get('Description', program.Description)
-                program.Applicant_eligibility = data.get('Applicant_eligibility', program.Applicant_eligibility)
-                program.Duration = data.get('Duration', program.Duration)
-                program.Degree_certificate_offered = data.get('Degree_certificate_offered', program.Degree_certificate_offered)
-                self.service.update_program_offered(program)
-                return JsonResponse({'message': 'Program updated successfully'})
 
+class ProgramSearchApiView(ProgramView):
+    """
+    GET search/?q=...&kind=offered|scheduled&page=1&page_size=50 - ranked JSON search results.
+    """
+
+    def get(self, request, *args, **kwargs):
+        try:
+            page = request.GET.get('page')
+            page_size = request.GET.get('page_size')
+            result = self.service.search_programs(
+                request.GET.get('q', ''),
+                kind=request.GET.get('kind', OFFERED),
+                page=int(page) if page else 1,
+                page_size=int(page_size) if page_size else None,
+            )
+            return FastJsonResponse(result)
+        except ValueError:
+            return JsonResponse({'error': "'page' and 'page_size' must be integers"}, status=400)
         except ValidationError as e:
             return JsonResponse({'error': f"Validation error: {e.messages}"}, status=400)
-        except ObjectDoesNotExist:
-            return JsonResponse({'error': 'Program not found'}, status=404)
         except Exception as e:
-            logger.error(f"Unexpected error while updating program offered: {e}")
+            logger.error(f"Unexpected error while searching programs: {e}")
             return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
 
-    def delete_program_offered(self, request, *args, **kwargs):
-        try:
-            if request.method == 'GET':
-                program_id = kwargs.get('program_id')
-                program = get_object_or_404(Programs_Offered, pk=program_id)
-                return render(request, 'delete_program.html', {'program': program})
 
-            elif request.method == 'POST':
-                program_id = kwargs.get('program_id')
-                program = get_object_or_404(Programs_Offered, pk=program_id)
-                self.service.delete_program_offered(program)
-                return redirect(reverse('programms:list_programs_offered'))
+class ProgramUpdateView(ProgramView):
+    """
+    programs/update/<id>/ - GET the form, POST the form; PUT is kept for API clients.
+    """
 
-        except ObjectDoesNotExist:
-            return JsonResponse({'error': 'Program not found'}, status=404)
+    def get(self, request, program_id, *args, **kwargs):
+        program = get_object_or_404(Programs_Offered, pk=program_id)
+        return render(request, 'update_program.html', {'program': program})
+
+    def post(self, request, program_id, *args, **kwargs):
+        try:
+            program = get_object_or_404(Programs_Offered, pk=program_id)
+            self.service.update_program_offered(apply_program_changes(program, request.POST))
+            return redirect(reverse('programms:program_detail', args=[program.pk]))
+        except ValidationError as e:
+            context = {'program': program, 'error': f"Validation error: {e.messages}"}
+            return render(request, 'update_program.html', context)
+        except Http404:
+            raise
         except Exception as e:
-            logger.error(f"Unexpected error while deleting program offered: {e}")
+            logger.error(f"Unexpected error while updating program offered: {e}")
             return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
 
+    def put(self, request, program_id, *args, **kwargs):
+        return self.update_from_json(request, program_id)
 
-class ScheduledProgramServiceView(View):
 
-    def __init__(self):
-        self.service = ProgramServiceImpl()
+class ProgramDeleteView(ProgramView):
+    """
+    programs/delete/<id>/ - GET the confirmation page, POST to delete.
+    """
 
-    @method_decorator(csrf_protect)
-    def dispatch(self, *args, **kwargs):
-        return super().dispatch(*args, **kwargs)
-    
-    def get(self, request, *args, **kwargs):
-        return self.list_scheduled_programs(request, *args, **kwargs)
+    def get(self, request, program_id, *args, **kwargs):
+        program = get_object_or_404(Programs_Offered, pk=program_id)
+        return render(request, 'delete_program.html', {'program': program})
 
-    def post(self, request, *args, **kwargs):
-        return self.create_scheduled_program(request, *args, **kwargs)
+    def post(self, request, program_id, *args, **kwargs):
+        try:
+            program = get_object_or_404(Programs_Offered, pk=program_id)
+            self.service.delete_program_offered(program.ProgramName)
+            return redirect(reverse('programms:list_programs_offered'))
+        except Http404:
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error while deleting program offered: {e}")
+            return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
 
-    def put(self, request, *args, **kwargs):
-        return self.update_scheduled_program(request, *args, **kwargs)
 
-    def delete(self, request, *args, **kwargs):
-        return self.delete_scheduled_program(request, *args, **kwargs)
+class ScheduledProgramListView(ProgramView):
+    """
+    scheduled/ - GET the sessions (optionally ?program_name=...), POST a JSON session to create it.
+    """
 
-    def list_scheduled_programs(self, request, *args, **kwargs):
+    @method_decorator(catalogue_condition(SCHEDULED))
+    def get(self, request, *args, **kwargs):
         try:
             program_name = request.GET.get('program_name')
             if program_name:
@@ -217,14 +307,16 @@ class ScheduledProgramServiceView(View):
             else:
                 programs = Programs_Scheduled.objects.all()
             if request.headers.get('Content-Type') == 'application/json':
-                programs_data = [program.__dict__ for program in programs]
-                return JsonResponse({'programs_scheduled': programs_data})
+                programs_data = ProgramsScheduledSerializer.to_list(programs, fields_from_request(request))
+                return FastJsonResponse({'programs_scheduled': programs_data})
             return render(request, 'scheduled_programs.html', {'programs_scheduled': programs})
+        except ValidationError as e:
+            return JsonResponse({'error': f"Validation error: {e.messages}"}, status=400)
         except Exception as e:
             logger.error(f"Error fetching scheduled programs: {e}")
             return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
 
-    def create_scheduled_program(self, request, *args, **kwargs):
+    def post(self, request, *args, **kwargs):
         try:
             data = json.loads(request.body)
             new_program = Programs_Scheduled(
@@ -232,41 +324,228 @@ class ScheduledProgramServiceView(View):
                 Location=data['Location'],
                 Start_Date=data['Start_Date'],
                 End_Date=data['End_Date'],
-                sessions_per_week=data['sessions_per_week']
+                sessions_per_week=data['sessions_per_week'],
+                capacity=data.get('capacity'),
             )
             self.service.create_scheduled_program(new_program)
             return JsonResponse({'message': 'Scheduled program created successfully'}, status=201)
+        except (json.JSONDecodeError, KeyError):
+            return JsonResponse({'error': 'Invalid request'}, status=400)
+        except ValidationError as e:
+            return JsonResponse({'error': f"Validation error: {e.messages}"}, status=400)
+        except Exception as e:
+            logger.error(f"Unexpected error while creating scheduled program: {e}")
+            return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
+
+
+class ScheduledOverlapView(ProgramView):
+    """
+    GET scheduled/overlaps/?location=...&start=YYYY-MM-DD&end=YYYY-MM-DD[&exclude=<id>] - sessions in conflict.
+
+    Without a location, audits the whole schedule (or ?audit_location=...) and lists the first ?limit= pairs.
+    """
+
+    def get(self, request, *args, **kwargs):
+        try:
+            location = request.GET.get('location')
+            if location is None:
+                limit = request.GET.get('limit')
+                return FastJsonResponse(self.service.audit_schedule_conflicts(
+                    request.GET.get('audit_location'), limit=int(limit) if limit else 100
+                ))
+            start_date = parse_date(request.GET.get('start', ''))
+            end_date = parse_date(request.GET.get('end', ''))
+            if start_date is None or end_date is None:
+                raise ValidationError("'start' and 'end' must be dates (YYYY-MM-DD).")
+            exclude_id = request.GET.get('exclude')
+            overlaps = self.service.find_schedule_overlaps(
+                location, start_date, end_date, exclude_id=int(exclude_id) if exclude_id else None
+            )
+            return FastJsonResponse({'overlaps': overlaps})
+        except ValueError:
+            return JsonResponse({'error': "Invalid 'start', 'end', 'exclude' or 'limit' parameter"}, status=400)
+        except ValidationError as e:
+            return JsonResponse({'error': f"Validation error: {e.messages}"}, status=400)
+        except Exception as e:
+            logger.error(f"Unexpected error while checking schedule overlaps: {e}")
+            return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
+
+
+def occurrence_window(request):
+    """
+    Resolve the (start, end) dates of an occurrences request; either is None when unparseable.
+
+    :raises ValueError: For well-formed but impossible dates such as 2025-02-30.
+    """
+    start_date, end_date = occurrences.default_window()
+    if request.GET.get('start'):
+        start_date = parse_date(request.GET['start'])
+    if request.GET.get('end'):
+        end_date = parse_date(request.GET['end'])
+    return start_date, end_date
+
+
+def _occurrence_window_tag(request):
+    try:
+        return occurrence_window(request)
+    except ValueError:
+        return None
+
+
+class ScheduledOccurrencesView(ProgramView):
+    """
+    GET scheduled/occurrences/?program=<id>|location=...&start=YYYY-MM-DD&end=YYYY-MM-DD&format=json|ics
+
+    Streams the session dates in the window (default: today plus PROGRAMS_OCCURRENCES_DEFAULT_DAYS)
+    as JSON or as an iCalendar feed.
+    """
+
+    @method_decorator(catalogue_condition(SCHEDULED, window=_occurrence_window_tag))
+    def get(self, request, *args, **kwargs):
+        try:
+            if request.GET.get('program'):
+                scope, key = 'program', int(request.GET['program'])
+            elif request.GET.get('location'):
+                scope, key = 'location', request.GET['location']
+            else:
+                raise ValidationError("Either 'program' or 'location' is required.")
+            start_date, end_date = occurrence_window(request)
+            if start_date is None or end_date is None:
+                raise ValidationError("'start' and 'end' must be dates (YYYY-MM-DD).")
+            fmt = request.GET.get('format', 'json')
+            if fmt not in ('json', 'ics'):
+                raise ValidationError("'format' must be 'json' or 'ics'.")
+
+            items = self.service.list_occurrences(scope, key, start_date, end_date)
+            if fmt == 'ics':
+                name = f"Scheduled program {key}" if scope == 'program' else key
+                stamp = versions.current(SCHEDULED)[1]
+                response = StreamingHttpResponse(
+                    occurrences.ical_lines(items, name, stamp), content_type='text/calendar; charset=utf-8'
+                )
+                response['Content-Disposition'] = f'attachment; filename="{scope}-sessions.ics"'
+                return response
+            return StreamingHttpResponse(occurrences.json_chunks(items, dumps), content_type='application/json')
+        except ValueError:
+            return JsonResponse({'error': "Invalid 'program', 'start' or 'end' parameter"}, status=400)
         except ValidationError as e:
             return JsonResponse({'error': f"Validation error: {e.messages}"}, status=400)
+        except ObjectDoesNotExist:
+            return JsonResponse({'error': 'Scheduled program not found'}, status=404)
         except Exception as e:
+            logger.error(f"Unexpected error while listing session occurrences: {e}")
             return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
 
-    def update_scheduled_program(self, request, *args, **kwargs):
+
+class ScheduledProgramDetailView(ProgramView):
+    """
+    scheduled/<id>/ - PUT a JSON update of the session, DELETE it.
+    """
+
+    def put(self, request, program_id, *args, **kwargs):
         try:
             data = json.loads(request.body)
-            program_id = data['Scheduled_program_id']
             program = get_object_or_404(Programs_Scheduled, pk=program_id)
             program.ProgramName = data.get('ProgramName', program.ProgramName)
             program.Location = data.get('Location', program.Location)
             program.Start_Date = data.get('Start_Date', program.Start_Date)
             program.End_Date = data.get('End_Date', program.End_Date)
             program.sessions_per_week = data.get('sessions_per_week', program.sessions_per_week)
+            program.capacity = data.get('capacity', program.capacity)
             self.service.update_scheduled_program(program)
             return JsonResponse({'message': 'Scheduled program updated successfully'}, status=200)
+        except json.JSONDecodeError:
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
         except ValidationError as e:
             return JsonResponse({'error': f"Validation error: {e.messages}"}, status=400)
-        except ObjectDoesNotExist:
+        except Http404:
             return JsonResponse({'error': 'Scheduled program not found'}, status=404)
         except Exception as e:
+            logger.error(f"Unexpected error while updating scheduled program: {e}")
             return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
 
-    def delete_scheduled_program(self, request, *args, **kwargs):
+    def delete(self, request, program_id, *args, **kwargs):
         try:
-            data = json.loads(request.body)
-            program_id = data['Scheduled_program_id']
             self.service.delete_scheduled_program(program_id)
             return JsonResponse({'message': 'Scheduled program deleted successfully'}, status=200)
         except ObjectDoesNotExist:
             return JsonResponse({'error': 'Scheduled program not found'}, status=404)
         except Exception as e:
+            logger.error(f"Unexpected error while deleting scheduled program: {e}")
+            return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
+
+
+class ProgramExportView(View):
+    """
+    Streams a whole program table as NDJSON or CSV (?format=ndjson|csv&fields=...).
+    """
+    model = None
+
+    def get(self, request, *args, **kwargs):
+        try:
+            return export_from_request(request, self.model.objects.all())
+        except ValidationError as e:
+            return JsonResponse({'error': f"Validation error: {e.messages}"}, status=400)
+        except Exception as e:
+            logger.error(f"Unexpected error while exporting {self.model.__name__}: {e}")
             return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
+
+
+class ProgramCacheStatsView(View):
+    """
+    Per-process hit/miss counters of the program catalogue cache.
+    """
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({'program_cache': cache_stats()})
+
+
+class ProgramBulkView(ProgramView):
+    """
+    Batch endpoint for programs offered.
+
+    POST a JSON array of programs to create them, DELETE a JSON array of ids to remove them.
+    """
+
+    def post(self, request, *args, **kwargs):
+        return bulk_response(lambda data: self.service.bulk_add_programs_offered(data), request)
+
+    def delete(self, request, *args, **kwargs):
+        return bulk_response(lambda data: self.service.bulk_delete('offered', data), request)
+
+
+class ScheduledProgramBulkView(ProgramBulkView):
+    """
+    Batch endpoint for scheduled programs.
+
+    POST or PUT a JSON array to upsert sessions (on Scheduled_program_id when given),
+    DELETE a JSON array of ids to remove them.
+    """
+
+    def post(self, request, *args, **kwargs):
+        return bulk_response(lambda data: self.service.bulk_upsert_scheduled_programs(data), request)
+
+    def put(self, request, *args, **kwargs):
+        return self.post(request, *args, **kwargs)
+
+    def delete(self, request, *args, **kwargs):
+        return bulk_response(lambda data: self.service.bulk_delete('scheduled', data), request)
+
+
+def bulk_response(operation, request):
+    """
+    Run a bulk service operation on the request's JSON array and report per-item results.
+    """
+    try:
+        data = json.loads(request.body)
+        results = operation(data)
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    except ValidationError as e:
+        return JsonResponse({'error': f"Validation error: {e.messages}"}, status=400)
+    except Exception as e:
+        logger.error(f"Unexpected error during bulk operation: {e}")
+        return JsonResponse({'error': 'Unexpected error occurred'}, status=500)
+
+    failed = any(result['status'] == 'error' for result in results)
+    return JsonResponse({'results': results}, status=400 if failed else 200)
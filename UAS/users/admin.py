@@ -2,4 +2,5 @@ from django.contrib import admin
 from users.models import *
 
 # Register your models here.
-admin.site.register(Users)
\ No newline at end of file
+admin.site.register(Users)
+admin.site.register(OutboundEmail)
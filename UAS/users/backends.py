@@ -0,0 +1,76 @@
+"""
+Authentication backend that serves `get_user` from cache.
+
+Users are looked up in a small per-process LRU first, then in the shared
+Django cache (USERS_CACHE_ALIAS), and only then in the user_data table.
+Every entry is keyed by user_id plus a version stamp that is read from
+USERS_CACHE_ALIAS on each lookup. `Users.save` and the UsersQuerySet write
+methods bump the stamp once their transaction commits, so a process drops
+the old row on its next lookup as long as the alias is shared between
+processes (the users.E001 check refuses local memory with several workers).
+Both tiers also expire entries after USERS_CACHE_TIMEOUT.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from .cache import get_cache, get_version
+
+
+class LRUCache:
+    """
+    Minimal thread-safe LRU mapping used as the per-process tier; entries expire after `ttl` seconds.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_local_users = LRUCache(getattr(settings, 'USERS_LRU_SIZE', 1024), getattr(settings, 'USERS_CACHE_TIMEOUT', 300))
+
+
+class CachedModelBackend(ModelBackend):
+
+    def get_user(self, user_id):
+        version = get_version(user_id)
+        key = f'users:user:{user_id}:v{version}'
+
+        user = _local_users.get(key)
+        if user is None:
+            user = get_cache().get(key)
+            if user is None:
+                user = super().get_user(user_id)
+                if user is None:
+                    return None
+                get_cache().set(key, user, getattr(settings, 'USERS_CACHE_TIMEOUT', 300))
+            _local_users.set(key, user)
+        # Each request gets its own instance so per-request mutations never leak.
+        return copy.copy(user)
@@ -0,0 +1,42 @@
+"""
+Version stamps for cached Users rows (see users.backends).
+"""
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+def get_cache():
+    return caches[getattr(settings, 'USERS_CACHE_ALIAS', 'default')]
+
+
+def _version_key(user_id):
+    return f'users:user:{user_id}:version'
+
+
+def get_version(user_id):
+    cache = get_cache()
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        cache.add(_version_key(user_id), time.time_ns(), None)
+        version = cache.get(_version_key(user_id))
+    return version
+
+
+def _bump(user_id):
+    cache = get_cache()
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), time.time_ns(), None)
+
+
+def invalidate_user(user_id, using=None):
+    """
+    Make every process drop its cached copy of `user_id` once the current transaction commits.
+
+    Bumping earlier would let a concurrent lookup cache the old, still committed row
+    under the new stamp.
+    """
+    transaction.on_commit(lambda: _bump(user_id), using=using)
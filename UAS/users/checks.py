@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, Tags, register
+
+
+@register(Tags.caches)
+def check_users_cache_is_shared(app_configs, **kwargs):
+    """
+    The user version stamps (users.cache) only reach other workers through a shared cache.
+    """
+    alias = getattr(settings, 'USERS_CACHE_ALIAS', 'default')
+    workers = getattr(settings, 'WEB_CONCURRENCY', 1)
+    if workers > 1 and isinstance(caches[alias], LocMemCache):
+        return [Error(
+            f"USERS_CACHE_ALIAS '{alias}' is a per-process LocMemCache but WEB_CONCURRENCY is {workers}.",
+            hint="Point USERS_CACHE_ALIAS at a cache shared by all workers (Redis, Memcached, database), "
+                 "otherwise logged-in users keep their old role and flags in other workers.",
+            id='users.E001',
+        )]
+    return []
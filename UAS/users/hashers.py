@@ -0,0 +1,66 @@
+"""
+Password hashers whose cost parameters come from settings.
+
+PASSWORD_HASHER_ALGORITHM picks the preferred hasher in PASSWORD_HASHERS and
+PASSWORD_HASHER_PARAMS holds the cost parameters for each algorithm. The
+algorithm names are Django's own, so existing hashes keep verifying. When
+the parameters or the preferred algorithm change, Django's must_update check
+makes `check_password` rehash the password on the user's next successful
+login. `manage.py calibrate_password_hasher` picks parameters for a target
+hashing time on the current host.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher, ScryptPasswordHasher
+
+
+def hasher_params(algorithm):
+    return getattr(settings, 'PASSWORD_HASHER_PARAMS', {}).get(algorithm, {})
+
+
+class PolicyPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+
+    @property
+    def iterations(self):
+        return hasher_params('pbkdf2').get('iterations', PBKDF2PasswordHasher.iterations)
+
+
+class PolicyArgon2PasswordHasher(Argon2PasswordHasher):
+
+    @property
+    def time_cost(self):
+        return hasher_params('argon2').get('time_cost', Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return hasher_params('argon2').get('memory_cost', Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return hasher_params('argon2').get('parallelism', Argon2PasswordHasher.parallelism)
+
+
+class PolicyScryptPasswordHasher(ScryptPasswordHasher):
+
+    @property
+    def work_factor(self):
+        return hasher_params('scrypt').get('work_factor', ScryptPasswordHasher.work_factor)
+
+    @property
+    def block_size(self):
+        return hasher_params('scrypt').get('block_size', ScryptPasswordHasher.block_size)
+
+    @property
+    def parallelism(self):
+        return hasher_params('scrypt').get('parallelism', ScryptPasswordHasher.parallelism)
+
+    @property
+    def maxmem(self):
+        # OpenSSL's default limit (32 MiB) is too small for work factors above 2**14.
+        return hasher_params('scrypt').get('maxmem', 0) or 256 * self.work_factor * self.block_size
+
+
+POLICY_HASHERS = {
+    'pbkdf2': PolicyPBKDF2PasswordHasher,
+    'argon2': PolicyArgon2PasswordHasher,
+    'scrypt': PolicyScryptPasswordHasher,
+}
@@ -0,0 +1,58 @@
+import logging
+import os
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+from django.core.management.base import BaseCommand
+from UAS.log import JSONFormatter, QueuedRotatingFileHandler, RequestIdFilter, SamplingFilter
+
+
+MESSAGE = "Program offered updated: %s (%s)"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the request-thread cost of service logging: synchronous RotatingFileHandler with "
+        "eager f-strings (previous setup) against the queued JSON pipeline with lazy %-style arguments."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--records', type=int, default=50000, help="Log calls per configuration.")
+        parser.add_argument('--sample-rate', type=float, default=0.1,
+                            help="Fraction of INFO lines kept by the sampling filter in the queued setup.")
+
+    def handle(self, *args, **options):
+        records = options['records']
+        with tempfile.TemporaryDirectory() as directory:
+            sync_handler = RotatingFileHandler(os.path.join(directory, 'sync.log'), maxBytes=80485760, backupCount=5)
+            sync_handler.setFormatter(logging.Formatter('{levelname} {asctime} {module} {message}', style='{'))
+            sync_elapsed = self.run('bench.sync', sync_handler, records, lazy=False)
+            sync_handler.close()
+
+            queued_handler = QueuedRotatingFileHandler(os.path.join(directory, 'queued.log'),
+                                                       maxBytes=80485760, backupCount=5, queue_size=records)
+            queued_handler.setFormatter(JSONFormatter())
+            queued_handler.addFilter(RequestIdFilter())
+            queued_handler.addFilter(SamplingFilter({'bench.queued': {MESSAGE: options['sample_rate']}}))
+            queued_elapsed = self.run('bench.queued', queued_handler, records, lazy=True)
+            queued_handler.close()
+
+        for label, elapsed in (('synchronous + f-strings', sync_elapsed), ('queued + lazy + sampled', queued_elapsed)):
+            self.stdout.write(f"{label}: {elapsed * 1e6 / records:.2f} us per log call on the request thread "
+                              f"({records / elapsed:,.0f} calls/s)")
+        self.stdout.write(self.style.SUCCESS(f"Speed-up: {sync_elapsed / queued_elapsed:.1f}x"))
+
+    def run(self, name, handler, records, lazy):
+        logger = logging.getLogger(name)
+        logger.handlers = [handler]
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        program = {'ProgramId': 42, 'ProgramName': 'Data Science', 'Duration': 12}
+
+        started = time.perf_counter()
+        for i in range(records):
+            if lazy:
+                logger.info(MESSAGE, program['ProgramName'], i)
+            else:
+                logger.info(f"Program offered updated: {program['ProgramName']} ({i})")
+        return time.perf_counter() - started
@@ -0,0 +1,75 @@
+import os
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from users.hashers import POLICY_HASHERS
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure password hashing time on this host, suggest PASSWORD_HASHER_PARAMS that hit a "
+        "target time per hash, and report login verifications per second per core."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--algorithm', choices=sorted(POLICY_HASHERS),
+                            default=getattr(settings, 'PASSWORD_HASHER_ALGORITHM', 'pbkdf2'))
+        parser.add_argument('--target-ms', type=float, default=100.0, help="Time budget per hash in milliseconds.")
+        parser.add_argument('--samples', type=int, default=5, help="Hashes timed per measurement.")
+        parser.add_argument('--benchmark-only', action='store_true',
+                            help="Only report verifications/sec for the configured parameters.")
+
+    def handle(self, *args, **options):
+        algorithm = options['algorithm']
+        samples = options['samples']
+        target = options['target_ms'] / 1000
+        current = dict(getattr(settings, 'PASSWORD_HASHER_PARAMS', {}).get(algorithm, {}))
+
+        if options['benchmark_only']:
+            self.report(algorithm, current, samples)
+            return
+
+        if algorithm == 'pbkdf2':
+            probe = {'iterations': 100_000}
+            elapsed = self.measure(algorithm, probe, samples)
+            params = {'iterations': max(100_000, int(probe['iterations'] * target / elapsed) // 1000 * 1000)}
+        elif algorithm == 'argon2':
+            params = {'time_cost': 1, 'memory_cost': current.get('memory_cost', 102400),
+                      'parallelism': current.get('parallelism', 8)}
+            while self.measure(algorithm, params, samples) < target:
+                params['time_cost'] += 1
+            params['time_cost'] = max(1, params['time_cost'] - 1)
+        else:
+            params = {'work_factor': 2 ** 14, 'block_size': current.get('block_size', 8),
+                      'parallelism': current.get('parallelism', 1)}
+            while self.measure(algorithm, params, samples) < target:
+                params['work_factor'] *= 2
+            params['work_factor'] = max(2 ** 14, params['work_factor'] // 2)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Suggested parameters for {algorithm}:"))
+        self.stdout.write(f'PASSWORD_HASHER_PARAMS["{algorithm}"] = {params!r}')
+        self.report(algorithm, params, samples)
+
+    def measure(self, algorithm, params, samples):
+        """
+        Mean seconds per hash for `algorithm` with `params`.
+        """
+        with override_settings(PASSWORD_HASHER_PARAMS={algorithm: params}):
+            try:
+                hasher = POLICY_HASHERS[algorithm]()
+                salt = hasher.salt()
+                hasher.encode('calibration-password', salt)
+                started = time.perf_counter()
+                for _ in range(samples):
+                    hasher.encode('calibration-password', salt)
+            except ValueError as e:
+                raise CommandError(f"{algorithm} hasher unavailable: {e}")
+        return (time.perf_counter() - started) / samples
+
+    def report(self, algorithm, params, samples):
+        elapsed = self.measure(algorithm, params, samples)
+        self.stdout.write(self.style.SUCCESS(
+            f"{algorithm} {params}: {elapsed * 1000:.1f} ms per hash, "
+            f"{1 / elapsed:.1f} logins/sec per core ({os.cpu_count()} cores on this host)."
+        ))
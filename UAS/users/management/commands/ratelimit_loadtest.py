@@ -0,0 +1,49 @@
+import json
+import time
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from users.ratelimit import get_backend
+from users.views import UserLoginView
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate credential-stuffing bursts against the login view and report how many attempts "
+        "reached password verification versus how many were throttled."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attempts', type=int, default=2000, help="Attempts per scenario.")
+        parser.add_argument('--login-id', default='loadtest-victim')
+
+    def handle(self, *args, **options):
+        attempts = options['attempts']
+        scenarios = {
+            'one account, many IPs': lambda i: (options['login_id'], f'10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}'),
+            'many accounts, one IP': lambda i: (f'{options["login_id"]}-{i}', '192.0.2.1'),
+        }
+        factory = RequestFactory()
+        view = UserLoginView.as_view()
+
+        for name, attempt in scenarios.items():
+            get_backend().reset()
+            verified = throttled = 0
+            started = time.perf_counter()
+            for i in range(attempts):
+                login_id, ip = attempt(i)
+                request = factory.post(
+                    '/users/login/',
+                    json.dumps({'login_id': login_id, 'password': 'wrong-password', 'role': 'user'}),
+                    content_type='application/json',
+                    REMOTE_ADDR=ip,
+                )
+                request._dont_enforce_csrf_checks = True
+                if view(request).status_code == 429:
+                    throttled += 1
+                else:
+                    verified += 1
+            elapsed = time.perf_counter() - started
+            self.stdout.write(self.style.SUCCESS(
+                f"{name}: {attempts} attempts in {elapsed:.2f}s, {verified} reached authenticate, "
+                f"{throttled} throttled."
+            ))
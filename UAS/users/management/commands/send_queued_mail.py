@@ -0,0 +1,31 @@
+import time
+from django.core.management.base import BaseCommand
+from users.services.mail_service import MailQueueServiceImpl
+
+
+class Command(BaseCommand):
+    help = "Deliver emails queued in the outbound_email table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help="Messages per SMTP connection (defaults to MAIL_OUTBOX_BATCH_SIZE).")
+        parser.add_argument('--loop', action='store_true',
+                            help="Keep polling the outbox instead of exiting once it is drained.")
+        parser.add_argument('--interval', type=float, default=5.0,
+                            help="Seconds to sleep between polls when --loop is set.")
+
+    def handle(self, *args, **options):
+        service = MailQueueServiceImpl()
+        total_sent = total_failed = 0
+
+        while True:
+            sent, failed = service.deliver_pending(batch_size=options['batch_size'])
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f"Sent {total_sent} email(s), {total_failed} failed."))
@@ -0,0 +1,34 @@
+import logging
+from django.core import signing
+from django.http import JsonResponse
+from .tokens import verify_token
+
+logger = logging.getLogger(__name__)
+
+
+class TokenAuthenticationMiddleware:
+    """
+    Authenticates `Authorization: Bearer <token>` requests from the signed token alone.
+
+    Must come after AuthenticationMiddleware. request.user is replaced before
+    anything evaluates the lazy session user, so token requests never read the
+    session or the user_data table. Header tokens are not sent automatically
+    by browsers, so these requests are exempt from CSRF checks.
+    """
+    keyword = 'Bearer'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        if header.startswith(self.keyword + ' '):
+            try:
+                request.user = verify_token(header[len(self.keyword) + 1:].strip())
+            except signing.SignatureExpired:
+                return JsonResponse({'error': 'Token expired'}, status=401)
+            except signing.BadSignature:
+                logger.warning("Rejected request with an invalid API token")
+                return JsonResponse({'error': 'Invalid token'}, status=401)
+            request._dont_enforce_csrf_checks = True
+        return self.get_response(request)
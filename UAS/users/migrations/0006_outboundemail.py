@@ -0,0 +1,89 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:52
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0005_users_groups_users_user_permissions_alter_users_role"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboundEmail",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("subject", models.CharField(max_length=255, verbose_name="Subject")),
+                ("body", models.TextField(verbose_name="Body")),
+                (
+                    "from_email",
+                    models.CharField(
+                        blank=True, max_length=254, verbose_name="From Email"
+                    ),
+                ),
+                (
+                    "recipients",
+                    models.TextField(
+                        help_text="Comma separated list of addresses.",
+                        verbose_name="Recipients",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("sent", "Sent"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Attempts"
+                    ),
+                ),
+                ("last_error", models.TextField(blank=True, verbose_name="Last Error")),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Next Attempt At",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+                (
+                    "sent_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="Sent At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Outbound Email",
+                "verbose_name_plural": "Outbound Emails",
+                "db_table": "outbound_email",
+                "indexes": [
+                    models.Index(
+                        fields=["status", "next_attempt_at"],
+                        name="outbound_email_due_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,14 +1,36 @@
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import EmailValidator
 import logging
+from .cache import invalidate_user
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-class CustomUserManager(BaseUserManager):
+class UsersQuerySet(models.QuerySet):
+    """
+    Queryset whose bulk writes invalidate the cached copies served by users.backends.
+    """
+
+    def update(self, **kwargs):
+        user_ids = list(self.values_list('pk', flat=True))
+        updated = super().update(**kwargs)
+        for user_id in user_ids:
+            invalidate_user(user_id, using=self.db)
+        return updated
+
+    def delete(self):
+        user_ids = list(self.values_list('pk', flat=True))
+        deleted = super().delete()
+        for user_id in user_ids:
+            invalidate_user(user_id, using=self.db)
+        return deleted
+
+
+class CustomUserManager(BaseUserManager.from_queryset(UsersQuerySet)):
     def create_user(self, login_id, password=None, role='user', **extra_fields):
         """
         Create and return a regular user with a login_id, password, and role.
@@ -75,6 +97,7 @@ class Users(AbstractBaseUser, PermissionsMixin):
         try:
             self.clean()
             super().save(*args, **kwargs)
+            invalidate_user(self.pk, using=self._state.db)
             logger.info(f"User saved successfully: {self.login_id}")
         except ValidationError as e:
             logger.error(f"Validation error while saving user {self.login_id}: {e}")
@@ -83,6 +106,12 @@ class Users(AbstractBaseUser, PermissionsMixin):
             logger.error(f"Unexpected error while saving user {self.login_id}: {e}")
             raise
 
+    def delete(self, *args, **kwargs):
+        user_id, using = self.pk, self._state.db
+        result = super().delete(*args, **kwargs)
+        invalidate_user(user_id, using=using)
+        return result
+
     def has_perm(self, perm, obj=None):
         """
         Returns True if the user has the specified permission.
@@ -96,3 +125,43 @@ class Users(AbstractBaseUser, PermissionsMixin):
         """
         # Add custom logic to check app permissions here
         return True
+
+
+class OutboundEmail(models.Model):
+    """
+    A transactional email waiting to be delivered by the `send_queued_mail` worker.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _('Pending')),
+        (STATUS_SENT, _('Sent')),
+        (STATUS_FAILED, _('Failed')),
+    ]
+
+    subject = models.CharField(_("Subject"), max_length=255)
+    body = models.TextField(_("Body"))
+    from_email = models.CharField(_("From Email"), max_length=254, blank=True)
+    recipients = models.TextField(_("Recipients"), help_text=_("Comma separated list of addresses."))
+    status = models.CharField(_("Status"), max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(_("Attempts"), default=0)
+    last_error = models.TextField(_("Last Error"), blank=True)
+    next_attempt_at = models.DateTimeField(_("Next Attempt At"), default=timezone.now)
+    created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+    sent_at = models.DateTimeField(_("Sent At"), null=True, blank=True)
+
+    class Meta:
+        db_table = 'outbound_email'
+        verbose_name = 'Outbound Email'
+        verbose_name_plural = 'Outbound Emails'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbound_email_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.recipients} ({self.status})"
+
+    @property
+    def recipient_list(self):
+        return [address for address in self.recipients.split(',') if address]
@@ -0,0 +1,240 @@
+"""
+Sliding-window rate limiting for credential-checking views.
+
+Rules are configured per scope in RATELIMIT_RULES, e.g.
+
+    RATELIMIT_RULES = {"login": {"login_id": "5/m", "ip": "50/m"}}
+
+and enforced with `@ratelimit("login")`. Every configured key must be under
+its limit, otherwise the view is not called and 429 is returned, so no
+password hash is computed for rejected attempts. Attempts are only recorded
+when every key is under its limit, and a successful response (status below
+400) forgets the attempts of that login ID, so only failures count against
+an account. The client IP is REMOTE_ADDR unless RATELIMIT_IP_HEADER names a
+header set by trusted proxies (see client_ip).
+
+Two backends are provided: LocalRateLimitBackend keeps an exact sliding
+log per key in this process, using only deque operations that are atomic
+under the GIL, so it takes no locks. CacheRateLimitBackend shares an
+approximated sliding window (two weighted fixed windows) through the
+Django cache across workers.
+"""
+import functools
+import json
+import math
+import time
+from collections import deque
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, JsonResponse
+from django.utils.module_loading import import_string
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """
+    Parse '5/m' style rates into (limit, window_seconds).
+    """
+    count, _, period = rate.partition('/')
+    return int(count), PERIODS[period[-1]] * int(period[:-1] or 1)
+
+
+class LocalRateLimitBackend:
+    """
+    Exact, in-process sliding log of recent hits per key.
+    """
+    prune_every = 1000
+
+    def __init__(self):
+        self._hits = {}
+        self._calls = 0
+
+    def _log(self, key, limit, window, now):
+        entry = self._hits.get(key)
+        if entry is None:
+            # Each key keeps the window of its rule, so pruning never cuts a longer window short
+            entry = self._hits.setdefault(key, (window, deque(maxlen=limit)))
+        log = entry[1]
+        while log and log[0] <= now - window:
+            try:
+                log.popleft()
+            except IndexError:
+                break
+        return log
+
+    def retry_after(self, key, limit, window):
+        """
+        Seconds until `key` is under `limit` per `window` again, or 0 if it is now. Records nothing.
+        """
+        now = time.monotonic()
+        log = self._log(key, limit, window, now)
+        if len(log) >= limit:
+            try:
+                return max(1, math.ceil(log[0] + window - now))
+            except IndexError:
+                pass
+        return 0
+
+    def hit(self, key, limit, window):
+        """
+        Record an attempt for `key`.
+        """
+        now = time.monotonic()
+        self._log(key, limit, window, now).append(now)
+        self._calls += 1
+        if self._calls % self.prune_every == 0:
+            self._prune(now)
+
+    def clear(self, key, window):
+        self._hits.pop(key, None)
+
+    def _prune(self, now):
+        for key, (window, log) in list(self._hits.items()):
+            if not log or log[-1] <= now - window:
+                self._hits.pop(key, None)
+
+    def reset(self):
+        self._hits.clear()
+
+
+class CacheRateLimitBackend:
+    """
+    Sliding-window counter shared through the Django cache (RATELIMIT_CACHE_ALIAS).
+    """
+
+    def __init__(self):
+        self.cache = caches[getattr(settings, 'RATELIMIT_CACHE_ALIAS', 'default')]
+
+    def _keys(self, key, window, now):
+        current = int(now // window)
+        return f'ratelimit:{key}:{current}', f'ratelimit:{key}:{current - 1}'
+
+    def retry_after(self, key, limit, window):
+        now = time.time()
+        elapsed = (now % window) / window
+        current_key, previous_key = self._keys(key, window, now)
+        counts = self.cache.get_many([current_key, previous_key])
+        estimate = counts.get(previous_key, 0) * (1 - elapsed) + counts.get(current_key, 0)
+        if estimate >= limit:
+            return max(1, math.ceil(window * (1 - elapsed)))
+        return 0
+
+    def hit(self, key, limit, window):
+        current_key, _ = self._keys(key, window, time.time())
+        self.cache.add(current_key, 0, window * 2)
+        try:
+            self.cache.incr(current_key)
+        except ValueError:
+            self.cache.set(current_key, 1, window * 2)
+
+    def clear(self, key, window):
+        self.cache.delete_many(self._keys(key, window, time.time()))
+
+    def reset(self):
+        pass
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = import_string(getattr(settings, 'RATELIMIT_BACKEND', 'users.ratelimit.LocalRateLimitBackend'))()
+    return _backend
+
+
+def client_ip(request):
+    """
+    Address of the client, as seen by the closest of RATELIMIT_TRUSTED_PROXIES proxies.
+
+    With RATELIMIT_IP_HEADER unset (the default) this is REMOTE_ADDR. Behind proxies, set it to
+    the META key of the header they append to, e.g. 'HTTP_X_FORWARDED_FOR'; the address added by
+    the outermost trusted proxy is used, so values a client writes into the header are ignored.
+    """
+    header = getattr(settings, 'RATELIMIT_IP_HEADER', None)
+    if header:
+        addresses = [address.strip() for address in request.META.get(header, '').split(',') if address.strip()]
+        proxies = getattr(settings, 'RATELIMIT_TRUSTED_PROXIES', 1)
+        if len(addresses) >= proxies:
+            return addresses[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def submitted_login_id(request):
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return ''
+        data = data if isinstance(data, dict) else {}
+    else:
+        data = request.POST
+    return str(data.get('login_id') or data.get('current_login_id') or '').lower()
+
+
+KEY_FUNCTIONS = {
+    'ip': client_ip,
+    'login_id': submitted_login_id,
+}
+
+
+def _rules(scope, request):
+    for key_name, rate in getattr(settings, 'RATELIMIT_RULES', {}).get(scope, {}).items():
+        value = KEY_FUNCTIONS[key_name](request)
+        if value:
+            limit, window = parse_rate(rate)
+            yield key_name, f'{scope}:{key_name}:{value}', limit, window
+
+
+def check(scope, request):
+    """
+    Apply the RATELIMIT_RULES of `scope` to `request`, recording the attempt only if every rule allows it.
+
+    :return: Seconds to wait before retrying, or 0 when the request is allowed.
+    """
+    backend = get_backend()
+    rules = list(_rules(scope, request))
+    retry_after = max((backend.retry_after(key, limit, window) for _, key, limit, window in rules), default=0)
+    if retry_after:
+        return retry_after
+    for _, key, limit, window in rules:
+        backend.hit(key, limit, window)
+    return 0
+
+
+def succeeded(scope, request):
+    """
+    Forget the recorded attempts of the login ID of a successful request.
+    """
+    backend = get_backend()
+    for key_name, key, limit, window in _rules(scope, request):
+        if key_name == 'login_id':
+            backend.clear(key, window)
+
+
+def ratelimit(scope, methods=('POST',)):
+    """
+    View decorator rejecting over-limit requests with 429 before the view runs.
+
+    Use `method_decorator(ratelimit('login'), name='post')` on class-based views.
+    """
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method in methods:
+                retry_after = check(scope, request)
+                if retry_after:
+                    if request.content_type == 'application/json':
+                        response = JsonResponse({'error': 'Too many attempts. Try again later.'}, status=429)
+                    else:
+                        response = HttpResponse('Too many attempts. Try again later.', status=429)
+                    response['Retry-After'] = str(retry_after)
+                    return response
+            response = view_func(request, *args, **kwargs)
+            if request.method in methods and response.status_code < 400:
+                succeeded(scope, request)
+            return response
+        return wrapper
+    return decorator
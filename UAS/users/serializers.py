@@ -0,0 +1,8 @@
+from UAS.serializers import ModelSerializer
+from .models import Users
+
+
+class UsersSerializer(ModelSerializer):
+    # Public profile only: never add password or permission fields here.
+    model = Users
+    fields = ('user_id', 'login_id', 'email', 'first_name', 'last_name', 'role')
@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+
+class MailQueueService(ABC):
+
+    @abstractmethod
+    def enqueue(self, subject, message, from_email, recipient_list):
+        pass
+
+    @abstractmethod
+    def deliver_pending(self, batch_size=None):
+        pass
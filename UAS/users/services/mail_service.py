@@ -0,0 +1,132 @@
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+from .mail import MailQueueService
+from ..models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+class MailQueueServiceImpl(MailQueueService):
+    """
+    Database-backed outbox for transactional email.
+
+    Services call `enqueue` inside the same transaction as the row they are
+    notifying about, so a message is only ever queued for a committed write.
+    The `send_queued_mail` management command drains the outbox with
+    `deliver_pending`, reusing a single backend connection per batch.
+    """
+
+    def __init__(self):
+        self.batch_size = getattr(settings, 'MAIL_OUTBOX_BATCH_SIZE', 50)
+        self.max_attempts = getattr(settings, 'MAIL_OUTBOX_MAX_ATTEMPTS', 5)
+        self.retry_backoff = getattr(settings, 'MAIL_OUTBOX_RETRY_BACKOFF', 60)
+        self.backend = getattr(settings, 'MAIL_OUTBOX_BACKEND', None)
+        self.claim_timeout = getattr(settings, 'MAIL_OUTBOX_CLAIM_TIMEOUT', 300)
+
+    def enqueue(self, subject, message, from_email, recipient_list):
+        """
+        Queue an email for background delivery.
+
+        :param subject: Subject line, must not contain newlines.
+        :param message: Plain text body.
+        :param from_email: Sender address, falls back to DEFAULT_FROM_EMAIL on delivery.
+        :param recipient_list: List of recipient addresses.
+        :return: The queued OutboundEmail instance.
+        """
+        if '\n' in subject or '\r' in subject:
+            logger.error("Invalid header found in the email subject.")
+            raise ValidationError("Invalid header found.")
+
+        if not recipient_list:
+            logger.error("Validation error: Email has no recipients.")
+            raise ValidationError("At least one recipient is required.")
+
+        email = OutboundEmail.objects.create(
+            subject=subject,
+            body=message,
+            from_email=from_email or '',
+            recipients=','.join(recipient_list),
+        )
+        logger.info("Email queued for %s: %s", email.recipients, subject)
+        return email
+
+    def deliver_pending(self, batch_size=None):
+        """
+        Deliver one batch of due messages over a single backend connection.
+
+        Rows are claimed in a short transaction with `select_for_update(skip_locked=True)`
+        and leased for `MAIL_OUTBOX_CLAIM_TIMEOUT` seconds by moving their next attempt,
+        so several workers can drain the outbox concurrently. Sending happens outside that
+        transaction and every message is marked as soon as it has been handed to the
+        backend, so a failure or crash part-way through never re-sends the messages
+        already delivered. Failed deliveries are rescheduled with exponential backoff
+        until `MAIL_OUTBOX_MAX_ATTEMPTS` is reached, after which they are marked as failed.
+
+        :param batch_size: Maximum number of messages to send, defaults to MAIL_OUTBOX_BATCH_SIZE.
+        :return: Tuple of (sent, failed) counts for the batch.
+        """
+        batch_size = batch_size or self.batch_size
+        sent = failed = 0
+
+        with transaction.atomic():
+            emails = list(
+                OutboundEmail.objects.select_for_update(skip_locked=True)
+                .filter(status=OutboundEmail.STATUS_PENDING, next_attempt_at__lte=timezone.now())
+                .order_by('next_attempt_at')[:batch_size]
+            )
+            if not emails:
+                return sent, failed
+            OutboundEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+                next_attempt_at=timezone.now() + timedelta(seconds=self.claim_timeout)
+            )
+
+        connection = get_connection(backend=self.backend, fail_silently=False)
+        try:
+            connection.open()
+        except Exception as e:
+            logger.error("Unable to open mail connection: %s", e)
+            for email in emails:
+                self._reschedule(email, e)
+            OutboundEmail.objects.bulk_update(emails, ['status', 'attempts', 'last_error', 'next_attempt_at'])
+            return sent, len(emails)
+
+        try:
+            for email in emails:
+                message = EmailMessage(
+                    subject=email.subject,
+                    body=email.body,
+                    from_email=email.from_email or None,
+                    to=email.recipient_list,
+                    connection=connection,
+                )
+                try:
+                    message.send()
+                except Exception as e:
+                    logger.error("Error sending email %s to %s: %s", email.pk, email.recipients, e)
+                    self._reschedule(email, e)
+                    email.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at'])
+                    failed += 1
+                    continue
+                email.status = OutboundEmail.STATUS_SENT
+                email.sent_at = timezone.now()
+                email.attempts += 1
+                email.save(update_fields=['status', 'attempts', 'sent_at'])
+                sent += 1
+        finally:
+            connection.close()
+
+        logger.info("Mail outbox batch delivered: %s sent, %s failed", sent, failed)
+        return sent, failed
+
+    def _reschedule(self, email, error):
+        email.attempts += 1
+        email.last_error = str(error)
+        if email.attempts >= self.max_attempts:
+            email.status = OutboundEmail.STATUS_FAILED
+        else:
+            delay = self.retry_backoff * (2 ** (email.attempts - 1))
+            email.next_attempt_at = timezone.now() + timedelta(seconds=delay)
@@ -10,6 +10,10 @@ class UserService(ABC):
     def user_login(self, login_id, password, role):
         pass
 
+    @abstractmethod
+    def issue_login_token(self, request, login_id, password, role):
+        pass
+
     @abstractmethod
     def user_logout(self):
         pass
@@ -31,5 +35,5 @@ class UserService(ABC):
         pass
     
     @abstractmethod
-    def get_user_details(self, user_id):
+    def get_user_details(self, user_id, user=None):
         pass
\ No newline at end of file
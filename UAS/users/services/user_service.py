@@ -1,18 +1,21 @@
 import logging
-from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import IntegrityError, transaction
 from django.contrib.auth.hashers import make_password
 from django.core.validators import validate_email
-from django.core.mail import BadHeaderError, send_mail
 from django.contrib.auth import authenticate, get_user_model, login as django_login
 from django.http import HttpResponse
-from django.utils.crypto import get_random_stringsa
+from django.utils.crypto import get_random_string
 from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
 from .user import UserService
+from .mail_service import MailQueueServiceImpl
 from ..models import Users
+from ..serializers import UsersSerializer
+from ..tokens import issue_token
 
 logger = logging.getLogger(__name__)
+mail_queue = MailQueueServiceImpl()
 
 class UserServiceImpl(UserService):
 
@@ -40,23 +43,9 @@ class UserServiceImpl(UserService):
         # Role Validation
         valid_roles = ['admin', 'user', 'manager']
         if role not in valid_roles:
-             logger.error(f"Validation error: Invalid role '{role}'. Must be one of {valid_roles}.")
+             logger.error("Validation error: Invalid role '%s'. Must be one of %s.", role, valid_roles)
              raise ValidationError(f"Invalid role '{role}'. Must be one of {valid_roles}.")
 
-        # Send confirmation email
-        subject = 'Welcome to Our Service'
-        message = f'Hi {first_name},\n\nThank you for registering. Your login ID is {login_id}.'
-        from_email = ''
-        try:
-            send_mail(subject, message, from_email, [email])
-            logger.info(f"Confirmation email sent to {email}")
-        except BadHeaderError:
-            logger.error("Invalid header found.")
-            raise ValidationError("Invalid header found.")
-        except Exception as e:
-            logger.error(f"Error sending email: {e}")
-            raise Exception(f"Error sending email: {e}")
-    
         try:
         
          # Create a new user instance
@@ -73,21 +62,29 @@ class UserServiceImpl(UserService):
           # Validate the model instance fields
           user.full_clean()
 
-          # Save the user instance to the database
-          user.save()
-          logger.info(f"User created successfully: {user_id}")
+          # Save the user and queue the confirmation email atomically;
+          # delivery happens in the send_queued_mail worker.
+          with transaction.atomic():
+              user.save()
+              mail_queue.enqueue(
+                  'Welcome to Our Service',
+                  f'Hi {first_name},\n\nThank you for registering. Your login ID is {login_id}.',
+                  '',
+                  [email],
+              )
+          logger.info("User created successfully: %s", user_id)
           return user
         
         except ValidationError as e:
-            logger.error(f"Model validation error: {e}")
+            logger.error("Model validation error: %s", e)
             raise ValidationError(f"Validation error: {e}")
 
         except IntegrityError as e:
-            logger.error(f"Database integrity error: {e}")
+            logger.error("Database integrity error: %s", e)
             raise IntegrityError(f"Database error: {e}")
 
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             raise Exception(f"An unexpected error occurred: {e}")
 
 
@@ -96,44 +93,63 @@ class UserServiceImpl(UserService):
     ================================== 
     """
 
+    def _authenticate(self, request, login_id, password, role):
+        """
+        Validate credentials and role, returning the authenticated user or raising ValidationError.
+        """
+        # Validate inputs
+        if not login_id or not password:
+            logger.error("Login error: Missing login ID or password.")
+            raise ValidationError("Login ID and password are required.")
+
+        if not isinstance(login_id, str) or not isinstance(password, str):
+            logger.error("Login error: Invalid data type for login ID or password.")
+            raise ValidationError("Invalid data type for login ID or password.")
+
+        # Authenticate user
+        user = authenticate(request=request, username=login_id, password=password)
+
+        if user is None:
+            logger.error("Login error: Invalid login ID or password.")
+            raise ValidationError("Invalid login ID or password.")
+
+        # Check if user role matches
+        if hasattr(user, 'role') and user.role != role:
+            logger.error("Login error: Role mismatch. Expected %s, found %s.", role, user.role)
+            raise ValidationError("Role does not match.")
+
+        return user
+
     def user_login(self, request, login_id, password, role):
         try:
-            # Validate inputs
-            if not login_id or not password:
-                logger.error("Login error: Missing login ID or password.")
-                raise ValidationError("Login ID and password are required.")
-
-            if not isinstance(login_id, str) or not isinstance(password, str):
-                logger.error("Login error: Invalid data type for login ID or password.")
-                raise ValidationError("Invalid data type for login ID or password.")
-            
-            # Authenticate user
-            user = authenticate(request=request, username=login_id, password=password)
-            
-            if user is None:
-                logger.error("Login error: Invalid login ID or password.")
-                raise ValidationError("Invalid login ID or password.")
-            
-            # Check if user role matches
-            if hasattr(user, 'role') and user.role != role:
-                logger.error(f"Login error: Role mismatch. Expected {role}, found {user.role}.")
-                raise ValidationError("Role does not match.")
+            user = self._authenticate(request, login_id, password, role)
 
             # Log in the user and create a session
             django_login(request, user)
-            logger.info(f"User logged in successfully: {login_id}")
+            logger.info("User logged in successfully: %s", login_id)
 
             # Optionally return user or response
             return HttpResponse("Login successful.")
 
         except ValidationError as e:
-            logger.error(f"Validation error during login: {e}")
+            logger.error("Validation error during login: %s", e)
             return HttpResponse(f"Error: {e}", status=400)
 
         except Exception as e:
-            logger.error(f"Unexpected error during login: {e}")
+            logger.error("Unexpected error during login: %s", e)
             return HttpResponse("An unexpected error occurred.", status=500)   
     
+    def issue_login_token(self, request, login_id, password, role):
+        """
+        Authenticate without creating a session and return a signed API token.
+
+        :return: Token string to be sent as `Authorization: Bearer <token>`.
+        :raises ValidationError: If the credentials or role are invalid.
+        """
+        user = self._authenticate(request, login_id, password, role)
+        logger.info("API token issued: %s", login_id)
+        return issue_token(user)
+
     """ ==================================
     Logout Functionality
     ================================== """
@@ -145,14 +161,14 @@ class UserServiceImpl(UserService):
         try:
             # Log the user out
             logout(request)
-            logger.info(f"User with session {request.session.session_key} logged out successfully.")
+            logger.info("User with session %s logged out successfully.", request.session.session_key)
 
             # Redirect to a success page or homepage
             return redirect('home')  # Replace 'home' with your redirect URL name
 
         except Exception as e:
             # Log any errors that occur during logout
-            logger.error(f"Error during logout: {e}")
+            logger.error("Error during logout: %s", e)
             raise ValidationError("An error occurred while logging out. Please try again.")
 
 
@@ -194,7 +210,7 @@ class UserServiceImpl(UserService):
         # Role Validation
         valid_roles = ['admin', 'user', 'manager']
         if role not in valid_roles:
-            logger.error(f"Validation error: Invalid role '{role}'. Must be one of {valid_roles}.")
+            logger.error("Validation error: Invalid role '%s'. Must be one of %s.", role, valid_roles)
             raise ValidationError(f"Invalid role '{role}'. Must be one of {valid_roles}.")
 
         try:
@@ -210,18 +226,18 @@ class UserServiceImpl(UserService):
                 user.first_name = first_name
                 user.last_name = last_name
                 user.save()  # Save the updated user details
-                logger.info(f"User account details updated successfully for user_id: {user_id}")
+                logger.info("User account details updated successfully for user_id: %s", user_id)
                 return user
             else:
-                logger.error(f"User not found with user_id: {user_id}")
+                logger.error("User not found with user_id: %s", user_id)
                 raise ValidationError(f"User not found with user_id: {user_id}")
 
         except IntegrityError as e:
-            logger.error(f"Database integrity error: {e}")
+            logger.error("Database integrity error: %s", e)
             raise IntegrityError(f"Database error: {e}")
 
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             raise Exception(f"An unexpected error occurred: {e}")
     
 
@@ -251,7 +267,7 @@ class UserServiceImpl(UserService):
         # Role Validation (if needed)
         valid_roles = ['admin', 'user', 'manager']
         if role not in valid_roles:
-            logger.error(f"Validation error: Invalid role '{role}'. Must be one of {valid_roles}.")
+            logger.error("Validation error: Invalid role '%s'. Must be one of %s.", role, valid_roles)
             raise ValidationError(f"Invalid role '{role}'. Must be one of {valid_roles}.")
 
         try:
@@ -260,37 +276,30 @@ class UserServiceImpl(UserService):
             user = UserModel.objects.filter(login_id=login_id).first()
 
             if user:
-                # Update the user's password
-                user.set_password(password)  # Django method to handle password hashing
-                user.save()  # Save the updated user details
-                logger.info(f"Password reset successfully for login_id: {login_id}")
-
-                # Optionally send an email notification (if applicable)
-                subject = 'Password Reset Confirmation'
-                message = f'Hi {user.first_name},\n\nYour password has been reset successfully.'
-                from_email = ''
-                try:
-                    send_mail(subject, message, from_email, [user.email])
-                    logger.info(f"Password reset confirmation email sent to {user.email}")
-                except BadHeaderError:
-                    logger.error("Invalid header found in the email.")
-                    raise ValidationError("Invalid header found in the email.")
-                except Exception as e:
-                    logger.error(f"Error sending email: {e}")
-                    raise Exception(f"Error sending email: {e}")
+                # Update the user's password and queue the confirmation email
+                with transaction.atomic():
+                    user.set_password(password)  # Django method to handle password hashing
+                    user.save()  # Save the updated user details
+                    mail_queue.enqueue(
+                        'Password Reset Confirmation',
+                        f'Hi {user.first_name},\n\nYour password has been reset successfully.',
+                        '',
+                        [user.email],
+                    )
+                logger.info("Password reset successfully for login_id: %s", login_id)
 
                 return "Password reset successfully."
 
             else:
-                logger.error(f"User not found with login_id: {login_id}")
+                logger.error("User not found with login_id: %s", login_id)
                 raise ValidationError(f"User not found with login_id: {login_id}")
 
         except IntegrityError as e:
-            logger.error(f"Database integrity error: {e}")
+            logger.error("Database integrity error: %s", e)
             raise IntegrityError(f"Database error: {e}")
 
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             raise Exception(f"An unexpected error occurred: {e}")
         
     
@@ -320,7 +329,7 @@ class UserServiceImpl(UserService):
         # Role Validation (if needed)
         valid_roles = ['admin', 'user', 'manager']
         if role not in valid_roles:
-            logger.error(f"Validation error: Invalid role '{role}'. Must be one of {valid_roles}.")
+            logger.error("Validation error: Invalid role '%s'. Must be one of %s.", role, valid_roles)
             raise ValidationError(f"Invalid role '{role}'. Must be one of {valid_roles}.")
 
         try:
@@ -337,7 +346,7 @@ class UserServiceImpl(UserService):
                 # Update the user's login ID
                 user.login_id = new_login_id
                 user.save()  # Save the updated user details
-                logger.info(f"Login ID updated successfully from {current_login_id} to {new_login_id}.")
+                logger.info("Login ID updated successfully from %s to %s.", current_login_id, new_login_id)
 
                 # Optionally send a confirmation email (if applicable)
                 # ...
@@ -345,15 +354,15 @@ class UserServiceImpl(UserService):
                 return "Login ID updated successfully."
 
             else:
-                logger.error(f"User not found with current_login_id: {current_login_id}")
+                logger.error("User not found with current_login_id: %s", current_login_id)
                 raise ValidationError(f"User not found with current_login_id: {current_login_id}")
 
         except IntegrityError as e:
-            logger.error(f"Database integrity error: {e}")
+            logger.error("Database integrity error: %s", e)
             raise IntegrityError(f"Database error: {e}")
 
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             raise Exception(f"An unexpected error occurred: {e}")
         
 
@@ -393,7 +402,7 @@ class UserServiceImpl(UserService):
                 raise ValidationError("Invalid email address.")
 
         if role and role not in ['admin', 'user', 'manager']:
-            logger.error(f"Validation error: Invalid role '{role}'. Must be one of ['admin', 'user', 'manager'].")
+            logger.error("Validation error: Invalid role '%s'. Must be one of ['admin', 'user', 'manager'].", role)
             raise ValidationError(f"Invalid role '{role}'. Must be one of ['admin', 'user', 'manager'].")
 
         try:
@@ -420,50 +429,44 @@ class UserServiceImpl(UserService):
                     user.last_name = last_name
 
                 user.save()  # Save the updated user details
-                logger.info(f"User account details updated successfully for user_id: {user_id}")
+                logger.info("User account details updated successfully for user_id: %s", user_id)
 
                 return "Account details updated successfully."
 
             else:
-                logger.error(f"User not found with user_id: {user_id}")
+                logger.error("User not found with user_id: %s", user_id)
                 raise ValidationError(f"User not found with user_id: {user_id}")
 
         except IntegrityError as e:
-            logger.error(f"Database integrity error: {e}")
+            logger.error("Database integrity error: %s", e)
             raise IntegrityError(f"Database error: {e}")
 
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             raise Exception(f"An unexpected error occurred: {e}")
         
 
-    def get_user_details(self, user_id):
+    def get_user_details(self, user_id, user=None):
         """
         Fetch user details based on the provided user_id.
 
         :param user_id: Unique identifier for the user.
+        :param user: Already loaded user (e.g. request.user); reused instead of querying when it matches user_id.
         :return: Dictionary with user details or None if user not found.
         """
         try:
             UserModel = get_user_model()
-            user = UserModel.objects.get(user_id=user_id)
-
-            # Construct and return a dictionary with user details
-            user_details = {
-                'user_id': user.user_id,
-                'login_id': user.login_id,
-                'email': user.email,
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'role': user.role,
-            }
-            logger.info(f"User details fetched successfully for user_id: {user_id}")
+            if not (isinstance(user, UserModel) and user.user_id == user_id):
+                user = UserModel.objects.get(user_id=user_id)
+
+            user_details = UsersSerializer.to_dict(user)
+            logger.info("User details fetched successfully for user_id: %s", user_id)
             return user_details
 
         except ObjectDoesNotExist:
-            logger.error(f"User not found with user_id: {user_id}")
+            logger.error("User not found with user_id: %s", user_id)
             return None
 
         except Exception as e:
-            logger.error(f"Unexpected error during fetching user details: {e}")
+            logger.error("Unexpected error during fetching user details: %s", e)
             raise Exception("An unexpected error occurred while fetching user details.")
\ No newline at end of file
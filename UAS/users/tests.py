@@ -1,3 +1,326 @@
-from django.test import TestCase
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core import mail, signing
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from .backends import CachedModelBackend, LRUCache, _local_users
+from .cache import get_version
+from .checks import check_users_cache_is_shared
+from .hashers import PolicyPBKDF2PasswordHasher, PolicyScryptPasswordHasher
+from .models import OutboundEmail
+from .ratelimit import CacheRateLimitBackend, LocalRateLimitBackend, client_ip, get_backend
+from .services.mail_service import MailQueueServiceImpl
+from .services.user_service import UserServiceImpl
+from .tokens import TOKEN_SALT, issue_token, verify_token
 
-# Create your tests here.
+PASSWORD = 'x-Pass-123'
+# Keep hashing cheap; the policy values are exercised explicitly where they matter.
+FAST_HASHING = {'pbkdf2': {'iterations': 1000}}
+
+
+class RefusingBackend(EmailBackend):
+    """
+    locmem backend refusing every message addressed to a .invalid domain.
+    """
+
+    def send_messages(self, messages):
+        for message in messages:
+            if any(address.endswith('.invalid') for address in message.to):
+                raise OSError("Recipient refused")
+        return super().send_messages(messages)
+
+
+class MailQueueTests(TestCase):
+
+    def setUp(self):
+        self.queue = MailQueueServiceImpl()
+
+    def test_sign_up_only_queues(self):
+        UserServiceImpl().sign_up(101, 'asha101', 'secret-pass', 'user', 'asha@example.com', 'Asha', 'Rao')
+        self.assertEqual(mail.outbox, [])
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.recipient_list, ['asha@example.com'])
+        self.assertEqual(email.status, OutboundEmail.STATUS_PENDING)
+
+    def test_failed_sign_up_queues_nothing(self):
+        UserServiceImpl().sign_up(101, 'asha101', 'secret-pass', 'user', 'asha@example.com', 'Asha', 'Rao')
+        with self.assertRaises(Exception):
+            UserServiceImpl().sign_up(102, 'asha101', 'secret-pass', 'user', 'asha@example.com', 'Asha', 'Rao')
+        self.assertEqual(OutboundEmail.objects.count(), 1)
+
+    def test_enqueue_validation(self):
+        with self.assertRaises(ValidationError):
+            self.queue.enqueue('Hello\nBcc: someone', 'Body', '', ['asha@example.com'])
+        with self.assertRaises(ValidationError):
+            self.queue.enqueue('Hello', 'Body', '', [])
+
+    def test_delivers_due_messages(self):
+        self.queue.enqueue('First', 'Body', '', ['one@example.com'])
+        self.queue.enqueue('Second', 'Body', '', ['two@example.com', 'three@example.com'])
+        later = self.queue.enqueue('Later', 'Body', '', ['four@example.com'])
+        OutboundEmail.objects.filter(pk=later.pk).update(next_attempt_at=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual(self.queue.deliver_pending(), (2, 0))
+        self.assertEqual(sorted(message.subject for message in mail.outbox), ['First', 'Second'])
+        self.assertEqual(OutboundEmail.objects.filter(status=OutboundEmail.STATUS_SENT).count(), 2)
+        self.assertEqual(self.queue.deliver_pending(), (0, 0))
+
+    def test_batch_size(self):
+        for n in range(3):
+            self.queue.enqueue(f'Message {n}', 'Body', '', ['one@example.com'])
+        self.assertEqual(self.queue.deliver_pending(batch_size=2), (2, 0))
+        self.assertEqual(self.queue.deliver_pending(batch_size=2), (1, 0))
+
+    @override_settings(MAIL_OUTBOX_BACKEND='users.tests.RefusingBackend', MAIL_OUTBOX_MAX_ATTEMPTS=2,
+                       MAIL_OUTBOX_RETRY_BACKOFF=60)
+    def test_failures_back_off_then_fail(self):
+        queue = MailQueueServiceImpl()
+        queue.enqueue('Good', 'Body', '', ['one@example.com'])
+        bad = queue.enqueue('Bad', 'Body', '', ['nobody@example.invalid'])
+
+        self.assertEqual(queue.deliver_pending(), (1, 1))
+        bad.refresh_from_db()
+        self.assertEqual((bad.status, bad.attempts), (OutboundEmail.STATUS_PENDING, 1))
+        self.assertIn('Recipient refused', bad.last_error)
+        self.assertGreater(bad.next_attempt_at, timezone.now() + timedelta(seconds=50))
+        self.assertEqual(queue.deliver_pending(), (0, 0))
+
+        OutboundEmail.objects.filter(pk=bad.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(queue.deliver_pending(), (0, 1))
+        bad.refresh_from_db()
+        self.assertEqual((bad.status, bad.attempts), (OutboundEmail.STATUS_FAILED, 2))
+        self.assertEqual([message.subject for message in mail.outbox], ['Good'])
+
+
+@override_settings(PASSWORD_HASHER_PARAMS=FAST_HASHING)
+class ApiTokenTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user('manager1', PASSWORD, role='manager', user_id=1,
+                                                         email='manager1@example.com')
+        self.client = Client()
+
+    def post_json(self, url, data):
+        return self.client.post(url, json.dumps(data), content_type='application/json')
+
+    def test_token_claims_round_trip(self):
+        token_user = verify_token(issue_token(self.user))
+        self.assertEqual((token_user.user_id, token_user.login_id, token_user.role), (1, 'manager1', 'manager'))
+        self.assertTrue(token_user.is_authenticated)
+        self.assertEqual(token_user.get_user(), self.user)
+
+    def test_issue_token(self):
+        response = self.post_json('/users/token/', {'login_id': 'manager1', 'password': PASSWORD, 'role': 'manager'})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body['token_type'], body['expires_in']), ('Bearer', 3600))
+        self.assertEqual(verify_token(body['token']).login_id, 'manager1')
+        self.assertNotIn('sessionid', response.cookies)
+
+    def test_issue_token_rejects_bad_credentials(self):
+        response = self.post_json('/users/token/', {'login_id': 'manager1', 'password': 'wrong', 'role': 'manager'})
+        self.assertEqual(response.status_code, 400)
+        response = self.post_json('/users/token/', {'login_id': 'manager1', 'password': PASSWORD, 'role': 'admin'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.post('/users/token/', 'not json', content_type='application/json').status_code, 400)
+
+    def test_bearer_request_skips_session_and_user_lookup(self):
+        auth = f'Bearer {issue_token(self.user)}'
+        with self.assertNumQueries(0):
+            self.client.get('/participant/applications/export/?format=csv', HTTP_AUTHORIZATION=auth)
+        response = self.client.get('/participant/applications/export/?format=csv', HTTP_AUTHORIZATION=auth)
+        self.assertEqual(response.status_code, 200)
+
+    def test_tampered_and_expired_tokens(self):
+        token = issue_token(self.user)
+        response = self.client.get('/participant/applications/export/', HTTP_AUTHORIZATION=f'Bearer {token}x')
+        self.assertEqual((response.status_code, response.json()), (401, {'error': 'Invalid token'}))
+        forged = signing.dumps({'uid': 1, 'lid': 'manager1', 'role': 'admin'}, key='not-the-secret', salt=TOKEN_SALT)
+        response = self.client.get('/participant/applications/export/', HTTP_AUTHORIZATION=f'Bearer {forged}')
+        self.assertEqual(response.status_code, 401)
+        with override_settings(API_TOKEN_MAX_AGE=-1):
+            response = self.client.get('/participant/applications/export/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual((response.status_code, response.json()), (401, {'error': 'Token expired'}))
+
+    def test_json_login_still_creates_a_session(self):
+        response = self.post_json('/users/login/', {'login_id': 'manager1', 'password': PASSWORD, 'role': 'manager'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.session['_auth_user_id'], str(self.user.pk))
+
+
+@override_settings(PASSWORD_HASHER_PARAMS=FAST_HASHING)
+class PasswordHashingTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user('asha1', PASSWORD, role='user', user_id=1,
+                                                         email='asha1@example.com')
+
+    def login(self):
+        return Client().post('/users/login/', json.dumps({'login_id': 'asha1', 'password': PASSWORD, 'role': 'user'}),
+                             content_type='application/json')
+
+    def stored_hash(self):
+        return get_user_model().objects.values_list('password', flat=True).get(pk=self.user.pk)
+
+    def test_parameters_come_from_settings(self):
+        self.assertEqual(PolicyPBKDF2PasswordHasher().iterations, 1000)
+        self.assertTrue(self.stored_hash().startswith('pbkdf2_sha256$1000$'))
+        with override_settings(PASSWORD_HASHER_PARAMS={'scrypt': {'work_factor': 2 ** 10, 'block_size': 4}}):
+            hasher = PolicyScryptPasswordHasher()
+            self.assertEqual((hasher.work_factor, hasher.block_size, hasher.maxmem), (2 ** 10, 4, 256 * 2 ** 12))
+
+    def test_login_rehashes_with_new_parameters(self):
+        with override_settings(PASSWORD_HASHER_PARAMS={'pbkdf2': {'iterations': 2000}}):
+            self.assertEqual(self.login().status_code, 200)
+        self.assertTrue(self.stored_hash().startswith('pbkdf2_sha256$2000$'))
+
+    def test_login_rehashes_to_preferred_algorithm(self):
+        hashers = ['users.hashers.PolicyScryptPasswordHasher', 'users.hashers.PolicyPBKDF2PasswordHasher']
+        with override_settings(PASSWORD_HASHERS=hashers,
+                               PASSWORD_HASHER_PARAMS={**FAST_HASHING, 'scrypt': {'work_factor': 2 ** 10}}):
+            self.assertEqual(self.login().status_code, 200)
+            self.assertTrue(self.stored_hash().startswith('scrypt$'))
+            self.assertEqual(self.login().status_code, 200)
+
+    def test_calibrate_benchmark_only(self):
+        out = StringIO()
+        call_command('calibrate_password_hasher', '--benchmark-only', '--samples', '1', stdout=out)
+        self.assertIn("pbkdf2 {'iterations': 1000}", out.getvalue())
+        self.assertIn('logins/sec per core', out.getvalue())
+
+
+@override_settings(PASSWORD_HASHER_PARAMS=FAST_HASHING)
+class CachedUserTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        _local_users.clear()
+        self.backend = CachedModelBackend()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = get_user_model().objects.create_user('asha1', PASSWORD, role='user', user_id=1,
+                                                             email='asha1@example.com')
+
+    def test_get_user_is_served_from_cache(self):
+        self.assertEqual(self.backend.get_user(1).role, 'user')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.backend.get_user(1).role, 'user')
+
+    def test_stamp_is_bumped_on_commit(self):
+        self.backend.get_user(1)
+        version = get_version(1)
+        with self.captureOnCommitCallbacks(execute=True):
+            get_user_model().objects.filter(pk=1).update(role='manager')
+            self.assertEqual(get_version(1), version)
+            self.assertEqual(self.backend.get_user(1).role, 'user')
+        self.assertNotEqual(get_version(1), version)
+        self.assertEqual(self.backend.get_user(1).role, 'manager')
+
+    def test_save_and_delete_invalidate(self):
+        self.backend.get_user(1)
+        self.user.role = 'admin'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertEqual(self.backend.get_user(1).role, 'admin')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertIsNone(self.backend.get_user(1))
+
+    def test_lru_entries_expire(self):
+        lru = LRUCache(2, ttl=60)
+        with mock.patch('users.backends.time.monotonic', return_value=1000):
+            lru.set('a', 1)
+            lru.set('b', 2)
+            lru.get('a')
+            lru.set('c', 3)
+            self.assertEqual((lru.get('a'), lru.get('b'), lru.get('c')), (1, None, 3))
+        with mock.patch('users.backends.time.monotonic', return_value=1060):
+            self.assertIsNone(lru.get('a'))
+
+    def test_check_refuses_local_memory_with_several_workers(self):
+        self.assertEqual(check_users_cache_is_shared(None), [])
+        with override_settings(WEB_CONCURRENCY=4):
+            self.assertEqual([error.id for error in check_users_cache_is_shared(None)], ['users.E001'])
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                  'users': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+        with override_settings(WEB_CONCURRENCY=4, CACHES=shared, USERS_CACHE_ALIAS='users'):
+            self.assertEqual(check_users_cache_is_shared(None), [])
+
+
+@override_settings(PASSWORD_HASHER_PARAMS=FAST_HASHING, RATELIMIT_RULES={
+    'login': {'login_id': '3/m', 'ip': '5/m'},
+    'api_token': {'login_id': '3/m', 'ip': '5/m'},
+})
+class RateLimitTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        get_backend().reset()
+        get_user_model().objects.create_user('asha1', PASSWORD, role='user', user_id=1, email='asha1@example.com')
+
+    def attempt(self, password='wrong', login_id='asha1', ip='192.0.2.1', url='/users/login/'):
+        return Client(REMOTE_ADDR=ip).post(url, json.dumps({'login_id': login_id, 'password': password, 'role': 'user'}),
+                                           content_type='application/json')
+
+    def test_failed_logins_are_throttled_per_login_id(self):
+        for n in range(3):
+            self.assertEqual(self.attempt(ip=f'192.0.2.{n}').status_code, 400)
+        response = self.attempt(password=PASSWORD, ip='192.0.2.9')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(self.attempt(login_id='ravi1').status_code, 400)
+
+    def test_success_resets_the_login_id_count(self):
+        for _ in range(2):
+            self.attempt()
+        self.assertEqual(self.attempt(password=PASSWORD).status_code, 200)
+        for _ in range(2):
+            self.assertEqual(self.attempt(ip='192.0.2.2').status_code, 400)
+
+    def test_ip_rejection_records_no_login_id_attempt(self):
+        for n in range(5):
+            self.attempt(login_id=f'other{n}')
+        for _ in range(5):
+            self.assertEqual(self.attempt().status_code, 429)
+        self.assertEqual(self.attempt(password=PASSWORD, ip='192.0.2.2').status_code, 200)
+
+    def test_scopes_are_separate(self):
+        for _ in range(3):
+            self.attempt()
+        self.assertEqual(self.attempt().status_code, 429)
+        response = self.attempt(password=PASSWORD, url='/users/token/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_cache_backend(self):
+        backend = CacheRateLimitBackend()
+        self.assertEqual(backend.retry_after('k', 2, 60), 0)
+        backend.hit('k', 2, 60)
+        backend.hit('k', 2, 60)
+        self.assertGreater(backend.retry_after('k', 2, 60), 0)
+        backend.clear('k', 60)
+        self.assertEqual(backend.retry_after('k', 2, 60), 0)
+
+    def test_local_backend_prunes_by_each_window(self):
+        backend = LocalRateLimitBackend()
+        with mock.patch('users.ratelimit.time.monotonic', return_value=1000):
+            backend.hit('long', 1, 3600)
+        with mock.patch('users.ratelimit.time.monotonic', return_value=1100):
+            backend._prune(1100)
+            self.assertGreater(backend.retry_after('long', 1, 3600), 0)
+
+    def test_client_ip(self):
+        request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='6.6.6.6, 203.0.113.7')
+        self.assertEqual(client_ip(request), '10.0.0.1')
+        with override_settings(RATELIMIT_IP_HEADER='HTTP_X_FORWARDED_FOR'):
+            self.assertEqual(client_ip(request), '203.0.113.7')
+            with override_settings(RATELIMIT_TRUSTED_PROXIES=2):
+                self.assertEqual(client_ip(request), '6.6.6.6')
+            self.assertEqual(client_ip(RequestFactory().get('/', REMOTE_ADDR='10.0.0.1')), '10.0.0.1')
@@ -0,0 +1,72 @@
+"""
+Stateless API tokens.
+
+A token is the user's id, login ID and role signed with SECRET_KEY
+(django.core.signing, HMAC-SHA256) and timestamped, so validating it needs
+neither a session row nor a user lookup. Tokens cannot be revoked before
+they expire; keep API_TOKEN_MAX_AGE short.
+"""
+from django.conf import settings
+from django.core import signing
+
+TOKEN_SALT = 'users.tokens'
+
+
+class TokenUser:
+    """
+    Authenticated user reconstructed from token claims, without a database query.
+
+    Exposes the attributes the views rely on (user_id, login_id, role and the
+    auth flags). Call `get_user()` when the full Users row is needed.
+    """
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, claims):
+        self.user_id = self.pk = self.id = claims['uid']
+        self.login_id = claims['lid']
+        self.role = claims['role']
+        self.is_staff = claims.get('staff', False)
+        self.is_superuser = claims.get('su', False)
+
+    def __str__(self):
+        return f"{self.login_id} ({self.role})"
+
+    def get_username(self):
+        return self.login_id
+
+    def get_user(self):
+        from django.contrib.auth import get_user_model
+        return get_user_model().objects.get(pk=self.user_id)
+
+    def has_perm(self, perm, obj=None):
+        return True
+
+    def has_module_perms(self, app_label):
+        return True
+
+
+def issue_token(user):
+    """
+    Return a signed token carrying `user`'s id, login ID and role claims.
+    """
+    claims = {
+        'uid': user.user_id,
+        'lid': user.login_id,
+        'role': user.role,
+        'staff': user.is_staff,
+        'su': user.is_superuser,
+    }
+    return signing.dumps(claims, salt=TOKEN_SALT, compress=True)
+
+
+def verify_token(token):
+    """
+    Validate a token's signature and age.
+
+    :return: TokenUser built from the claims.
+    :raises signing.BadSignature: If the token is forged, malformed or expired (SignatureExpired).
+    """
+    claims = signing.loads(token, salt=TOKEN_SALT, max_age=getattr(settings, 'API_TOKEN_MAX_AGE', 3600))
+    return TokenUser(claims)
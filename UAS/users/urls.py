@@ -1,11 +1,12 @@
 from django.urls import path
 from django.views.generic.base import TemplateView
-from .views import UserLoginView, SignUpView, UserLogoutView, ForgotPasswordView, ForgotLoginIdView, UpdateAccountDetailsView
+from .views import UserLoginView, ApiTokenView, SignUpView, UserLogoutView, ForgotPasswordView, ForgotLoginIdView, UpdateAccountDetailsView
 #  UserAccountDetailsView,
 app_name = 'users'
 
 urlpatterns = [
     path('login/', UserLoginView.as_view(), name='login'),
+    path('token/', ApiTokenView.as_view(), name='api_token'),
     path('signup/', SignUpView.as_view(), name='signup'),
     path('home/', TemplateView.as_view(template_name='home.html'), name='home'),
     path('logout/', UserLogoutView.as_view(), name='logout'),
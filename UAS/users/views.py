@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.shortcuts import render, redirect
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt, csrf_protect
@@ -11,6 +12,7 @@ from django.contrib.auth import logout as auth_logout
 import logging
 import json
 from .services.user_service import UserServiceImpl
+from .ratelimit import ratelimit
 
 logger = logging.getLogger(__name__)
 user_service = UserServiceImpl()
@@ -59,6 +61,7 @@ class SignUpView(View):
 
 @method_decorator(csrf_exempt, name='dispatch')
 class UserLoginView(View):
+    @method_decorator(ratelimit('login'))
     @method_decorator(csrf_protect)
     def post(self, request):
         if request.content_type == 'application/json':
@@ -77,6 +80,13 @@ class UserLoginView(View):
                 password=data.get('password'),
                 role=data.get('role')
             )
+            if response.status_code >= 400:
+                # user_login reports failures as a response rather than raising
+                error = response.content.decode().removeprefix('Error: ')
+                logger.warning(f"Login failed for {data.get('login_id')}: {error}")
+                if request.content_type == 'application/json':
+                    return JsonResponse({'error': error}, status=response.status_code)
+                return render(request, 'login.html', {'error': error}, status=response.status_code)
             logger.info(f"User logged in successfully: {data.get('login_id')}")
             if request.content_type == 'application/json':
                 return JsonResponse({'message': 'User logged in successfully'}, status=200)
@@ -99,6 +109,45 @@ class UserLoginView(View):
         csrf_token = get_token(request)
         return render(request, 'login.html', {'csrf_token': csrf_token})
 
+@method_decorator(csrf_exempt, name='dispatch')
+class ApiTokenView(View):
+    """
+    Exchanges JSON credentials for a signed API token without creating a session.
+
+    Nothing here relies on cookies, so the view is exempt from CSRF; the credentials
+    in the body are the proof, and attempts are throttled like session logins.
+    """
+
+    @method_decorator(ratelimit('api_token'))
+    def post(self, request):
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decoding error: {e}")
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        if not isinstance(data, dict):
+            return JsonResponse({'error': 'Expected a JSON object'}, status=400)
+
+        try:
+            token = user_service.issue_login_token(
+                request=request,
+                login_id=data.get('login_id'),
+                password=data.get('password'),
+                role=data.get('role')
+            )
+            logger.info(f"API token issued: {data.get('login_id')}")
+            return JsonResponse({
+                'token': token,
+                'token_type': 'Bearer',
+                'expires_in': settings.API_TOKEN_MAX_AGE,
+            }, status=200)
+        except ValidationError as e:
+            logger.warning(f"Validation error while issuing an API token: {e}")
+            return JsonResponse({'error': str(e)}, status=400)
+        except Exception as e:
+            logger.error(f"Unexpected error while issuing an API token: {e}")
+            return JsonResponse({'error': 'Unexpected error while issuing a token'}, status=500)
+
 @method_decorator(csrf_exempt, name='dispatch')
 @method_decorator(login_required, name='dispatch')
 class UserLogoutView(View):
@@ -197,6 +246,7 @@ class ForgotLoginIdView(View):
         csrf_token = get_token(request)
         return render(request, 'forgot_login_id.html', {'csrf_token': csrf_token})
 
+    @method_decorator(ratelimit('forgot_login_id'))
     @method_decorator(csrf_protect)
     def post(self, request):
         data = request.POST
@@ -224,7 +274,7 @@ class UpdateAccountDetailsView(LoginRequiredMixin, View):
     @method_decorator(csrf_protect)
     def get(self, request):
         try:
-            user = user_service.get_user_details(request.user.user_id)
+            user = user_service.get_user_details(request.user.user_id, user=request.user)
             if not user:
                 logger.warning(f"User not found for user_id: {request.user.user_id}")
                 return JsonResponse({'error': 'User not found.'}, status=404)